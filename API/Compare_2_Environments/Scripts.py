@@ -1,26 +1,30 @@
+import argparse
 import json
 import os
+import pickle
 import sys
-import requests
-import webbrowser
-import pandas as pd
 import time
 import re
 import logging
+import math
+import multiprocessing
+import ast
 import base64
-from deepdiff import DeepDiff
-from jinja2 import Environment, FileSystemLoader
+import gzip
+import hashlib
+import importlib.util
+import itertools
+import random
+import socket
+import sqlite3
+import threading
+from collections import deque
+from http.cookiejar import DefaultCookiePolicy
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import datetime
 
-try:
-    from openpyxl.styles import PatternFill, Font, Alignment
-except ImportError:
-    class MockOpenpyxlStyles:
-        def __init__(self, **kwargs): pass
-    PatternFill = Font = Alignment = MockOpenpyxlStyles
-
 try:
     from colorama import Fore, Style, init
     init(autoreset=True)
@@ -29,26 +33,53 @@ except ImportError:
         def __getattr__(self, name): return ''
     Fore = Style = MockColorama()
 
-try:
-    from jsonschema import validate, ValidationError
-    JSONSCHEMA_AVAILABLE = True
-except ImportError:
-    class MockJsonSchema:
-        def __init__(self, *args, **kwargs): pass
-    validate = MockJsonSchema
-    ValidationError = type('ValidationError', (Exception,), {})
-    JSONSCHEMA_AVAILABLE = False
+JSONSCHEMA_AVAILABLE = importlib.util.find_spec('jsonschema') is not None
+REQUIRED_LIBRARIES = ('pandas', 'openpyxl', 'deepdiff', 'jinja2')
 
 LOG_FILE = 'comparison_script.log'
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s',
-                    handlers=[
-                        logging.FileHandler(LOG_FILE, mode='w', encoding='utf-8'),
-                        logging.StreamHandler(sys.stdout)
-                    ])
 logger = logging.getLogger(__name__)
+CONSOLE_LOCK = threading.Lock()
+HTTP_SESSIONS: Dict[str, 'requests.Session'] = {}
+TIMED_HTTP_ADAPTER_CLASS = None
+HTTP_SESSIONS_LOCK = threading.Lock()
+RATE_LIMITERS: Dict[str, 'AdaptiveRateLimiter'] = {}
+RATE_LIMITERS_LOCK = threading.Lock()
+THROTTLE_STATUS_CODES = (429, 503)
+LATENCY_SPIKE_PERSISTENCE = 3
+RECENT_LATENCIES: Dict[str, deque] = {}
+RECENT_LATENCIES_LOCK = threading.Lock()
+HEDGE_EXECUTOR = None
+HEDGE_EXECUTOR_LOCK = threading.Lock()
+HEDGE_MIN_SAMPLES = 20
+HEDGE_SLOTS_PER_WORKER = 3
+RESPONSE_STORE = None
+RESPONSE_STORE_LOCK = threading.Lock()
+CASSETTE = None
+CASSETTE_LOCK = threading.Lock()
+PATH_CLASSIFIERS: Dict[tuple, 'PathClassifier'] = {}
+PATH_CLASSIFIERS_LOCK = threading.Lock()
+PATH_INDEX_PATTERN = re.compile(r'\[\d+\]')
+DIFF_PATH_TOKEN_PATTERN = re.compile(r"\[(\d+|'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")\]")
+MANIFEST_RESULT_FIELDS = ('status_code', 'response_time', 'raw_body_ref', 'attempts', 'hedge_won', 'phase_timings', 'response_bytes')
+SCHEMA_VALIDATORS: Dict[tuple, 'SchemaValidator'] = {}
+SCHEMA_VALIDATORS_LOCK = threading.Lock()
+SCHEMA_VALIDATION_POOL = None
+SCHEMA_VALIDATION_POOL_LOCK = threading.Lock()
+BASELINE_SNAPSHOTS: Dict[str, Dict[str, Any]] = {}
+BASELINE_SNAPSHOTS_LOCK = threading.Lock()
+POSTMAN_VAR_PATTERNS: Dict[tuple, Any] = {}
+COLLECTION_CACHE_VERSION = 1
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+LATENCY_SKETCH_ACCURACY = 0.01
+LATENCY_SCOPES = ('Environment', 'Folder', 'Request')
+PHASE_TIMINGS = threading.local()
+REQUEST_PHASES = (('dns_ms', 'DNS'), ('connect_ms', 'Connect'), ('tls_ms', 'TLS'), ('ttfb_ms', 'Wait (TTFB)'), ('download_ms', 'Download'))
 
 TEST_DATA_FILE = 'test_data.xlsx'
+WORKBOOK_CACHE_SUFFIX = '.cache.pkl'
+WORKBOOK_CACHE_VERSION = 2
+WORKBOOK_STREAMED_SHEETS = ('Data',)
+WORKBOOK_SNAPSHOTS: Dict[str, Dict[str, Any]] = {}
 DEFAULT_CONFIG = {
     'COLLECTION_FILE': 'MemberAPI_Final.json',
     'ODS_URL': 'https://ccss-tmg-facets.us-e1.cloudhub.io/api',
@@ -68,9 +99,74 @@ DEFAULT_CONFIG = {
     'BASIC_AUTH_PASS': '',
     'POSTMAN_VARS': '',
     'SCHEMA_DIR': 'schemas',
-    'REQUEST_TIMEOUT':'30'
+    'SCHEMA_VALIDATOR': 'JSONSCHEMA',
+    'SCHEMA_VALIDATION_WORKERS': '2',
+    'SCHEMA_POOL_MIN_BYTES': '262144',
+    'REQUEST_TIMEOUT':'30',
+    'ODS_MAX_WORKERS': '8',
+    'PRD_MAX_WORKERS': '8',
+    'PAIRED_DISPATCH': 'YES',
+    'HTTP_POOL_SIZE': '16',
+    'HTTP_WARMUP_CONNECTIONS': '0',
+    'ODS_MAX_RPS': '0',
+    'PRD_MAX_RPS': '20',
+    'ODS_MAX_IN_FLIGHT': '8',
+    'PRD_MAX_IN_FLIGHT': '8',
+    'LATENCY_SPIKE_FACTOR': '3',
+    'MAX_RETRIES': '2',
+    'RETRY_BACKOFF_MS': '500',
+    'RETRY_MAX_BACKOFF_MS': '8000',
+    'RETRY_STATUS_CODES': '429,503',
+    'HEDGE_REQUESTS': 'NO',
+    'HEDGE_PERCENTILE': '95',
+    'RESPONSE_STORE_DIR': 'response_store',
+    'RESPONSE_STORE_KEEP_RUNS': '10',
+    'DIFF_ENGINE': 'KEYED',
+    'LIST_IDENTITY_KEYS': 'MEMBER_ID',
+    'INSPECT_TESTS': '',
+    'REPORT_MODE': 'AUTO',
+    'REPORT_SHARD_THRESHOLD': '500',
+    'REPORT_SHARD_SIZE': '50',
+    'REPORT_PAGE_SIZE': '100',
+    'CASSETTE_MODE': 'OFF',
+    'CASSETTE_FILE': 'api_cassette.sqlite',
+    'RUN_MANIFEST_FILE': 'last_run_manifest.json',
+    'RERUN_OUTCOMES': 'CRITICAL_FAIL,TIMEOUT',
+    'SNAPSHOT_DIR': 'snapshots',
+    'SNAPSHOT_ENV': 'PRD',
+    'SNAPSHOT_VERSION': '',
+    'LOAD_ENVS': 'PRD',
+    'LOAD_CONCURRENCY': '8',
+    'LOAD_TARGET_RPS': '0',
+    'LOAD_DURATION_SECONDS': '60',
+    'LOAD_INTERVAL_SECONDS': '10',
+    'LATENCY_HISTORY_FILE': 'latency_history.sqlite',
+    'REGRESSION_GATE': 'MARK',
+    'REGRESSION_BASELINE_RUNS': '10',
+    'REGRESSION_MIN_SAMPLES': '5',
+    'REGRESSION_P_VALUE': '0.01',
+    'REGRESSION_MIN_SLOWDOWN_PCT': '10',
+    'COLLECTION_CACHE_DIR': 'collection_cache',
+    'COLLECTION_CACHE_KEEP_ENTRIES': '10'
 }
 
+def configure_logging(log_file: str = None):
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.insert(0, logging.FileHandler(log_file, mode='w', encoding='utf-8'))
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=handlers)
+
+def check_required_libraries() -> bool:
+    missing = [name for name in REQUIRED_LIBRARIES if importlib.util.find_spec(name) is None]
+    if missing:
+        logger.critical(f"ERROR: Missing required libraries for execution. Please install: pip install pandas openpyxl requests deepdiff jinja2 colorama jsonschema. Missing: {', '.join(missing)}")
+        return False
+    if not JSONSCHEMA_AVAILABLE:
+        logger.warning("WARNING: jsonschema not installed. Response Schema Validation will be skipped. Install with 'pip install jsonschema'.")
+    return True
+
 def get_status_color(status_code: int) -> str:
     if 200 <= status_code < 300: return Fore.GREEN
     if 400 <= status_code < 500: return Fore.YELLOW
@@ -82,12 +178,26 @@ def escape_html(text: str) -> str:
         return str(text)
     return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
 
+def get_postman_vars_pattern(vars_dict: Dict[str, str]):
+    keys = tuple(sorted(vars_dict, key=len, reverse=True))
+    if keys not in POSTMAN_VAR_PATTERNS:
+        POSTMAN_VAR_PATTERNS[keys] = re.compile(r'\{\{(' + '|'.join(re.escape(k) for k in keys) + r')\}\}') if keys else None
+    return POSTMAN_VAR_PATTERNS[keys]
+
 def apply_postman_vars(text: str, vars_dict: Dict[str, str]) -> str:
     if not isinstance(text, str):
         return text
-    for key, value in vars_dict.items():
-        text = text.replace(f'{{{{{key}}}}}', value)
-    return text
+    pattern = get_postman_vars_pattern(vars_dict)
+    if pattern is None:
+        return text
+    return pattern.sub(lambda match: vars_dict[match.group(1)], text)
+
+def get_int_setting(settings: Dict[str, Any], key: str, default: int) -> int:
+    try:
+        return int(float(str(settings.get(key, default)).strip()))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid integer value '{settings.get(key)}' for {key}. Using default {default}.")
+        return default
 
 def get_unique_filepath(directory, filename):
     base, ext = os.path.splitext(filename)
@@ -100,6 +210,139 @@ def get_unique_filepath(directory, filename):
         
     return final_path
 
+class ResponseStore:
+    def __init__(self, store_dir: Path):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.known_digests = set()
+
+    def _path(self, digest: str) -> Path:
+        return self.store_dir / digest[:2] / f"{digest}.gz"
+
+    def put(self, text: str) -> str:
+        data = (text or '').encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in self.known_digests:
+            return digest
+
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp_path, path)
+
+        self.known_digests.add(digest)
+        return digest
+
+    def has(self, digest: str) -> bool:
+        return bool(digest) and (digest in self.known_digests or self._path(digest).exists())
+
+    def get(self, digest: str) -> str:
+        if not digest:
+            return ''
+        try:
+            with open(self._path(digest), 'rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except (OSError, EOFError) as e:
+            logger.error(f"Failed to read stored response '{digest}': {e}")
+            return escape_html(f"Stored response {digest} is unavailable.")
+
+    def prune(self, keep_digests) -> Tuple[int, int]:
+        removed_count = 0
+        removed_bytes = 0
+        for path in self.store_dir.glob('*/*.gz'):
+            digest = path.name[:-len('.gz')]
+            if digest in keep_digests:
+                continue
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove stored response '{digest}': {e}")
+                continue
+            self.known_digests.discard(digest)
+            removed_count += 1
+            removed_bytes += size
+        return removed_count, removed_bytes
+
+def get_response_store(settings: Dict[str, Any]) -> ResponseStore:
+    global RESPONSE_STORE
+    with RESPONSE_STORE_LOCK:
+        if RESPONSE_STORE is None:
+            RESPONSE_STORE = ResponseStore(Path.cwd() / settings.get('RESPONSE_STORE_DIR', 'response_store'))
+        return RESPONSE_STORE
+
+class Cassette:
+    def __init__(self, cassette_file: Path):
+        self.connection = sqlite3.connect(str(cassette_file), check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS exchanges ("
+                "request_key TEXT PRIMARY KEY, method TEXT, url TEXT, status_code INTEGER, "
+                "headers TEXT, body BLOB, encoding TEXT, response_time INTEGER, recorded_at TEXT)"
+            )
+            self.connection.commit()
+
+    @staticmethod
+    def request_key(method: str, url: str, headers: Dict[str, str], body: Any, ignored_headers: List[str]) -> str:
+        key_headers = sorted((k.title(), str(v)) for k, v in headers.items() if k.title() not in ignored_headers)
+        key_body = body.decode('utf-8', 'replace') if isinstance(body, bytes) else str(body or '')
+        return hashlib.sha256(json.dumps([method.upper(), url, key_body, key_headers]).encode('utf-8')).hexdigest()
+
+    def record(self, request_key: str, method: str, url: str, response: 'requests.Response', response_time: int):
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO exchanges VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (request_key, method.upper(), url, response.status_code, json.dumps(dict(response.headers)),
+                 gzip.compress(response.content), response.encoding, response_time, datetime.now().isoformat())
+            )
+            self.connection.commit()
+
+    def replay(self, request_key: str):
+        import requests
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT url, status_code, headers, body, encoding, response_time FROM exchanges WHERE request_key = ?",
+                (request_key,)
+            ).fetchone()
+        if row is None:
+            return None, 0
+
+        url, status_code, headers, body, encoding, response_time = row
+        response = requests.Response()
+        response.url = url
+        response.status_code = status_code
+        response.headers = requests.structures.CaseInsensitiveDict(json.loads(headers))
+        response._content = gzip.decompress(body)
+        response.encoding = encoding
+        return response, response_time
+
+    def close(self):
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
+
+def get_cassette(settings: Dict[str, Any]) -> Cassette:
+    global CASSETTE
+    with CASSETTE_LOCK:
+        if CASSETTE is None:
+            CASSETTE = Cassette(Path.cwd() / settings.get('CASSETTE_FILE', 'api_cassette.sqlite'))
+            logger.info(f"Cassette {str(settings.get('CASSETTE_MODE', 'OFF')).upper()} mode using {settings.get('CASSETTE_FILE')}.")
+        return CASSETTE
+
+def close_cassette():
+    global CASSETTE
+    with CASSETTE_LOCK:
+        if CASSETTE is not None:
+            CASSETTE.close()
+            CASSETTE = None
+
 def get_record_count(json_data: Any) -> int:
     if json_data is None:
         return 0
@@ -115,6 +358,85 @@ def get_record_count(json_data: Any) -> int:
         
     return 0
 
+def hash_file(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_workbook_sheets(data_file_path: Path) -> Dict[str, List[tuple]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(data_file_path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for sheet_name in workbook.sheetnames:
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            if sheet_name in WORKBOOK_STREAMED_SHEETS:
+                rows = itertools.islice(rows, 1)
+            sheets[sheet_name] = [tuple(row) for row in rows]
+        return sheets
+    finally:
+        workbook.close()
+
+def iter_workbook_rows(data_file_path: Path, sheet_name: str, min_row: int = 1):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(data_file_path, read_only=True, data_only=True)
+    try:
+        for row in workbook[sheet_name].iter_rows(min_row=min_row, values_only=True):
+            yield tuple(row)
+    finally:
+        workbook.close()
+
+def save_workbook_cache(cache_path: Path, snapshot: Dict[str, Any]):
+    try:
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Could not write workbook cache {cache_path.name}: {e}")
+
+def load_workbook_snapshot(data_file_path: Path) -> Dict[str, Any]:
+    stat = data_file_path.stat()
+    file_key = str(data_file_path.resolve())
+
+    snapshot = WORKBOOK_SNAPSHOTS.get(file_key)
+    if snapshot and (snapshot['mtime_ns'], snapshot['size']) == (stat.st_mtime_ns, stat.st_size):
+        return snapshot
+
+    cache_path = data_file_path.with_name(data_file_path.name + WORKBOOK_CACHE_SUFFIX)
+    try:
+        with open(cache_path, 'rb') as f:
+            snapshot = pickle.load(f)
+        if snapshot.get('version') != WORKBOOK_CACHE_VERSION:
+            snapshot = None
+    except FileNotFoundError:
+        snapshot = None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable workbook cache {cache_path.name}: {e}")
+        snapshot = None
+
+    if snapshot is None or (snapshot['mtime_ns'], snapshot['size']) != (stat.st_mtime_ns, stat.st_size):
+        file_hash = hash_file(data_file_path)
+        if snapshot is None or snapshot['sha256'] != file_hash:
+            logger.info(f"Reading workbook {data_file_path.name} (cache miss).")
+            snapshot = {'version': WORKBOOK_CACHE_VERSION, 'sha256': file_hash, 'sheets': read_workbook_sheets(data_file_path)}
+        snapshot['mtime_ns'] = stat.st_mtime_ns
+        snapshot['size'] = stat.st_size
+        save_workbook_cache(cache_path, snapshot)
+
+    WORKBOOK_SNAPSHOTS[file_key] = snapshot
+    return snapshot
+
+def get_workbook_sheet(data_file_path: Path, sheet_name: str) -> List[tuple]:
+    sheets = load_workbook_snapshot(data_file_path)['sheets']
+    if sheet_name not in sheets:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    return sheets[sheet_name]
+
 def load_settings_from_excel(data_file: str) -> Dict[str, Any]:
     settings = DEFAULT_CONFIG.copy()
     data_file_path = Path.cwd() / data_file
@@ -126,11 +448,10 @@ def load_settings_from_excel(data_file: str) -> Dict[str, Any]:
             logger.error(f"Config file '{data_file}' not found. Using default internal settings.")
             return settings
 
-        settings_df = pd.read_excel(data_file_path, sheet_name='Settings', header=None)
-        settings_dict = settings_df.set_index(0).to_dict()[1]
-
-        for key, value in settings_dict.items():
-            if pd.notna(value):
+        for row in get_workbook_sheet(data_file_path, 'Settings'):
+            key = row[0] if row else None
+            value = row[1] if len(row) > 1 else None
+            if key is not None and value is not None:
                 settings[str(key).strip()] = str(value).strip()
 
         settings['DYNAMIC_FIELD_TERMS'] = [t.strip() for t in settings['DYNAMIC_FIELD_TERMS'].split(',') if t.strip()]
@@ -139,8 +460,16 @@ def load_settings_from_excel(data_file: str) -> Dict[str, Any]:
         settings['AUTO_OPEN_HTML'] = settings['AUTO_OPEN_HTML'].upper()
         settings['ENABLE_PERF_GRAPH'] = settings['ENABLE_PERF_GRAPH'].upper()
         settings['RUN_MODE'] = settings['RUN_MODE'].upper()
+        settings['PAIRED_DISPATCH'] = settings['PAIRED_DISPATCH'].upper()
+        settings['CASSETTE_MODE'] = settings['CASSETTE_MODE'].upper()
+        settings['SNAPSHOT_ENV'] = settings['SNAPSHOT_ENV'].upper()
+        settings['REGRESSION_GATE'] = settings['REGRESSION_GATE'].upper()
 
         settings['EXCLUDE_FIELD_NAMES_LIST'] = [t.strip() for t in settings['EXCLUDE_FIELD_NAMES'].split(',') if t.strip()]
+        settings['LIST_IDENTITY_KEYS_LIST'] = [t.strip() for t in settings['LIST_IDENTITY_KEYS'].split(',') if t.strip()]
+        settings['INSPECT_TESTS_LIST'] = [t.strip() for t in settings['INSPECT_TESTS'].split(',') if t.strip()]
+        settings['LOAD_ENVS_LIST'] = [t.strip().upper() for t in settings['LOAD_ENVS'].split(',') if t.strip()]
+        settings['RERUN_OUTCOMES_LIST'] = [t.strip().upper() for t in settings['RERUN_OUTCOMES'].split(',') if t.strip()]
 
         settings['POSTMAN_VARS_DICT'] = {}
         for item in settings['POSTMAN_VARS'].split(','):
@@ -161,17 +490,63 @@ def load_settings_from_excel(data_file: str) -> Dict[str, Any]:
 
     return settings
 
-def export_to_excel(data, output_dir):
+def style_excel_worksheet(worksheet):
+    from openpyxl.styles import PatternFill, Font, Alignment
+
+    header_fill = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+    for col in worksheet.iter_cols(min_row=1, max_row=1):
+        for cell in col:
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = header_alignment
+
+    for column in worksheet.columns:
+        max_length = 0
+        column_letter = column[0].column_letter
+        for cell in column:
+            try:
+                if cell.row < 100 and len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            except:
+                pass
+        adjusted_width = min(max_length + 2, 80)
+        adjusted_width = max(adjusted_width, 10)
+        worksheet.column_dimensions[column_letter].width = adjusted_width
+
+def latency_summary_to_excel_rows(latency_summary: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    excel_rows = []
+    for row in latency_summary:
+        excel_row = {'Scope': row['scope'], 'Name': row['name']}
+        for env in ('ODS', 'PRD'):
+            env_summary = row[env.lower()] or {}
+            excel_row[f"{env} Count"] = env_summary.get('count', 0)
+            excel_row[f"{env} Avg (ms)"] = env_summary.get('avg')
+            for q in LATENCY_PERCENTILES:
+                excel_row[f"{env} p{q} (ms)"] = env_summary.get(f"p{q}")
+            excel_row[f"{env} Max (ms)"] = env_summary.get('max')
+        excel_rows.append(excel_row)
+    return excel_rows
+
+def export_to_excel(data, output_dir, latency_summary=None, latency_regressions=None, path_classifier: 'PathClassifier' = None):
     excel_path = get_unique_filepath(output_dir, 'comparison_report.xlsx')
     
     logger.info("--- Generating Excel Report ---")
     try:
+        import pandas as pd
+
         excel_data = [{
             'Test Case': item['test_name'],
             'ODS Status': item['ods_status'],
             'PRD Status': item['prd_status'],
             'ODS Time (ms)': item['ods_time'].replace(' ms', ''),
             'PRD Time (ms)': item['prd_time'].replace(' ms', ''),
+            'ODS Timing Breakdown': item.get('ods_timing_detail', ''),
+            'PRD Timing Breakdown': item.get('prd_timing_detail', ''),
+            'ODS Size (bytes)': item.get('ods_response_bytes'),
+            'PRD Size (bytes)': item.get('prd_response_bytes'),
             'ODS Records': item.get('ods_record_count', 0),
             'PRD Records': item.get('prd_record_count', 0),
             'Test_Type': item['test_type'],
@@ -180,35 +555,35 @@ def export_to_excel(data, output_dir):
             'Comments': item['comments']
         } for item in data]
 
+        if path_classifier:
+            for excel_row, item in zip(excel_data, data):
+                classified = classify_diff_paths(item.get('diff_paths', []), path_classifier)
+                excel_row['Critical Diff Keys'] = ', '.join(classified[PathClassifier.CRITICAL])
+                excel_row['Dynamic Diff Keys'] = ', '.join(classified[PathClassifier.DYNAMIC])
+                excel_row['Excluded Diff Keys'] = ', '.join(classified[PathClassifier.EXCLUDED])
+
         df = pd.DataFrame(excel_data)
 
         writer = pd.ExcelWriter(excel_path, engine='openpyxl')
         df.to_excel(writer, sheet_name='Comparison Report', index=False)
-        workbook  = writer.book
-        worksheet = writer.sheets['Comparison Report']
-
-        header_fill = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
-        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-        for col in worksheet.iter_cols(min_row=1, max_row=1):
-            for cell in col:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = header_alignment
-
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if cell.row < 100 and len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 80)
-            adjusted_width = max(adjusted_width, 10)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+        style_excel_worksheet(writer.sheets['Comparison Report'])
+
+        if latency_summary:
+            pd.DataFrame(latency_summary_to_excel_rows(latency_summary)).to_excel(writer, sheet_name='Latency Percentiles', index=False)
+            style_excel_worksheet(writer.sheets['Latency Percentiles'])
+
+        if latency_regressions:
+            pd.DataFrame([{
+                'Environment': r['environment'],
+                'Request': r['request_name'],
+                'Baseline Samples': r['baseline_samples'],
+                'Current Samples': r['current_samples'],
+                'Baseline Median (ms)': r['baseline_median'],
+                'Current Median (ms)': r['current_median'],
+                'Slowdown (%)': r['slowdown_pct'],
+                'p-value': r['p_value']
+            } for r in latency_regressions]).to_excel(writer, sheet_name='Latency Regressions', index=False)
+            style_excel_worksheet(writer.sheets['Latency Regressions'])
 
         writer.close()
 
@@ -218,12 +593,246 @@ def export_to_excel(data, output_dir):
         logger.error(f"Error exporting to Excel: {e}")
         return None
 
-def check_api_health(environment_name: str, base_url: str) -> bool:
+def elapsed_ms(start: float, end: float) -> float:
+    return (end - start) * 1000
+
+class PhaseTimingMixin:
+    def _new_conn(self):
+        from urllib3.exceptions import ConnectTimeoutError
+        from urllib3.util.connection import allowed_gai_family
+
+        timings = getattr(PHASE_TIMINGS, 'current', None)
+        dns_host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)))
+        except OSError:
+            addresses = []
+        resolved = time.perf_counter()
+
+        hosts = addresses or [dns_host]
+        try:
+            for attempt, host in enumerate(hosts, start=1):
+                self._dns_host = host
+                try:
+                    sock = super()._new_conn()
+                    break
+                except ConnectTimeoutError:
+                    if attempt == len(hosts):
+                        raise
+        finally:
+            self._dns_host = dns_host
+
+        if timings is not None:
+            timings['dns_ms'] += elapsed_ms(start, resolved)
+            timings['connect_ms'] += elapsed_ms(resolved, time.perf_counter())
+        return sock
+
+class TLSTimingMixin:
+    def connect(self):
+        timings = getattr(PHASE_TIMINGS, 'current', None)
+        setup_before = (timings['dns_ms'] + timings['connect_ms']) if timings is not None else 0
+        start = time.perf_counter()
+        super().connect()
+
+        if timings is not None:
+            socket_setup = timings['dns_ms'] + timings['connect_ms'] - setup_before
+            timings['tls_ms'] += max(0.0, elapsed_ms(start, time.perf_counter()) - socket_setup)
+
+def new_timed_http_adapter(pool_size: int):
+    global TIMED_HTTP_ADAPTER_CLASS
+    if TIMED_HTTP_ADAPTER_CLASS is None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        class TimedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = type('TimedHTTPConnection', (PhaseTimingMixin, HTTPConnection), {})
+
+        class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = type('TimedHTTPSConnection', (TLSTimingMixin, PhaseTimingMixin, HTTPSConnection), {})
+
+        class TimedHTTPAdapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+        TIMED_HTTP_ADAPTER_CLASS = TimedHTTPAdapter
+    return TIMED_HTTP_ADAPTER_CLASS(pool_connections=1, pool_maxsize=pool_size, pool_block=False)
+
+def format_phase_timings(phase_timings: Dict[str, float], response_bytes) -> str:
+    if not phase_timings:
+        return ''
+    phases = ' / '.join(f"{label} {phase_timings.get(key, 0)}" for key, label in REQUEST_PHASES)
+    size = f", {response_bytes:,} bytes" if isinstance(response_bytes, int) else ''
+    return f"{phases} ms{size}"
+
+def get_http_session(environment_name: str, settings: Dict[str, Any]) -> 'requests.Session':
+    import requests
+
+    with HTTP_SESSIONS_LOCK:
+        session = HTTP_SESSIONS.get(environment_name)
+        if session is None:
+            pool_size = max(1, get_int_setting(settings, 'HTTP_POOL_SIZE', 16))
+            if settings.get('RUN_MODE', 'DUAL').upper() == 'LOAD':
+                pool_size = max(pool_size, get_int_setting(settings, 'LOAD_CONCURRENCY', 8))
+            session = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = new_timed_http_adapter(pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            HTTP_SESSIONS[environment_name] = session
+        return session
+
+def close_http_sessions():
+    close_hedge_executor()
+    with HTTP_SESSIONS_LOCK:
+        for session in HTTP_SESSIONS.values():
+            session.close()
+        HTTP_SESSIONS.clear()
+
+def warm_up_http_session(environment_name: str, base_url: str, settings: Dict[str, Any]):
+    connection_count = get_int_setting(settings, 'HTTP_WARMUP_CONNECTIONS', 0)
+    if connection_count <= 0:
+        return
+
+    import requests
+
+    session = get_http_session(environment_name, settings)
+
+    def open_connection(_):
+        try:
+            session.head(base_url, timeout=10)
+            return True
+        except requests.exceptions.RequestException:
+            return False
+
+    with ThreadPoolExecutor(max_workers=connection_count) as executor:
+        opened = sum(executor.map(open_connection, range(connection_count)))
+
+    logger.info(f"Warmed up {opened}/{connection_count} keep-alive connections to {environment_name}.")
+
+class AdaptiveRateLimiter:
+    def __init__(self, environment_name: str, max_rps: float, max_in_flight: int, latency_spike_factor: float, clock=time.monotonic):
+        self.environment_name = environment_name
+        self.clock = clock
+        self.max_rps = max_rps
+        self.rate = max_rps
+        self.max_in_flight = max(1, max_in_flight)
+        self.in_flight_limit = self.max_in_flight
+        self.in_flight = 0
+        self.latency_spike_factor = latency_spike_factor
+        self.endpoint_latency: Dict[str, Dict[str, Any]] = {}
+        self.tokens = max(1.0, max_rps)
+        self.last_refill = clock()
+        self.paused_until = 0.0
+        self.condition = threading.Condition()
+
+    def _refill(self, now: float):
+        if self.rate > 0:
+            self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def _try_acquire(self, is_hedge: bool):
+        now = self.clock()
+        self._refill(now)
+        wait = self.paused_until - now
+        if wait <= 0 and (is_hedge or self.in_flight < self.in_flight_limit):
+            if self.rate <= 0 or self.tokens >= 1:
+                if self.rate > 0:
+                    self.tokens -= 1
+                if not is_hedge:
+                    self.in_flight += 1
+                return True, 0
+            wait = (1 - self.tokens) / self.rate
+        return False, wait
+
+    def acquire(self, is_hedge: bool = False):
+        with self.condition:
+            while True:
+                acquired, wait = self._try_acquire(is_hedge)
+                if acquired:
+                    return
+                self.condition.wait(timeout=wait if wait > 0 else None)
+
+    def _is_latency_spike(self, endpoint: str, status_code: Any, response_time: int) -> bool:
+        if not isinstance(status_code, int):
+            return False
+
+        stats = self.endpoint_latency.setdefault(endpoint, {'ewma': None, 'samples': 0, 'spike_streak': 0})
+        if stats['ewma'] is not None and stats['samples'] >= 10 and response_time > stats['ewma'] * self.latency_spike_factor:
+            stats['spike_streak'] += 1
+            return stats['spike_streak'] >= LATENCY_SPIKE_PERSISTENCE
+
+        stats['spike_streak'] = 0
+        stats['samples'] += 1
+        stats['ewma'] = response_time if stats['ewma'] is None else 0.9 * stats['ewma'] + 0.1 * response_time
+        return False
+
+    def release(self, status_code: Any, response_time: int, retry_after: Any = None, is_hedge: bool = False, endpoint: str = ''):
+        with self.condition:
+            if not is_hedge:
+                self.in_flight -= 1
+
+            is_spike = self._is_latency_spike(endpoint, status_code, response_time)
+
+            if status_code in THROTTLE_STATUS_CODES or is_spike:
+                self.in_flight_limit = max(1, self.in_flight_limit // 2)
+                if self.max_rps > 0:
+                    self.rate = max(self.max_rps * 0.05, self.rate * (0.5 if status_code in THROTTLE_STATUS_CODES else 0.8))
+                try:
+                    if retry_after is not None:
+                        self.paused_until = max(self.paused_until, self.clock() + min(float(retry_after), 60.0))
+                except ValueError:
+                    pass
+                reason = f"HTTP {status_code}" if status_code in THROTTLE_STATUS_CODES else f"latency spike ({response_time} ms)"
+                logger.warning(f"{self.environment_name} throttling detected ({reason}). Backing off to {self.in_flight_limit} in-flight" + (f", {self.rate:.1f} req/s." if self.max_rps > 0 else "."))
+            else:
+                if self.in_flight_limit < self.max_in_flight:
+                    self.in_flight_limit += 1
+                if self.max_rps > 0 and self.rate < self.max_rps:
+                    self.rate = min(self.max_rps, self.rate + self.max_rps * 0.05)
+
+            self.condition.notify_all()
+
+def get_rate_limiter(environment_name: str, settings: Dict[str, Any]) -> AdaptiveRateLimiter:
+    with RATE_LIMITERS_LOCK:
+        limiter = RATE_LIMITERS.get(environment_name)
+        if limiter is None:
+            try:
+                max_rps = float(str(settings.get(f"{environment_name}_MAX_RPS", 0)).strip() or 0)
+                spike_factor = float(str(settings.get('LATENCY_SPIKE_FACTOR', 3)).strip() or 3)
+            except ValueError:
+                logger.warning(f"Invalid rate limit settings for {environment_name}. Rate limiting disabled.")
+                max_rps, spike_factor = 0.0, 3.0
+            max_in_flight = get_int_setting(settings, f"{environment_name}_MAX_IN_FLIGHT", get_int_setting(settings, f"{environment_name}_MAX_WORKERS", 1))
+            limiter = AdaptiveRateLimiter(environment_name, max_rps, max_in_flight, spike_factor)
+            RATE_LIMITERS[environment_name] = limiter
+        return limiter
+
+def get_health_check_ssl_context():
+    import ssl
+
+    ca_bundle = os.environ.get('REQUESTS_CA_BUNDLE') or os.environ.get('CURL_CA_BUNDLE')
+    if not ca_bundle and importlib.util.find_spec('certifi') is not None:
+        import certifi
+        ca_bundle = certifi.where()
+    return ssl.create_default_context(cafile=ca_bundle)
+
+def check_api_health(environment_name: str, base_url: str, settings: Dict[str, Any]) -> bool:
+    import urllib.error
+    import urllib.request
+
     logger.info(f"\n--- Checking {environment_name} API Health (Phase 1/5) ---")
+    env_color = Fore.CYAN if environment_name == 'ODS' else Fore.BLUE
     try:
-        response = requests.get(base_url, timeout=10)
-        status_code = response.status_code
-        env_color = Fore.CYAN if environment_name == 'ODS' else Fore.BLUE
+        ssl_context = get_health_check_ssl_context() if base_url.lower().startswith('https://') else None
+        try:
+            with urllib.request.urlopen(base_url, timeout=10, context=ssl_context) as response:
+                status_code = response.status
+        except urllib.error.HTTPError as e:
+            status_code = e.code
+            e.close()
 
         if 200 <= status_code < 300:
             logger.info(f"[{env_color}{environment_name}{Style.RESET_ALL} HEALTH CHECK] {Fore.GREEN}SUCCESS{Style.RESET_ALL}: API is reachable and healthy (HTTP {status_code}).")
@@ -235,21 +844,89 @@ def check_api_health(environment_name: str, base_url: str) -> bool:
             logger.error(f"[{env_color}{environment_name}{Style.RESET_ALL} HEALTH CHECK] {Fore.RED}FAILURE{Style.RESET_ALL}: Received Unexpected HTTP {status_code}. Investigate service stability.")
             return False
 
-    except requests.exceptions.Timeout:
+    except TimeoutError:
         logger.error(f"[{env_color}{environment_name}{Style.RESET_ALL} HEALTH CHECK] {Fore.RED}FAILURE{Style.RESET_ALL}: Connection timed out after 10 seconds.")
         return False
-    except requests.exceptions.ConnectionError as e:
-        logger.error(f"[{env_color}{environment_name}{Style.RESET_ALL} HEALTH CHECK] {Fore.RED}FAILURE{Style.RESET_ALL}: Could not connect to API at {base_url}. Error: {e.__class__.__name__}")
+    except urllib.error.URLError as e:
+        if isinstance(e.reason, TimeoutError):
+            logger.error(f"[{env_color}{environment_name}{Style.RESET_ALL} HEALTH CHECK] {Fore.RED}FAILURE{Style.RESET_ALL}: Connection timed out after 10 seconds.")
+        else:
+            logger.error(f"[{env_color}{environment_name}{Style.RESET_ALL} HEALTH CHECK] {Fore.RED}FAILURE{Style.RESET_ALL}: Could not connect to API at {base_url}. Error: {e.reason.__class__.__name__}")
         return False
     except Exception as e:
         logger.error(f"[{env_color}{environment_name}{Style.RESET_ALL} HEALTH CHECK] {Fore.RED}UNKNOWN ERROR{Style.RESET_ALL}: {e}")
         return False
 
+def get_collection_cache_path(collection_bytes: bytes, target_prefixes: List[str], settings: Dict[str, Any]):
+    cache_dir = settings.get('COLLECTION_CACHE_DIR', '')
+    if not cache_dir:
+        return None
+    cache_key = hashlib.sha256(collection_bytes)
+    cache_key.update(json.dumps([COLLECTION_CACHE_VERSION, sorted(settings['POSTMAN_VARS_DICT'].items()), target_prefixes]).encode('utf-8'))
+    return Path.cwd() / cache_dir / f"{cache_key.hexdigest()}.json"
+
+def load_cached_requests(cache_path: Path):
+    if cache_path is None or not cache_path.exists():
+        return None
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached_requests = json.load(f)
+        os.utime(cache_path)
+        return cached_requests
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable collection cache {cache_path.name}: {e}")
+        return None
+
+def save_cached_requests(cache_path: Path, requests_list: List[Dict[str, Any]]):
+    if cache_path is None:
+        return
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(requests_list, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Could not write collection cache: {e}")
+
+def prune_collection_cache(cache_path: Path, settings: Dict[str, Any]):
+    keep_entries = get_int_setting(settings, 'COLLECTION_CACHE_KEEP_ENTRIES', 10)
+    if cache_path is None or keep_entries <= 0:
+        return
+
+    try:
+        entries = sorted(cache_path.parent.glob('*.json'), key=lambda p: p.stat().st_mtime, reverse=True)
+    except OSError as e:
+        logger.warning(f"Skipping collection cache pruning: {e}")
+        return
+
+    removed_count = 0
+    for stale_path in entries[keep_entries:]:
+        try:
+            stale_path.unlink()
+            removed_count += 1
+        except OSError as e:
+            logger.warning(f"Could not remove collection cache entry {stale_path.name}: {e}")
+    if removed_count:
+        logger.info(f"Pruned {removed_count} collection cache entries beyond the {keep_entries} most recently used.")
+
 def extract_requests(collection_file: Path, target_prefixes: List[str], settings: Dict[str, Any]) -> List[Dict[str, Any]]:
     logger.info(f"Loading collection from: {collection_file.resolve()}")
     try:
-        with open(collection_file, 'r', encoding='utf-8') as f:
-            collection = json.load(f)
+        with open(collection_file, 'rb') as f:
+            collection_bytes = f.read()
+    except Exception as e:
+        logger.error(f"Error reading or parsing JSON collection file: {e}")
+        raise
+
+    cache_path = get_collection_cache_path(collection_bytes, target_prefixes, settings)
+    cached_requests = load_cached_requests(cache_path)
+    if cached_requests is not None:
+        logger.info(f"Loaded {len(cached_requests)} TARGET requests from the collection cache.")
+        return cached_requests
+
+    try:
+        collection = json.loads(collection_bytes.decode('utf-8'))
     except Exception as e:
         logger.error(f"Error reading or parsing JSON collection file: {e}")
         raise
@@ -285,6 +962,7 @@ def extract_requests(collection_file: Path, target_prefixes: List[str], settings
                 requests_list.append({
                     'folder': folder_name,
                     'name': request_name,
+                    'request_name': request_name,
                     'method': req.get('method', 'POST'),
                     'headers': headers,
                     'body': raw_body,
@@ -293,10 +971,137 @@ def extract_requests(collection_file: Path, target_prefixes: List[str], settings
 
     process_items(collection.get('item', []))
     logger.info(f"Successfully extracted {len(requests_list)} TARGET requests for execution.")
+    save_cached_requests(cache_path, requests_list)
+    prune_collection_cache(cache_path, settings)
     return requests_list
 
-def run_api_test(request_data: Dict[str, Any], environment_base_url: str, environment_name: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+def send_http_request(environment_name: str, method: str, url: str, headers: Dict[str, str], body: Any, settings: Dict[str, Any], is_hedge: bool = False, throttle: bool = True, endpoint: str = '', reserved: bool = False):
+    import requests
+
+    cassette_mode = str(settings.get('CASSETTE_MODE', 'OFF')).upper()
+    cassette_key = None
+    if cassette_mode in ('RECORD', 'REPLAY'):
+        cassette_key = Cassette.request_key(method, url, headers, body, [str(settings.get('AUTH_HEADER', 'Authorization')).title()])
+
+    if cassette_mode == 'REPLAY':
+        response, response_time = get_cassette(settings).replay(cassette_key)
+        if response is None:
+            logger.warning(f"Cassette miss: no recorded response for {method.upper()} {url}. Record it with CASSETTE_MODE=RECORD.")
+            return requests.exceptions.ConnectionError(f"No cassette entry for {method.upper()} {url}"), 0
+        return response, response_time
+
+    rate_limiter = get_rate_limiter(environment_name, settings) if throttle else None
+    endpoint = endpoint or f"{method.upper()} {url.split('?', 1)[0]}"
+    if rate_limiter and not reserved:
+        rate_limiter.acquire(is_hedge)
+
+    phase_timings = {'dns_ms': 0.0, 'connect_ms': 0.0, 'tls_ms': 0.0}
+    PHASE_TIMINGS.current = phase_timings
+    start_time = time.perf_counter()
+    try:
+        response = get_http_session(environment_name, settings).request(
+            method=method,
+            url=url,
+            headers=headers,
+            data=body,
+            timeout=60,
+            stream=True
+        )
+        headers_time = time.perf_counter()
+        response.content
+        end_time = time.perf_counter()
+    except requests.exceptions.RequestException as e:
+        response_time = int(elapsed_ms(start_time, time.perf_counter()))
+        if rate_limiter:
+            rate_limiter.release('TIMEOUT/ERROR', response_time, is_hedge=is_hedge, endpoint=endpoint)
+        return e, response_time
+    finally:
+        PHASE_TIMINGS.current = None
+
+    response_time = int(elapsed_ms(start_time, end_time))
+    connection_setup = phase_timings['dns_ms'] + phase_timings['connect_ms'] + phase_timings['tls_ms']
+    phase_timings['ttfb_ms'] = max(0.0, elapsed_ms(start_time, headers_time) - connection_setup)
+    phase_timings['download_ms'] = elapsed_ms(headers_time, end_time)
+    response.phase_timings = {key: round(value, 1) for key, value in phase_timings.items()}
+    if rate_limiter:
+        rate_limiter.release(response.status_code, response_time, response.headers.get('Retry-After'), is_hedge, endpoint)
+
+    with RECENT_LATENCIES_LOCK:
+        RECENT_LATENCIES.setdefault(environment_name, deque(maxlen=500)).append(response_time)
+
+    if cassette_mode == 'RECORD':
+        get_cassette(settings).record(cassette_key, method, url, response, response_time)
+
+    return response, response_time
+
+def get_hedge_delay_ms(environment_name: str, settings: Dict[str, Any]):
+    if str(settings.get('HEDGE_REQUESTS', 'NO')).upper() != 'YES':
+        return None
+
+    with RECENT_LATENCIES_LOCK:
+        latencies = sorted(RECENT_LATENCIES.get(environment_name, []))
 
+    if len(latencies) < HEDGE_MIN_SAMPLES:
+        return None
+
+    percentile = min(99, max(50, get_int_setting(settings, 'HEDGE_PERCENTILE', 95)))
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))]
+
+def get_hedge_executor(settings: Dict[str, Any]) -> ThreadPoolExecutor:
+    global HEDGE_EXECUTOR
+    with HEDGE_EXECUTOR_LOCK:
+        if HEDGE_EXECUTOR is None:
+            caller_workers = max(1, get_int_setting(settings, 'ODS_MAX_WORKERS', 1)) + max(1, get_int_setting(settings, 'PRD_MAX_WORKERS', 1))
+            HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=caller_workers * HEDGE_SLOTS_PER_WORKER, thread_name_prefix="hedge-worker")
+        return HEDGE_EXECUTOR
+
+def close_hedge_executor():
+    global HEDGE_EXECUTOR
+    with HEDGE_EXECUTOR_LOCK:
+        executor, HEDGE_EXECUTOR = HEDGE_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def send_hedged_request(environment_name: str, method: str, url: str, headers: Dict[str, str], body: Any, settings: Dict[str, Any], endpoint: str = '', reserved: bool = False):
+    import requests
+
+    hedge_delay_ms = get_hedge_delay_ms(environment_name, settings)
+    if hedge_delay_ms is None:
+        outcome, response_time = send_http_request(environment_name, method, url, headers, body, settings, endpoint=endpoint, reserved=reserved)
+        return outcome, response_time, False
+
+    executor = get_hedge_executor(settings)
+    primary = executor.submit(send_http_request, environment_name, method, url, headers, body, settings, endpoint=endpoint, reserved=reserved)
+    try:
+        outcome, response_time = primary.result(timeout=hedge_delay_ms / 1000)
+        return outcome, response_time, False
+    except FuturesTimeoutError:
+        pass
+
+    hedge = executor.submit(send_http_request, environment_name, method, url, headers, body, settings, True, endpoint=endpoint)
+    done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+    winner = primary if primary in done else hedge
+    loser = hedge if winner is primary else primary
+
+    outcome, response_time = winner.result()
+    if isinstance(outcome, requests.exceptions.RequestException):
+        winner, loser = loser, winner
+        outcome, response_time = winner.result()
+
+    if winner is hedge:
+        return outcome, hedge_delay_ms + response_time, True
+    return outcome, response_time, False
+
+def parse_json_body(text: str) -> Any:
+    try:
+        clean_text = (text or '').strip().lstrip('\ufeff')
+        if clean_text:
+            return json.loads(clean_text)
+    except Exception:
+        pass
+    return None
+
+def build_request(request_data: Dict[str, Any], environment_base_url: str, settings: Dict[str, Any]):
     url_placeholder = request_data['base_url_placeholder']
     final_url = re.sub(r'\{\{baseurl\}\}', environment_base_url, url_placeholder, flags=re.IGNORECASE)
 
@@ -305,14 +1110,6 @@ def run_api_test(request_data: Dict[str, Any], environment_base_url: str, enviro
         param_string = '&'.join([f"{k}={v}" for k, v in request_data['url_params'].items()])
         final_url += separator + param_string
 
-    env_color = Fore.BLUE if 'PRD' in environment_name.upper() else Fore.CYAN
-
-    expected_status = request_data.get('expected_status_code')
-    status_hint = f" (Expect {expected_status})" if expected_status else ""
-
-    status_msg = f"{request_data['name']:<70} ({env_color}{environment_name}{Style.RESET_ALL}){status_hint} ..... Executing"
-    print(status_msg, end='\r')
-
     headers = {k.title(): v for k, v in request_data['headers'].items()}
     
     if 'Content-Type' not in headers:
@@ -338,90 +1135,495 @@ def run_api_test(request_data: Dict[str, Any], environment_base_url: str, enviro
 
     header_overrides = {k.title(): v for k, v in request_data.get('header_overrides', {}).items()}
     headers.update(header_overrides)
+    return final_url, headers
 
-    start_time = time.time()
-    try:
-        response = requests.request(
-            method=request_data['method'],
-            url=final_url,
-            headers=headers,
-            data=request_data['body'],
-            timeout=60
-        )
-        end_time = time.time()
-        response_time = int((end_time - start_time) * 1000)
+def is_expected_status(status_code, expected_status) -> bool:
+    if not isinstance(status_code, int):
+        return False
+    if expected_status is not None:
+        return status_code == expected_status
+    return 200 <= status_code < 300
 
-        status_color = get_status_color(response.status_code)
+def run_api_test(request_data: Dict[str, Any], environment_base_url: str, environment_name: str, settings: Dict[str, Any], reserved: bool = False) -> Dict[str, Any]:
+    import requests
 
-        final_msg = f"{request_data['name']:<70} ({env_color}{environment_name}{Style.RESET_ALL}){status_hint} ..... {status_color}Complete{Style.RESET_ALL} (Status: {response.status_code} in {response_time} ms)      "
-        print(final_msg)
+    env_color = Fore.BLUE if 'PRD' in environment_name.upper() else Fore.CYAN
 
-        json_body = None
-        response_text = escape_html(response.text)
+    expected_status = request_data.get('expected_status_code')
+    status_hint = f" (Expect {expected_status})" if expected_status else ""
 
-        try:
-            clean_text = response.text.strip().lstrip('\ufeff')
-            if clean_text:
-                json_body = json.loads(clean_text)
-                response_text = escape_html(json.dumps(json_body, indent=2))
-        except Exception:
-            json_body = None
+    if threading.current_thread() is threading.main_thread():
+        status_msg = f"{request_data['name']:<70} ({env_color}{environment_name}{Style.RESET_ALL}){status_hint} ..... Executing"
+        print(status_msg, end='\r')
+
+    final_url, headers = build_request(request_data, environment_base_url, settings)
+
+    max_retries = 0 if str(settings.get('CASSETTE_MODE', 'OFF')).upper() == 'REPLAY' else max(0, get_int_setting(settings, 'MAX_RETRIES', 0))
+    backoff_ms = get_int_setting(settings, 'RETRY_BACKOFF_MS', 500)
+    max_backoff_ms = get_int_setting(settings, 'RETRY_MAX_BACKOFF_MS', 8000)
+    retry_status_codes = {int(c) for c in str(settings.get('RETRY_STATUS_CODES', '')).split(',') if c.strip().isdigit()}
+
+    attempts = 0
+    while True:
+        attempts += 1
+        outcome, response_time, hedge_won = send_hedged_request(environment_name, request_data['method'], final_url, headers, request_data['body'], settings, request_data.get('request_name', request_data['name']), reserved and attempts == 1)
+
+        if isinstance(outcome, requests.exceptions.RequestException):
+            retry_reason = outcome.__class__.__name__
+        elif outcome.status_code in retry_status_codes:
+            retry_reason = f"HTTP {outcome.status_code}"
+        else:
+            retry_reason = None
+
+        if retry_reason is None or attempts > max_retries:
+            break
+
+        delay_ms = random.uniform(0, min(max_backoff_ms, backoff_ms * (2 ** (attempts - 1))))
+        logger.warning(f"Retrying {request_data['name']} on {environment_name} after {retry_reason} (attempt {attempts + 1}/{max_retries + 1}, backoff {int(delay_ms)} ms).")
+        time.sleep(delay_ms / 1000)
+
+    retry_hint = f", {attempts} attempts" if attempts > 1 else ""
+    hedge_hint = ", hedge won" if hedge_won else ""
+
+    if isinstance(outcome, requests.exceptions.RequestException):
+        e = outcome
+
+        final_msg = f"{request_data['name']:<70} ({env_color}{environment_name}{Style.RESET_ALL}){status_hint} ..... {Fore.RED}FAILED{Style.RESET_ALL} (Error: {e.__class__.__name__} in {response_time} ms{retry_hint})      "
+        with CONSOLE_LOCK:
+            print(final_msg)
+
+        logger.error(f"Request failed for {request_data['name']} on {environment_name}: {e.__class__.__name__}")
 
         return {
-            'status_code': response.status_code,
+            'status_code': 'TIMEOUT/ERROR',
             'response_time': response_time,
-            'json_body': json_body,
-            'raw_text': response_text
+            'json_body': None,
+            'raw_body_ref': get_response_store(settings).put(f"Request Error: {e.__class__.__name__}: {e}"),
+            'attempts': attempts,
+            'hedge_won': hedge_won
         }
 
-    except requests.exceptions.RequestException as e:
-        end_time = time.time()
-        response_time = int((end_time - start_time) * 1000)
+    response = outcome
+    status_color = get_status_color(response.status_code)
 
-        final_msg = f"{request_data['name']:<70} ({env_color}{environment_name}{Style.RESET_ALL}){status_hint} ..... {Fore.RED}FAILED{Style.RESET_ALL} (Error: {e.__class__.__name__} in {response_time} ms)      "
+    final_msg = f"{request_data['name']:<70} ({env_color}{environment_name}{Style.RESET_ALL}){status_hint} ..... {status_color}Complete{Style.RESET_ALL} (Status: {response.status_code} in {response_time} ms{retry_hint}{hedge_hint})      "
+    with CONSOLE_LOCK:
         print(final_msg)
 
-        logger.error(f"Request failed for {request_data['name']} on {environment_name}: {e.__class__.__name__}")
+    return {
+        'status_code': response.status_code,
+        'response_time': response_time,
+        'json_body': parse_json_body(response.text),
+        'raw_body_ref': get_response_store(settings).put(response.text),
+        'attempts': attempts,
+        'hedge_won': hedge_won,
+        'phase_timings': getattr(response, 'phase_timings', None),
+        'response_bytes': len(response.content)
+    }
+
+def iter_completed(items, task, max_workers: int, thread_name_prefix: str):
+    if max_workers <= 1:
+        for i, item in enumerate(items):
+            yield i, task(item)
+        return
+
+    indexed_items = enumerate(items)
+    window = max_workers * 2
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix) as executor:
+        pending = {}
+
+        def submit_next():
+            for i, item in indexed_items:
+                pending[executor.submit(task, item)] = i
+                return
+
+        for _ in range(window):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = pending.pop(future)
+                submit_next()
+                yield i, future.result()
+
+def iter_env_results(all_runs, environment_base_url: str, environment_name: str, settings: Dict[str, Any]):
+    max_workers = max(1, get_int_setting(settings, f"{environment_name}_MAX_WORKERS", 1))
+    if max_workers > 1:
+        logger.info(f"Dispatching {environment_name} requests with {max_workers} concurrent workers.")
+
+    def task(req_data):
+        return run_api_test(req_data, environment_base_url, environment_name, settings)
+
+    return iter_completed(all_runs, task, max_workers, f"{environment_name}-worker")
+
+def iter_paired_results(all_runs, ods_base_url: str, prd_base_url: str, settings: Dict[str, Any]):
+    pair_workers = max(1, min(get_int_setting(settings, 'ODS_MAX_WORKERS', 1), get_int_setting(settings, 'PRD_MAX_WORKERS', 1)))
+
+    logger.info(f"Dispatching paired ODS/PRD requests with {pair_workers} concurrent pairs.")
+    with ThreadPoolExecutor(max_workers=pair_workers, thread_name_prefix="ODS-worker") as ods_executor:
+
+        def run_pair(req_data):
+            reserved = settings.get('CASSETTE_MODE', 'OFF') != 'REPLAY'
+            if reserved:
+                get_rate_limiter('ODS', settings).acquire()
+                get_rate_limiter('PRD', settings).acquire()
+            ods_future = ods_executor.submit(run_api_test, req_data, ods_base_url, 'ODS', settings, reserved)
+            prd_res = run_api_test(req_data, prd_base_url, 'PRD', settings, reserved)
+            return ods_future.result(), prd_res
+
+        for i, (ods_res, prd_res) in iter_completed(all_runs, run_pair, pair_workers, "PRD-worker"):
+            yield i, ods_res, prd_res
+
+def iter_result_pairs(all_runs, settings: Dict[str, Any]):
+    run_mode = settings.get('RUN_MODE', 'DUAL').upper()
+    ods_url = settings['ODS_URL']
+    prd_url = settings['PRD_URL']
+
+    if run_mode == 'DUAL' and settings.get('PAIRED_DISPATCH', 'YES').upper() == 'YES':
+        logger.info("\n------------ Executing and Comparing Paired ODS/PRD Requests (Phase 2-3/5 - DUAL) ------------")
+        yield from iter_paired_results(all_runs, ods_url, prd_url, settings)
+
+    elif run_mode == 'DUAL':
+        all_runs = list(all_runs)
+        logger.info("\n------------ Executing ODS Requests (Phase 2/5 - ODS) ------------")
+        ods_results = execute_runs(all_runs, ods_url, 'ODS', settings)
+        logger.info("\n------------ Executing and Comparing PRD Requests (Phase 2-3/5 - PRD) ------------")
+        for i, prd_res in iter_env_results(all_runs, prd_url, 'PRD', settings):
+            yield i, ods_results[i], prd_res
+            ods_results[i] = None
+
+    elif run_mode == 'BASELINE':
+        yield from iter_baseline_result_pairs(all_runs, settings)
+
+    else:
+        target_env = get_live_environments(settings)[0]
+        logger.info(f"\n------------ Executing and Comparing {target_env} Requests (Phase 2-3/5 - {target_env}) ------------")
+        logger.info(f"Single-run mode ({run_mode}) enabled. Using {target_env} results for both sides of the comparison.")
+        for i, res in iter_env_results(all_runs, prd_url if target_env == 'PRD' else ods_url, target_env, settings):
+            yield i, res, res
+
+def get_live_environments(settings: Dict[str, Any]) -> List[str]:
+    run_mode = settings.get('RUN_MODE', 'DUAL').upper()
+    snapshot_env = settings.get('SNAPSHOT_ENV', 'PRD').upper()
+
+    if run_mode == 'DUAL':
+        return ['ODS', 'PRD']
+    if run_mode == 'SNAPSHOT':
+        return [snapshot_env]
+    if run_mode == 'BASELINE':
+        return ['ODS' if snapshot_env == 'PRD' else 'PRD']
+    if run_mode == 'LOAD':
+        return [env for env in ('ODS', 'PRD') if env in settings.get('LOAD_ENVS_LIST', ['PRD'])]
+    return ['PRD' if run_mode == 'PRD_ONLY' else 'ODS']
+
+def get_snapshot_dir(settings: Dict[str, Any]) -> Path:
+    return Path.cwd() / settings.get('SNAPSHOT_DIR', 'snapshots')
+
+def write_snapshot(manifest_entries, settings: Dict[str, Any]):
+    snapshot_dir = get_snapshot_dir(settings)
+    snapshot_env = settings.get('SNAPSHOT_ENV', 'PRD').upper()
+    version = settings.get('SNAPSHOT_VERSION') or datetime.now().strftime('%Y%m%d-%H%M%S')
+    snapshot_path = snapshot_dir / f"{version}.json"
+
+    response_store = get_response_store(settings)
+    body_store = ResponseStore(snapshot_dir / 'bodies')
+
+    tests = []
+    for entry in manifest_entries:
+        if entry is None:
+            continue
+        result = dict(entry[snapshot_env.lower()])
+        result['raw_body_ref'] = body_store.put(response_store.get(result['raw_body_ref']))
+        tests.append({'test_name': entry['test_name'], 'request_hash': entry['request_hash'], 'result': result})
+
+    snapshot = {
+        'version': version,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': snapshot_env,
+        'base_url': settings[f"{snapshot_env}_URL"],
+        'tests': tests
+    }
 
+    try:
+        with open(snapshot_path, 'x', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        (snapshot_dir / 'LATEST').write_text(version, encoding='utf-8')
+        logger.info(f"Snapshot '{version}' of {snapshot_env} saved with {len(tests)} tests: {snapshot_path}")
+        return version
+    except Exception as e:
+        logger.error(f"Failed to save snapshot '{version}': {e}")
+        return None
+
+def get_baseline_snapshot(settings: Dict[str, Any]) -> Dict[str, Any]:
+    snapshot_dir = get_snapshot_dir(settings)
+    version = settings.get('SNAPSHOT_VERSION')
+
+    try:
+        if not version:
+            version = (snapshot_dir / 'LATEST').read_text(encoding='utf-8').strip()
+
+        with BASELINE_SNAPSHOTS_LOCK:
+            snapshot_path = str(snapshot_dir / f"{version}.json")
+            if snapshot_path not in BASELINE_SNAPSHOTS:
+                with open(snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                snapshot['tests'] = {entry['test_name']: entry for entry in snapshot['tests']}
+                BASELINE_SNAPSHOTS[snapshot_path] = snapshot
+                logger.info(f"Loaded baseline snapshot '{version}' of {snapshot['environment']} ({len(snapshot['tests'])} tests, captured {snapshot['created']}).")
+            return BASELINE_SNAPSHOTS[snapshot_path]
+
+    except Exception as e:
+        logger.critical(f"ERROR: Could not load baseline snapshot '{version or 'LATEST'}' from {snapshot_dir}: {e}")
+        return None
+
+def restore_snapshot_result(req_data: Dict[str, Any], snapshot: Dict[str, Any], body_store: ResponseStore, settings: Dict[str, Any]) -> Dict[str, Any]:
+    response_store = get_response_store(settings)
+    entry = snapshot['tests'].get(req_data['name'])
+
+    if entry is None:
         return {
-            'status_code': 'TIMEOUT/ERROR',
-            'response_time': response_time,
+            'status_code': 'NO BASELINE',
+            'response_time': 0,
             'json_body': None,
-            'raw_text': escape_html(f"Request Error: {e.__class__.__name__}: {e}")
+            'raw_body_ref': response_store.put(f"No entry for this test in baseline snapshot {snapshot['version']}."),
+            'attempts': 0,
+            'hedge_won': False
         }
 
-def highlight_diffs_in_json(ods_json, prd_json, diff_obj):
-    ods_text_unescaped = json.dumps(ods_json, indent=2)
-    prd_text_unescaped = json.dumps(prd_json, indent=2)
-
-    ods_text = escape_html(ods_text_unescaped)
-    prd_text = escape_html(prd_text_unescaped)
-
-    highlight_tag_start = '<span class="diff-highlight">'
-    highlight_tag_end = '</span>'
-
-    keys_to_highlight = set()
-
-    def find_mismatched_keys(d1, d2, collected_keys):
-        if isinstance(d1, dict) and isinstance(d2, dict):
-            all_keys = set(d1.keys()) | set(d2.keys())
-            for k in all_keys:
-                if k not in d1 or k not in d2:
-                    collected_keys.add(k)
-                elif d1[k] != d2[k]:
-                    if isinstance(d1[k], dict) and isinstance(d2[k], dict):
-                        find_mismatched_keys(d1[k], d2[k], collected_keys)
-                        collected_keys.add(k)
-                    elif isinstance(d1[k], list) and isinstance(d2[k], list):
-                        collected_keys.add(k)
-                        for i in range(min(len(d1[k]), len(d2[k]))):
-                            find_mismatched_keys(d1[k][i], d2[k][i], collected_keys)
-                    else:
-                        collected_keys.add(k)
+    if entry['request_hash'] != compute_request_hash(req_data):
+        logger.warning(f"Request for {req_data['name']} changed since baseline snapshot {snapshot['version']}. Comparing anyway.")
+
+    res = dict(entry['result'])
+    raw_text = body_store.get(res['raw_body_ref'])
+    response_store.put(raw_text)
+    res['json_body'] = None if res['status_code'] == 'TIMEOUT/ERROR' else parse_json_body(raw_text)
+    res['restored'] = True
+    return res
+
+def iter_baseline_result_pairs(all_runs, settings: Dict[str, Any]):
+    snapshot = get_baseline_snapshot(settings)
+    if snapshot is None:
+        return
+
+    snapshot_env = snapshot['environment']
+    live_env = 'ODS' if snapshot_env == 'PRD' else 'PRD'
+    body_store = ResponseStore(get_snapshot_dir(settings) / 'bodies')
+
+    logger.info(f"\n------------ Executing {live_env} and Comparing Against {snapshot_env} Snapshot {snapshot['version']} (Phase 2-3/5 - BASELINE) ------------")
+    for i, live_res in iter_env_results(all_runs, settings[f"{live_env}_URL"], live_env, settings):
+        snapshot_res = restore_snapshot_result(all_runs[i], snapshot, body_store, settings)
+        if live_env == 'ODS':
+            yield i, live_res, snapshot_res
+        else:
+            yield i, snapshot_res, live_res
+
+def describe_environment_source(environment_name: str, settings: Dict[str, Any]) -> str:
+    live_envs = get_live_environments(settings)
+    if environment_name in live_envs:
+        return settings[f"{environment_name}_URL"]
+    if settings.get('RUN_MODE', 'DUAL').upper() == 'BASELINE':
+        snapshot = get_baseline_snapshot(settings)
+        if snapshot is not None:
+            return f"Snapshot {snapshot['version']} of {snapshot['base_url']}"
+    return f"N/A ({live_envs[0]} Mode)"
+
+def execute_runs(all_runs: List[Dict[str, Any]], environment_base_url: str, environment_name: str, settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    results = [None] * len(all_runs)
+    for i, res in iter_env_results(all_runs, environment_base_url, environment_name, settings):
+        results[i] = res
+    return results
+
+def new_load_stats() -> Dict[str, Any]:
+    return {'sketch': LatencySketch(), 'errors': 0, 'error_types': {}}
+
+def merge_load_stats(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    target['sketch'].merge(source['sketch'])
+    target['errors'] += source['errors']
+    for error_type, count in source['error_types'].items():
+        target['error_types'][error_type] = target['error_types'].get(error_type, 0) + count
+    return target
+
+def run_load_test(all_runs: List[Dict[str, Any]], settings: Dict[str, Any]) -> Dict[str, Any]:
+    import requests
+
+    load_envs = get_live_environments(settings)
+    concurrency = max(1, get_int_setting(settings, 'LOAD_CONCURRENCY', 8))
+    try:
+        target_rps = max(0.0, float(str(settings.get('LOAD_TARGET_RPS', 0)).strip() or 0))
+    except ValueError:
+        logger.warning(f"Invalid LOAD_TARGET_RPS '{settings.get('LOAD_TARGET_RPS')}'. Running unpaced.")
+        target_rps = 0.0
+    duration = max(1, get_int_setting(settings, 'LOAD_DURATION_SECONDS', 60))
+    interval = max(1, get_int_setting(settings, 'LOAD_INTERVAL_SECONDS', 10))
+
+    jobs = []
+    for req_data in all_runs:
+        for env in load_envs:
+            final_url, headers = build_request(req_data, settings[f"{env}_URL"], settings)
+            jobs.append((env, req_data['method'], final_url, headers, req_data['body'], req_data.get('expected_status_code')))
+
+    stats = {env: {'total': new_load_stats(), 'intervals': {}} for env in load_envs}
+    stats_lock = threading.Lock()
+    schedule_lock = threading.Lock()
+    issued = [0]
+
+    rate_hint = f"{target_rps:g} RPS" if target_rps else "unpaced"
+    logger.info(f"\n------------ Load Test: {', '.join(load_envs)} for {duration}s, {concurrency} workers, {rate_hint} ({len(jobs)} request variants) ------------")
+
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def record(env, finished_at, response_time, error_type):
+        bucket = min(int((finished_at - start) // interval), (duration - 1) // interval)
+        with stats_lock:
+            bucket_stats = stats[env]['intervals'].setdefault(bucket, new_load_stats())
+            bucket_stats['sketch'].record(response_time)
+            if error_type:
+                bucket_stats['errors'] += 1
+                bucket_stats['error_types'][error_type] = bucket_stats['error_types'].get(error_type, 0) + 1
+
+    def worker():
+        while True:
+            with schedule_lock:
+                sequence = issued[0]
+                issued[0] += 1
+
+            if target_rps:
+                scheduled_at = start + sequence / target_rps
+                if scheduled_at >= deadline:
+                    return
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if time.perf_counter() >= deadline:
+                return
+
+            env, method, url, headers, body, expected_status = jobs[sequence % len(jobs)]
+            outcome, response_time = send_http_request(env, method, url, headers, body, settings, throttle=False)
+
+            if isinstance(outcome, requests.exceptions.RequestException):
+                error_type = outcome.__class__.__name__
+            elif not is_expected_status(outcome.status_code, expected_status):
+                error_type = f"HTTP {outcome.status_code}"
+            else:
+                error_type = None
+            record(env, time.perf_counter(), response_time, error_type)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="LOAD-worker") as executor:
+        futures = [executor.submit(worker) for _ in range(concurrency)]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=interval)
+            with stats_lock:
+                progress = ', '.join(f"{env}: {sum(b['sketch'].count for b in env_stats['intervals'].values())} req / {sum(b['errors'] for b in env_stats['intervals'].values())} err" for env, env_stats in stats.items())
+            with CONSOLE_LOCK:
+                print(f"[{int(time.perf_counter() - start)}s/{duration}s] {progress}")
+        for future in futures:
+            future.result()
+
+    for env_stats in stats.values():
+        for bucket in sorted(env_stats['intervals']):
+            merge_load_stats(env_stats['total'], env_stats['intervals'][bucket])
+
+    elapsed = max(time.perf_counter() - start, duration)
+    return {'stats': stats, 'elapsed': elapsed, 'duration': duration, 'interval': interval, 'concurrency': concurrency, 'target_rps': target_rps}
+
+def summarize_load_stats(env: str, bucket_stats: Dict[str, Any], seconds: float) -> Dict[str, Any]:
+    sketch = bucket_stats['sketch']
+    summary = sketch.summary()
+    return {
+        'Environment': env,
+        'Requests': sketch.count,
+        'Throughput (req/s)': round(sketch.count / seconds, 2) if seconds > 0 else 0,
+        'Errors': bucket_stats['errors'],
+        'Error Rate (%)': round(100 * bucket_stats['errors'] / sketch.count, 2) if sketch.count else 0,
+        'Avg (ms)': summary['avg'],
+        **{f"p{q} (ms)": summary[f"p{q}"] for q in LATENCY_PERCENTILES},
+        'Max (ms)': summary['max'],
+        'Error Breakdown': ', '.join(f"{error_type} x{count}" for error_type, count in sorted(bucket_stats['error_types'].items()))
+    }
 
-        elif isinstance(d1, list) and isinstance(d2, list):
-             for i in range(min(len(d1), len(d2))):
-                 find_mismatched_keys(d1[i], d2[i], collected_keys)
+def export_load_test_report(load_results: Dict[str, Any], output_dir: str):
+    excel_path = get_unique_filepath(output_dir, 'load_test_report.xlsx')
+    interval = load_results['interval']
+    elapsed = load_results['elapsed']
+
+    summary_rows = []
+    timeline_rows = []
+    for env, env_stats in load_results['stats'].items():
+        summary_row = summarize_load_stats(env, env_stats['total'], elapsed)
+        summary_rows.append(summary_row)
+        logger.info(f"{env}: {summary_row['Requests']} requests, {summary_row['Throughput (req/s)']} req/s, "
+                    f"{summary_row['Error Rate (%)']}% errors, p50 {summary_row['p50 (ms)']} ms, p99 {summary_row['p99 (ms)']} ms")
+
+        for bucket in sorted(env_stats['intervals']):
+            bucket_seconds = min(interval, load_results['duration'] - bucket * interval)
+            timeline_row = {'Interval Start (s)': bucket * interval}
+            timeline_row.update(summarize_load_stats(env, env_stats['intervals'][bucket], bucket_seconds))
+            timeline_rows.append(timeline_row)
+
+    try:
+        import pandas as pd
+
+        writer = pd.ExcelWriter(excel_path, engine='openpyxl')
+        pd.DataFrame(summary_rows).to_excel(writer, sheet_name='Load Summary', index=False)
+        style_excel_worksheet(writer.sheets['Load Summary'])
+        pd.DataFrame(timeline_rows).to_excel(writer, sheet_name='Timeline', index=False)
+        style_excel_worksheet(writer.sheets['Timeline'])
+        writer.close()
+
+        logger.info(f"\n--- Load test report successfully generated at: {os.path.abspath(excel_path)} ---")
+        return os.path.abspath(excel_path)
+    except Exception as e:
+        logger.error(f"Error exporting load test report: {e}")
+        return None
+
+def parse_diff_path(path: Any) -> tuple:
+    return tuple(ast.literal_eval(token) for token in DIFF_PATH_TOKEN_PATTERN.findall(str(path)))
+
+def render_json_scalar(value: Any) -> str:
+    return escape_html(json.dumps(value)).replace('\\n', '<br>').replace('\\"', '&#34;')
+
+def render_highlighted_json(json_data: Any, highlight_paths: Dict[tuple, str]) -> str:
+    out = []
+
+    def render(value, path, indent):
+        css_class = highlight_paths.get(path)
+        if css_class:
+            out.append(f'<span class="{css_class}">')
+
+        if isinstance(value, dict) and value:
+            child_indent = indent + '  '
+            out.append('{\n')
+            for n, (key, child) in enumerate(value.items()):
+                if n:
+                    out.append(',\n')
+                out.append(f"{child_indent}{render_json_scalar(str(key))}: ")
+                render(child, path + (key,), child_indent)
+            out.append(f"\n{indent}}}")
+        elif isinstance(value, list) and value:
+            child_indent = indent + '  '
+            out.append('[\n')
+            for n, child in enumerate(value):
+                if n:
+                    out.append(',\n')
+                out.append(child_indent)
+                render(child, path + (n,), child_indent)
+            out.append(f"\n{indent}]")
+        else:
+            out.append(render_json_scalar(value))
+
+        if css_class:
+            out.append('</span>')
+
+    render(json_data, (), '')
+    return ''.join(out)
+
+def highlight_diffs_in_json(ods_json, prd_json, diff_obj, path_classifier: 'PathClassifier' = None):
+    ods_paths = {}
+    prd_paths = {}
 
     for diff_type in diff_obj.keys():
         diff_data = diff_obj[diff_type]
@@ -431,477 +1633,1188 @@ def highlight_diffs_in_json(ods_json, prd_json, diff_obj):
              iterable = [(k, {}) for k in diff_data]
 
         for path, diff_values in iterable:
-            matches = re.findall(r"\['(.*?)'\]", path)
-            if matches:
-                keys_to_highlight.add(matches[-1])
+            css_class = 'diff-highlight'
+            if path_classifier and path_classifier.classify(path) != PathClassifier.CRITICAL:
+                css_class = 'diff-highlight soft'
+
+            new_path = diff_values.get('new_path', path) if isinstance(diff_values, dict) else path
+            if diff_type in ('dictionary_item_added', 'iterable_item_added'):
+                prd_paths[parse_diff_path(path)] = css_class
+            elif diff_type in ('dictionary_item_removed', 'iterable_item_removed'):
+                ods_paths[parse_diff_path(path)] = css_class
+            else:
+                ods_paths[parse_diff_path(path)] = css_class
+                prd_paths[parse_diff_path(new_path)] = css_class
 
-            val1 = diff_values.get('old_value') or diff_values.get('old_type')
-            val2 = diff_values.get('new_value') or diff_values.get('new_type')
+    return render_highlighted_json(ods_json, ods_paths), render_highlighted_json(prd_json, prd_paths)
 
-            find_mismatched_keys(val1, val2, keys_to_highlight)
+def canonical_json_hash(value: Any, cache: Dict[int, bytes] = None) -> bytes:
+    if isinstance(value, (dict, list)):
+        if cache is not None and id(value) in cache:
+            return cache[id(value)]
 
-    def apply_highlight(json_text, target_keys):
-        highlighted = json_text
-        for key in target_keys:
-            try:
-                pattern = r'("' + re.escape(key) + r'"\s*:\s*)(.*?)((,?\n)|(,?$))'
+        if isinstance(value, dict):
+            hasher = hashlib.blake2b(b'dict', digest_size=16)
+            for key, child_hash in sorted((str(k), canonical_json_hash(v, cache)) for k, v in value.items()):
+                hasher.update(key.encode('utf-8'))
+                hasher.update(child_hash)
+        else:
+            hasher = hashlib.blake2b(b'list', digest_size=16)
+            for child_hash in sorted(canonical_json_hash(v, cache) for v in value):
+                hasher.update(child_hash)
 
-                def replacement(m):
-                    prefix = m.group(1)
-                    val = m.group(2)
-                    suffix = m.group(3)
-                    if highlight_tag_start in val: return m.group(0)
-                    return f"{prefix}{highlight_tag_start}{val}{highlight_tag_end}{suffix}"
+        digest = hasher.digest()
+        if cache is not None:
+            cache[id(value)] = digest
+        return digest
 
-                highlighted = re.sub(pattern, replacement, highlighted, flags=re.MULTILINE)
-            except Exception:
-                pass
-        return highlighted.replace('\\n', '<br>').replace('\\"', '&#34;')
+    return hashlib.blake2b(f"{type(value).__name__}:{json.dumps(value)}".encode('utf-8'), digest_size=16).digest()
 
-    return apply_highlight(ods_text, keys_to_highlight), apply_highlight(prd_text, keys_to_highlight)
+def keyed_json_diff(old_json: Any, new_json: Any, identity_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    diff = {}
+    hash_cache = {}
 
-def extract_field_name_from_path(path: str) -> str:
-    match = re.findall(r"\'([A-Z_]+)\'", path)
-    if match:
-        return match[-1]
-    return path
+    def node_hash(value):
+        return canonical_json_hash(value, hash_cache)
+
+    def record(diff_type, path, details):
+        diff.setdefault(diff_type, {})[path] = details
+
+    def find_identity_key(old_list, new_list):
+        for key in identity_keys:
+            if all(isinstance(item, dict) and key in item for item in old_list) and all(isinstance(item, dict) and key in item for item in new_list):
+                return key
+        return None
+
+    def compare_lists(old_list, new_list, path, new_path):
+        identity_key = find_identity_key(old_list, new_list) if old_list and new_list else None
+        pairs = []
+        unmatched_old = []
+
+        if identity_key:
+            new_positions = {}
+            for j, item in enumerate(new_list):
+                new_positions.setdefault(node_hash(item[identity_key]), []).append(j)
+            for i, item in enumerate(old_list):
+                candidates = new_positions.get(node_hash(item[identity_key]))
+                if candidates:
+                    pairs.append((i, candidates.pop(0)))
+                else:
+                    unmatched_old.append(i)
+            unmatched_new = sorted(j for positions in new_positions.values() for j in positions)
+        else:
+            new_positions = {}
+            for j, item in enumerate(new_list):
+                new_positions.setdefault(node_hash(item), []).append(j)
+            for i, item in enumerate(old_list):
+                candidates = new_positions.get(node_hash(item))
+                if candidates:
+                    candidates.pop(0)
+                else:
+                    unmatched_old.append(i)
+            unmatched_new = sorted(j for positions in new_positions.values() for j in positions)
+            pairs = list(zip(unmatched_old, unmatched_new))
+            unmatched_old = unmatched_old[len(pairs):]
+            unmatched_new = unmatched_new[len(pairs):]
+
+        for i, j in pairs:
+            compare(old_list[i], new_list[j], f"{path}[{i}]", f"{new_path}[{j}]")
+        for i in unmatched_old:
+            record('iterable_item_removed', f"{path}[{i}]", {'old_value': old_list[i]})
+        for j in unmatched_new:
+            record('iterable_item_added', f"{new_path}[{j}]", {'new_value': new_list[j]})
+
+    def compare(old_value, new_value, path, new_path):
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            if node_hash(old_value) == node_hash(new_value):
+                return
+            for key, value in old_value.items():
+                child_path = f"{path}[{key!r}]"
+                if key not in new_value:
+                    record('dictionary_item_removed', child_path, {'old_value': value})
+                else:
+                    compare(value, new_value[key], child_path, f"{new_path}[{key!r}]")
+            for key, value in new_value.items():
+                if key not in old_value:
+                    record('dictionary_item_added', f"{new_path}[{key!r}]", {'new_value': value})
+
+        elif isinstance(old_value, list) and isinstance(new_value, list):
+            if node_hash(old_value) != node_hash(new_value):
+                compare_lists(old_value, new_value, path, new_path)
+
+        elif type(old_value) is not type(new_value):
+            record('type_changes', path, {'old_type': type(old_value), 'new_type': type(new_value), 'old_value': old_value, 'new_value': new_value, 'new_path': new_path})
+
+        elif old_value != new_value:
+            record('values_changed', path, {'old_value': old_value, 'new_value': new_value, 'new_path': new_path})
+
+    compare(old_json, new_json, 'root', 'root')
+    return diff
+
+class PathClassifier:
+    EXCLUDED = 'EXCLUDED'
+    DYNAMIC = 'DYNAMIC'
+    CRITICAL = 'CRITICAL'
+
+    def __init__(self, exclude_terms: List[str], dynamic_terms: List[str]):
+        self.exclude_pattern = re.compile('|'.join(re.escape(t) for t in exclude_terms)) if exclude_terms else None
+        self.dynamic_pattern = re.compile('|'.join(re.escape(t) for t in dynamic_terms), re.IGNORECASE) if dynamic_terms else None
+        self.cache: Dict[str, str] = {}
+
+    def classify(self, path: Any) -> str:
+        path_key = PATH_INDEX_PATTERN.sub('[]', str(path))
+        category = self.cache.get(path_key)
+        if category is None:
+            if self.exclude_pattern and self.exclude_pattern.search(path_key):
+                category = self.EXCLUDED
+            elif self.dynamic_pattern and self.dynamic_pattern.search(path_key):
+                category = self.DYNAMIC
+            else:
+                category = self.CRITICAL
+            self.cache[path_key] = category
+        return category
+
+def get_path_classifier(settings: Dict[str, Any]) -> PathClassifier:
+    exclude_terms = tuple(settings.get('EXCLUDE_FIELD_NAMES_LIST', []))
+    dynamic_terms = tuple(settings.get('DYNAMIC_FIELD_TERMS', []))
+    with PATH_CLASSIFIERS_LOCK:
+        classifier = PATH_CLASSIFIERS.get((exclude_terms, dynamic_terms))
+        if classifier is None:
+            classifier = PathClassifier(list(exclude_terms), list(dynamic_terms))
+            PATH_CLASSIFIERS[(exclude_terms, dynamic_terms)] = classifier
+        return classifier
+
+def classify_diff_paths(diff_paths: List[str], path_classifier: PathClassifier) -> Dict[str, List[str]]:
+    classified = {PathClassifier.CRITICAL: [], PathClassifier.DYNAMIC: [], PathClassifier.EXCLUDED: []}
+    for path in diff_paths:
+        classified[path_classifier.classify(path)].append(format_deepdiff_path(path))
+    return classified
 
 def format_deepdiff_path(path: str) -> str:
     path = path.replace("root[", "").replace("][", ".").replace("]", "").replace("'", "")
     path = path.replace("[", ".").replace("]", "")
     return path
 
-def compare_requests_results(ods_results, prd_results, extracted_requests, dynamic_field_terms, schema_dir, settings):
-    comparison_data = []
-    overall_metrics = {
+def new_overall_metrics(total_tests: int) -> Dict[str, Any]:
+    return {
         'ods_passed': 0, 'ods_failed': 0, 'prd_passed': 0, 'prd_failed': 0, 
-        'total_tests': len(extracted_requests), 'data_diff_count': 0, 
+        'total_tests': total_tests, 'data_diff_count': 0, 
         'dynamic_diff_count': 0, 'time_data': [], 'status_fail_count': 0, 
         'security_vuln_count': 0, 'stability_fail_count': 0, 'schema_fail_count': 0, 
         'connection_fail_count': 0,
-        'security_findings_list': [], 'stability_findings_list': [], 'schema_findings_list': []
+        'security_findings_list': [], 'stability_findings_list': [], 'schema_findings_list': [],
+        'latency_sketches': {}, 'phase_sketches': {}, 'response_bytes': {}, 'latency_samples': []
     }
 
-    logger.info("Starting result comparison...")
+class LatencySketch:
+    def __init__(self, relative_accuracy: float = LATENCY_SKETCH_ACCURACY):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0
+        self.min_value = None
+        self.max_value = None
+
+    def record(self, value_ms: float):
+        if value_ms <= 0:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value_ms) / self.log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+
+        self.count += 1
+        self.total += value_ms
+        self.min_value = value_ms if self.min_value is None else min(self.min_value, value_ms)
+        self.max_value = value_ms if self.max_value is None else max(self.max_value, value_ms)
+
+    def merge(self, other: 'LatencySketch') -> 'LatencySketch':
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge latency sketches with different relative accuracy.")
+
+        for index, bucket_count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + bucket_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+            self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+        return self
+
+    def _bucket_value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def percentile(self, q: float):
+        if not self.count:
+            return None
 
-    schema_cache = {}
-    schema_path_base = Path.cwd() / schema_dir
+        rank = q / 100 * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return int(round(min(max(self._bucket_value(index), self.min_value), self.max_value)))
+        return int(self.max_value)
+
+    def histogram(self, bin_edges: List[int]) -> List[int]:
+        counts = [0] * len(bin_edges)
+        counts[0] += self.zero_count
+        for index, bucket_count in self.buckets.items():
+            value = self._bucket_value(index)
+            position = 0
+            while position + 1 < len(bin_edges) and value >= bin_edges[position + 1]:
+                position += 1
+            counts[position] += bucket_count
+        return counts
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {f"p{q}": self.percentile(q) for q in LATENCY_PERCENTILES}
+        summary.update({
+            'count': self.count,
+            'avg': int(self.total / self.count) if self.count else None,
+            'max': int(self.max_value) if self.max_value is not None else None
+        })
+        return summary
+
+class LatencyHistory:
+    def __init__(self, history_file: Path):
+        self.connection = sqlite3.connect(str(history_file))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, recorded_at TEXT, run_mode TEXT)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS latency_samples ("
+            "run_id TEXT, environment TEXT, base_url TEXT, request_name TEXT, test_name TEXT, response_time INTEGER)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_latency_samples_endpoint ON latency_samples (environment, base_url, request_name, run_id)"
+        )
+        self.connection.commit()
+
+    def baseline_samples(self, environment_name: str, base_url: str, request_name: str, run_window: int) -> List[int]:
+        rows = self.connection.execute(
+            "SELECT s.response_time FROM latency_samples s JOIN ("
+            "SELECT DISTINCT r.run_id, r.recorded_at FROM runs r JOIN latency_samples x ON x.run_id = r.run_id "
+            "WHERE x.environment = ? AND x.base_url = ? AND x.request_name = ? ORDER BY r.recorded_at DESC LIMIT ?"
+            ") recent ON recent.run_id = s.run_id "
+            "WHERE s.environment = ? AND s.base_url = ? AND s.request_name = ?",
+            (environment_name, base_url, request_name, run_window, environment_name, base_url, request_name)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def record_run(self, run_id: str, run_mode: str, samples):
+        self.connection.execute("INSERT INTO runs VALUES (?, ?, ?)", (run_id, datetime.now().isoformat(), run_mode))
+        self.connection.executemany("INSERT INTO latency_samples VALUES (?, ?, ?, ?, ?, ?)", [(run_id, *sample) for sample in samples])
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+def mann_whitney_greater_p_value(current: List[float], baseline: List[float]) -> float:
+    n1, n2 = len(current), len(baseline)
+    n = n1 + n2
+    combined = sorted([(value, True) for value in current] + [(value, False) for value in baseline])
+
+    current_rank_sum = 0.0
+    tie_term = 0.0
+    position = 0
+    while position < n:
+        end = position
+        while end + 1 < n and combined[end + 1][0] == combined[position][0]:
+            end += 1
+        tie_size = end - position + 1
+        average_rank = (position + end) / 2 + 1
+        current_rank_sum += average_rank * sum(1 for k in range(position, end + 1) if combined[k][1])
+        tie_term += tie_size ** 3 - tie_size
+        position = end + 1
+
+    u_statistic = current_rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+
+    z_score = (u_statistic - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z_score / math.sqrt(2))
+
+def median(values: List[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+def check_latency_regressions(overall_metrics: Dict[str, Any], settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if settings.get('REGRESSION_GATE', 'MARK') == 'OFF':
+        return []
+    if settings.get('CASSETTE_MODE', 'OFF') == 'REPLAY':
+        logger.info("Cassette REPLAY mode: recorded latencies are not live. Skipping latency history and regression check.")
+        return []
+    if not overall_metrics['latency_samples']:
+        logger.info("No live latency samples in this run. Skipping latency history and regression check.")
+        return []
+
+    run_window = max(1, get_int_setting(settings, 'REGRESSION_BASELINE_RUNS', 10))
+    min_samples = max(2, get_int_setting(settings, 'REGRESSION_MIN_SAMPLES', 5))
+    min_slowdown_pct = get_int_setting(settings, 'REGRESSION_MIN_SLOWDOWN_PCT', 10)
+    try:
+        p_threshold = float(settings.get('REGRESSION_P_VALUE', '0.01'))
+    except ValueError:
+        p_threshold = 0.01
+
+    current_samples = {}
+    history_rows = []
+    for env, request_name, test_name, response_time in overall_metrics['latency_samples']:
+        base_url = settings[f"{env}_URL"]
+        current_samples.setdefault((env, base_url, request_name), []).append(response_time)
+        history_rows.append((env, base_url, request_name, test_name, response_time))
+
+    regressions = []
+    try:
+        history = LatencyHistory(Path.cwd() / settings.get('LATENCY_HISTORY_FILE', 'latency_history.sqlite'))
+    except sqlite3.Error as e:
+        logger.error(f"Could not open latency history: {e}. Skipping regression check.")
+        return []
+
+    try:
+        for (env, base_url, request_name), samples in sorted(current_samples.items()):
+            baseline = history.baseline_samples(env, base_url, request_name, run_window)
+            if len(samples) < min_samples or len(baseline) < min_samples:
+                continue
+
+            baseline_median = median(baseline)
+            current_median = median(samples)
+            slowdown_pct = round(100 * (current_median - baseline_median) / baseline_median, 1) if baseline_median > 0 else 0.0
+            p_value = mann_whitney_greater_p_value(samples, baseline)
+
+            if p_value < p_threshold and slowdown_pct >= min_slowdown_pct:
+                regressions.append({
+                    'environment': env,
+                    'request_name': request_name,
+                    'baseline_samples': len(baseline),
+                    'current_samples': len(samples),
+                    'baseline_median': int(baseline_median),
+                    'current_median': int(current_median),
+                    'slowdown_pct': slowdown_pct,
+                    'p_value': float(f"{p_value:.2g}")
+                })
+                logger.warning(f"Latency regression on {env} {request_name}: median {int(baseline_median)} -> {int(current_median)} ms (+{slowdown_pct}%, p={p_value:.2g}).")
+
+        history.record_run(datetime.now().strftime('%Y%m%d-%H%M%S-%f'), settings.get('RUN_MODE', 'DUAL').upper(), history_rows)
+    except sqlite3.Error as e:
+        logger.error(f"Latency history update failed: {e}")
+    finally:
+        history.close()
+
+    logger.info(f"Latency regression check: {len(regressions)} significant slowdown(s) across {len(current_samples)} endpoint/environment pairs.")
+    return regressions
+
+def get_latency_environments(settings: Dict[str, Any]) -> List[str]:
+    if settings.get('RUN_MODE', 'DUAL').upper() in ('DUAL', 'BASELINE'):
+        return ['ODS', 'PRD']
+    return get_live_environments(settings)
+
+def record_latency(overall_metrics: Dict[str, Any], req_data: Dict[str, Any], environment_name: str, response_time: int):
+    sketches = overall_metrics['latency_sketches']
+    scope_keys = zip(LATENCY_SCOPES, ('All Requests', req_data.get('folder', 'Collection'), req_data.get('request_name', req_data['name'])))
+    for scope, key in scope_keys:
+        env_sketches = sketches.setdefault((scope, key), {})
+        if environment_name not in env_sketches:
+            env_sketches[environment_name] = LatencySketch()
+        env_sketches[environment_name].record(response_time)
+
+def record_phase_timings(overall_metrics: Dict[str, Any], environment_name: str, res: Dict[str, Any]):
+    if res.get('phase_timings'):
+        env_sketches = overall_metrics['phase_sketches'].setdefault(environment_name, {})
+        for key, _ in REQUEST_PHASES:
+            if key not in env_sketches:
+                env_sketches[key] = LatencySketch()
+            env_sketches[key].record(res['phase_timings'].get(key, 0))
+
+    if isinstance(res.get('response_bytes'), int):
+        totals = overall_metrics['response_bytes'].setdefault(environment_name, [0, 0])
+        totals[0] += res['response_bytes']
+        totals[1] += 1
+
+def build_phase_summary(overall_metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rows = []
+    for key, label in REQUEST_PHASES:
+        row = {'phase': label, 'key': key}
+        for env in ('ODS', 'PRD'):
+            sketch = overall_metrics['phase_sketches'].get(env, {}).get(key)
+            row[env.lower()] = {'avg': round(sketch.total / sketch.count, 1), 'p90': sketch.percentile(90)} if sketch and sketch.count else None
+        rows.append(row)
+
+    size_row = {'phase': 'Response Size (bytes)', 'key': 'response_bytes'}
+    for env in ('ODS', 'PRD'):
+        total_bytes, count = overall_metrics['response_bytes'].get(env, (0, 0))
+        size_row[env.lower()] = {'avg': int(total_bytes / count), 'p90': None} if count else None
+    rows.append(size_row)
+    return rows
+
+def build_latency_summary(overall_metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rows = []
+    for (scope, key), env_sketches in overall_metrics['latency_sketches'].items():
+        row = {'scope': scope, 'name': key}
+        for env in ('ODS', 'PRD'):
+            row[env.lower()] = env_sketches[env].summary() if env in env_sketches else None
+        rows.append(row)
+
+    rows.sort(key=lambda row: (LATENCY_SCOPES.index(row['scope']), row['name']))
+    return rows
+
+def build_latency_histogram(overall_metrics: Dict[str, Any]) -> Dict[str, Any]:
+    env_sketches = overall_metrics['latency_sketches'].get(('Environment', 'All Requests'), {})
+    max_value = max((sketch.max_value or 0 for sketch in env_sketches.values()), default=0)
+
+    bin_edges = [0, 10]
+    while bin_edges[-1] <= max_value:
+        bin_edges.append(bin_edges[-1] * 2)
+    bin_edges.pop()
+
+    labels = [f"{low}-{high} ms" for low, high in zip(bin_edges, bin_edges[1:])] + [f"{bin_edges[-1]}+ ms"]
+    return {
+        'labels': labels,
+        'ods_counts': env_sketches['ODS'].histogram(bin_edges) if 'ODS' in env_sketches else [],
+        'prd_counts': env_sketches['PRD'].histogram(bin_edges) if 'PRD' in env_sketches else []
+    }
 
-    def load_schema(schema_file):
-        if schema_file in schema_cache:
-            return schema_cache[schema_file]
+class SchemaValidator:
+    def __init__(self, schema_path: Path, engine: str):
+        self.schema_path = schema_path
+        self.engine = engine
+
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+
+        if engine == 'FASTJSONSCHEMA':
+            import fastjsonschema
+            self.compiled = fastjsonschema.compile(schema)
+        else:
+            from jsonschema.validators import validator_for
+            validator_cls = validator_for(schema)
+            validator_cls.check_schema(schema)
+            self.compiled = validator_cls(schema)
+
+    def validate(self, instance: Any):
+        if self.engine == 'FASTJSONSCHEMA':
+            import fastjsonschema
+            try:
+                self.compiled(instance)
+                return None
+            except fastjsonschema.JsonSchemaValueException as e:
+                return e.message, deque(e.path[1:])
+
+        from jsonschema.exceptions import best_match
+        error = best_match(self.compiled.iter_errors(instance))
+        return None if error is None else (error.message, error.path)
+
+def get_schema_validator(schema_path: Path, engine: str) -> SchemaValidator:
+    cache_key = (str(schema_path), engine)
+    with SCHEMA_VALIDATORS_LOCK:
+        if cache_key not in SCHEMA_VALIDATORS:
+            try:
+                SCHEMA_VALIDATORS[cache_key] = SchemaValidator(schema_path, engine)
+            except Exception as e:
+                logger.error(f"Failed to load schema file '{schema_path.name}': {e}")
+                SCHEMA_VALIDATORS[cache_key] = None
+        return SCHEMA_VALIDATORS[cache_key]
+
+def get_schema_engine(settings: Dict[str, Any]) -> str:
+    engine = str(settings.get('SCHEMA_VALIDATOR', 'JSONSCHEMA')).upper()
+    if engine == 'FASTJSONSCHEMA' and importlib.util.find_spec('fastjsonschema') is None:
+        logger.warning("SCHEMA_VALIDATOR is FASTJSONSCHEMA but fastjsonschema is not installed. Falling back to jsonschema. Install with 'pip install fastjsonschema'.")
+        return 'JSONSCHEMA'
+    return 'FASTJSONSCHEMA' if engine == 'FASTJSONSCHEMA' else 'JSONSCHEMA'
+
+def make_schema_loader(schema_dir: str, settings: Dict[str, Any]):
+    schema_path_base = Path.cwd() / schema_dir
+    engine = get_schema_engine(settings)
+
+    def load_validator(schema_file):
+        return get_schema_validator(schema_path_base / schema_file, engine)
+
+    return load_validator
+
+def validate_schema_instance(schema_path: str, engine: str, instance: Any):
+    validator = get_schema_validator(Path(schema_path), engine)
+    return validator.validate(instance) if validator else None
+
+def get_schema_pool_workers(settings: Dict[str, Any]) -> int:
+    return max(0, min(get_int_setting(settings, 'SCHEMA_VALIDATION_WORKERS', 2), (os.cpu_count() or 1) - 1))
+
+def get_schema_validation_pool(settings: Dict[str, Any]) -> ProcessPoolExecutor:
+    global SCHEMA_VALIDATION_POOL
+    with SCHEMA_VALIDATION_POOL_LOCK:
+        if SCHEMA_VALIDATION_POOL is None:
+            SCHEMA_VALIDATION_POOL = ProcessPoolExecutor(max_workers=get_schema_pool_workers(settings),
+                                                         mp_context=multiprocessing.get_context('spawn'))
+        return SCHEMA_VALIDATION_POOL
+
+def close_schema_validation_pool():
+    global SCHEMA_VALIDATION_POOL
+    with SCHEMA_VALIDATION_POOL_LOCK:
+        if SCHEMA_VALIDATION_POOL is not None:
+            SCHEMA_VALIDATION_POOL.shutdown(wait=True, cancel_futures=True)
+            SCHEMA_VALIDATION_POOL = None
+
+def submit_schema_validation(validator: SchemaValidator, res: Dict[str, Any], settings: Dict[str, Any]) -> Future:
+    if (get_schema_pool_workers(settings) > 0
+            and (res.get('response_bytes') or 0) >= get_int_setting(settings, 'SCHEMA_POOL_MIN_BYTES', 262144)):
         try:
-            with open(schema_path_base / schema_file, 'r', encoding='utf-8') as f:
-                schema = json.load(f)
-                schema_cache[schema_file] = schema
-                return schema
+            return get_schema_validation_pool(settings).submit(validate_schema_instance, str(validator.schema_path), validator.engine, res['json_body'])
         except Exception as e:
-            logger.error(f"Failed to load schema file '{schema_file}': {e}")
-            return None
+            logger.warning(f"Could not hand schema validation to the worker pool: {e}. Validating in-process.")
+
+    future = Future()
+    future.set_result(validator.validate(res['json_body']))
+    return future
 
+def collect_schema_validation(future: Future, validator: SchemaValidator, instance: Any):
     try:
-        for i, req_data in enumerate(extracted_requests):
-            ods_res = ods_results[i]
-            prd_res = prd_results[i]
-
-            test_name = req_data['name']
-            current_test_type = req_data.get('test_type', 'FUNCTIONAL').upper()
-            expected_status = req_data.get('expected_status_code')
-            schema_file = req_data.get('expected_schema_file')
-
-            print(f"[{i+1}/{len(extracted_requests)}] Comparing data for: {test_name[:70]}...                         ", end='\r')
-
-            if ods_res['status_code'] == 'TIMEOUT/ERROR' or prd_res['status_code'] == 'TIMEOUT/ERROR':
-                overall_metrics['connection_fail_count'] += 1
-
-            ods_status = "FAIL"
-            if isinstance(ods_res['status_code'], int):
-                if expected_status is not None:
-                    if ods_res['status_code'] == expected_status: ods_status = "PASS"
-                    else: ods_status = f"FAIL (Expected {expected_status}, Got {ods_res['status_code']})"
-                elif 200 <= ods_res['status_code'] < 300:
-                    ods_status = "PASS"
-
-            prd_status = "FAIL"
-            if isinstance(prd_res['status_code'], int):
-                if expected_status is not None:
-                    if prd_res['status_code'] == expected_status: prd_status = "PASS"
-                    else: prd_status = f"FAIL (Expected {expected_status}, Got {prd_res['status_code']})"
-                elif 200 <= prd_res['status_code'] < 300:
-                    prd_status = "PASS"
-
-            if "PASS" in ods_status: overall_metrics['ods_passed'] += 1
-            if "PASS" in prd_status: overall_metrics['prd_passed'] += 1
-            
-            ods_rec_count = get_record_count(ods_res['json_body'])
-            prd_rec_count = get_record_count(prd_res['json_body'])
+        return future.result()
+    except Exception as e:
+        logger.warning(f"Schema validation worker failed ({e.__class__.__name__}: {e}). Validating in-process.")
+        return validator.validate(instance)
+
+def compare_result_pair(req_data, ods_res, prd_res, overall_metrics, load_validator, settings, position, total):
+    test_name = req_data['name']
+    current_test_type = req_data.get('test_type', 'FUNCTIONAL').upper()
+    expected_status = req_data.get('expected_status_code')
+    schema_file = req_data.get('expected_schema_file')
+
+    with CONSOLE_LOCK:
+        print(f"[{position}/{total or '?'}] Comparing data for: {test_name[:70]}...                         ", end='\r')
+
+    if ods_res['status_code'] == 'TIMEOUT/ERROR' or prd_res['status_code'] == 'TIMEOUT/ERROR':
+        overall_metrics['connection_fail_count'] += 1
+
+    ods_status = "FAIL (TIMEOUT/ERROR)" if ods_res['status_code'] == 'TIMEOUT/ERROR' else "FAIL"
+    if isinstance(ods_res['status_code'], int):
+        if expected_status is not None:
+            if ods_res['status_code'] == expected_status: ods_status = "PASS"
+            else: ods_status = f"FAIL (Expected {expected_status}, Got {ods_res['status_code']})"
+        elif 200 <= ods_res['status_code'] < 300:
+            ods_status = "PASS"
+
+    prd_status = "FAIL (TIMEOUT/ERROR)" if prd_res['status_code'] == 'TIMEOUT/ERROR' else "FAIL"
+    if isinstance(prd_res['status_code'], int):
+        if expected_status is not None:
+            if prd_res['status_code'] == expected_status: prd_status = "PASS"
+            else: prd_status = f"FAIL (Expected {expected_status}, Got {prd_res['status_code']})"
+        elif 200 <= prd_res['status_code'] < 300:
+            prd_status = "PASS"
+
+    if "PASS" in ods_status: overall_metrics['ods_passed'] += 1
+    if "PASS" in prd_status: overall_metrics['prd_passed'] += 1
+
+    ods_rec_count = get_record_count(ods_res['json_body'])
+    prd_rec_count = get_record_count(prd_res['json_body'])
+
+    diff_obj = {}
+    data_diff_result = 'N/A'
+    data_diff_summary = ''
+    ods_raw_response_ref = None
+    prd_raw_response_ref = None
+
+    critical_paths = []
+    dynamic_value_paths = []
+    excluded_paths = []
+
+    schema_validation_fail = False
+    schema_fail_details = ""
+
+    schema_validations = []
+    validator = load_validator(schema_file) if schema_file and JSONSCHEMA_AVAILABLE else None
+    if validator:
+        pending_validations = {}
+        for env, res in [('ODS', ods_res), ('PRD', prd_res)]:
+            if res['json_body'] is not None and "PASS" in (ods_status if env == 'ODS' else prd_status):
+                if id(res) not in pending_validations:
+                    pending_validations[id(res)] = submit_schema_validation(validator, res, settings)
+                schema_validations.append((env, res, pending_validations[id(res)]))
+
+    if ods_res['json_body'] is not None and prd_res['json_body'] is not None:
+
+        if ods_res['json_body'] is prd_res['json_body'] or canonical_json_hash(ods_res['json_body']) == canonical_json_hash(prd_res['json_body']):
+            diff_obj = {}
+        elif str(settings.get('DIFF_ENGINE', 'KEYED')).upper() == 'DEEPDIFF':
+            from deepdiff import DeepDiff
+            diff_obj = DeepDiff(
+                ods_res['json_body'],
+                prd_res['json_body'],
+                ignore_order=True
+            )
+        else:
+            identity_keys = req_data.get('list_identity_keys') or settings.get('LIST_IDENTITY_KEYS_LIST', [])
+            diff_obj = keyed_json_diff(ods_res['json_body'], prd_res['json_body'], identity_keys)
 
-            data_diff_result = 'N/A'
-            data_diff_summary = ''
-            ods_raw_response_highlighted = ods_res['raw_text']
-            prd_raw_response_highlighted = prd_res['raw_text']
-
-            critical_paths = []
-            dynamic_value_paths = []
-            excluded_paths = []
-
-            schema_validation_fail = False
-            schema_fail_details = ""
-
-            if schema_file and JSONSCHEMA_AVAILABLE:
-                schema = load_schema(schema_file)
-                if schema:
-                    for env, res in [('ODS', ods_res), ('PRD', prd_res)]:
-                        if res['json_body'] is not None and "PASS" in (ods_status if env == 'ODS' else prd_status):
-                            try:
-                                validate(instance=res['json_body'], schema=schema)
-                            except ValidationError as e:
-                                schema_validation_fail = True
-                                schema_fail_details += f"{env} Schema Fail: {e.message} at path {e.path} | "
-                                logger.error(f"{test_name} failed schema validation on {env}: {e.message}")
-
-                    if schema_validation_fail:
-                         overall_metrics['schema_fail_count'] += 1
-                         overall_metrics['schema_findings_list'].append(schema_file)
-
-            if ods_res['json_body'] is not None and prd_res['json_body'] is not None:
-
-                diff_obj = DeepDiff(
-                    ods_res['json_body'],
-                    prd_res['json_body'],
-                    ignore_order=True
-                )
-
-                if not diff_obj:
-                    if ods_rec_count != prd_rec_count:
-                         data_diff_result = 'FAIL'
-                         overall_metrics['data_diff_count'] += 1
-                    else:
-                        data_diff_result = 'PASS'
-                        data_diff_summary = 'Response bodies are identical.'
+        if not diff_obj:
+            if ods_rec_count != prd_rec_count:
+                 data_diff_result = 'FAIL'
+                 overall_metrics['data_diff_count'] += 1
+            else:
+                data_diff_result = 'PASS'
+                data_diff_summary = 'Response bodies are identical.'
+        else:
+            path_classifier = get_path_classifier(settings)
+            for diff_type in diff_obj.keys():
+                diff_data = diff_obj[diff_type]
+                if hasattr(diff_data, 'items'):
+                     iterable = diff_data.items()
                 else:
-                    for diff_type in diff_obj.keys():
-                        diff_data = diff_obj[diff_type]
-                        if hasattr(diff_data, 'items'):
-                             iterable = diff_data.items()
-                        else:
-                             iterable = [(k, {}) for k in diff_data]
-
-                        for path, details in iterable:
-                            is_excluded = False
-                            for term in settings['EXCLUDE_FIELD_NAMES_LIST']:
-                                if term in str(path):
-                                    is_excluded = True
-                                    break
-                            if is_excluded:
-                                excluded_paths.append(path)
-                                continue
-
-                            is_dynamic = False
-                            for term in settings['DYNAMIC_FIELD_TERMS']:
-                                if term.upper() in str(path).upper():
-                                    is_dynamic = True
-                                    break
-                            if is_dynamic:
-                                dynamic_value_paths.append(path)
-                                continue
-
-                            critical_paths.append(path)
-
-                    if ods_rec_count != prd_rec_count:
-                        data_diff_result = 'FAIL'
-                        if not critical_paths:
-                            overall_metrics['data_diff_count'] += 1
-                        else:
-                            overall_metrics['data_diff_count'] += len(critical_paths)
-                    elif critical_paths:
-                        data_diff_result = 'FAIL'
-                        overall_metrics['data_diff_count'] += len(critical_paths)
-                    elif dynamic_value_paths or excluded_paths:
-                        data_diff_result = 'WARN_DIFF'
-                        overall_metrics['dynamic_diff_count'] += len(dynamic_value_paths) + len(excluded_paths)
+                     iterable = [(k, {}) for k in diff_data]
+
+                for path, details in iterable:
+                    category = path_classifier.classify(path)
+                    if category == PathClassifier.EXCLUDED:
+                        excluded_paths.append(path)
+                    elif category == PathClassifier.DYNAMIC:
+                        dynamic_value_paths.append(path)
                     else:
-                        data_diff_result = 'PASS'
-                        data_diff_summary = 'Response bodies are identical.'
+                        critical_paths.append(path)
 
-                    if diff_obj:
-                        ods_raw_response_highlighted, prd_raw_response_highlighted = highlight_diffs_in_json(ods_res['json_body'], prd_res['json_body'], diff_obj)
+            if ods_rec_count != prd_rec_count:
+                data_diff_result = 'FAIL'
+                if not critical_paths:
+                    overall_metrics['data_diff_count'] += 1
+                else:
+                    overall_metrics['data_diff_count'] += len(critical_paths)
+            elif critical_paths:
+                data_diff_result = 'FAIL'
+                overall_metrics['data_diff_count'] += len(critical_paths)
+            elif dynamic_value_paths or excluded_paths:
+                data_diff_result = 'WARN_DIFF'
+                overall_metrics['dynamic_diff_count'] += len(dynamic_value_paths) + len(excluded_paths)
+            else:
+                data_diff_result = 'PASS'
+                data_diff_summary = 'Response bodies are identical.'
 
+            if diff_obj:
+                ods_raw_response_highlighted, prd_raw_response_highlighted = highlight_diffs_in_json(ods_res['json_body'], prd_res['json_body'], diff_obj, path_classifier)
+                response_store = get_response_store(settings)
+                ods_raw_response_ref = response_store.put(ods_raw_response_highlighted)
+                prd_raw_response_ref = response_store.put(prd_raw_response_highlighted)
+
+    else:
+        if "PASS" in ods_status and "PASS" in prd_status:
+            data_diff_result = 'PASS (No JSON)'
+            data_diff_summary = 'Comparison Skipped (No JSON detected or Parse Error).'
+        else:
+            data_diff_result = 'N/A'
+            data_diff_summary = f'N/A: Status FAIL/Error ({ods_res["status_code"]} vs {prd_res["status_code"]}).'
+
+    for env, res, future in schema_validations:
+        schema_error = collect_schema_validation(future, validator, res['json_body'])
+        if schema_error:
+            schema_validation_fail = True
+            schema_fail_details += f"{env} Schema Fail: {schema_error[0]} at path {schema_error[1]} | "
+            logger.error(f"{test_name} failed schema validation on {env}: {schema_error[0]}")
+
+    if schema_validation_fail:
+         overall_metrics['schema_fail_count'] += 1
+         overall_metrics['schema_findings_list'].append(schema_file)
+
+    comments = ""
+    test_findings = []
+
+    if schema_validation_fail:
+        comments += f"SCHEMA VALIDATION FAILED: {schema_fail_details}. "
+        data_diff_result = 'FAIL'
+        test_findings.append({'category': 'Schema', 'type': 'Structural/Type Mismatch', 'details': schema_fail_details.strip()})
+
+    if data_diff_result == 'FAIL':
+         if ods_rec_count != prd_rec_count:
+             comments += f"COUNT MISMATCH: ODS has {ods_rec_count} items, PRD has {prd_rec_count}. "
+             test_findings.append({'category': 'Data Integrity', 'type': 'Record Count Mismatch', 'details': f"ODS: {ods_rec_count}, PRD: {prd_rec_count}"})
+
+         if critical_paths:
+             formatted_critical_paths = [format_deepdiff_path(str(p)) for p in critical_paths]
+             comments += f"CRITICAL DATA MISMATCH: Failed Keys: {', '.join(formatted_critical_paths)}. "
+             test_findings.append({'category': 'Data Integrity', 'type': 'Critical Data Mismatch', 'details': f"Keys: {', '.join(formatted_critical_paths)}"})
+
+    elif data_diff_result == 'WARN_DIFF':
+        warn_details = []
+        if dynamic_value_paths:
+            warn_details.append(f"Dynamic values ({len(dynamic_value_paths)})")
+        if excluded_paths:
+            warn_details.append(f"Excluded fields ({len(excluded_paths)})")
+
+        comments = f"Functional PASS (with Warnings): {', '.join(warn_details)}."
+        test_findings.append({'category': 'Data Integrity', 'type': 'Soft Data Mismatch', 'details': f"Dynamic: {len(dynamic_value_paths)}, Excluded: {len(excluded_paths)}"})
+
+    data_diff_summary_list = []
+
+    if ods_rec_count != prd_rec_count:
+         data_diff_summary_list.append(f"Count Mismatch (ODS:{ods_rec_count} vs PRD:{prd_rec_count})")
+
+    if data_diff_result == 'FAIL' and critical_paths: data_diff_summary_list.append("Critical Data Mismatch")
+    if dynamic_value_paths: data_diff_summary_list.append("Dynamic Value Change")
+    if excluded_paths: data_diff_summary_list.append("Excluded Field Mismatch")
+
+    if data_diff_summary_list:
+        data_diff_summary = f"Diffs found: {', '.join(data_diff_summary_list)}"
+
+        details = []
+        critical_path_set = set(critical_paths)
+        dynamic_path_set = set(dynamic_value_paths)
+        excluded_path_set = set(excluded_paths)
+        for diff_type in diff_obj.keys():
+            diff_data = diff_obj[diff_type]
+            if hasattr(diff_data, 'items'):
+                 iterable = diff_data.items()
             else:
-                if "PASS" in ods_status and "PASS" in prd_status:
-                    data_diff_result = 'PASS (No JSON)'
-                    data_diff_summary = 'Comparison Skipped (No JSON detected or Parse Error).'
-                else:
-                    data_diff_result = 'N/A'
-                    data_diff_summary = f'N/A: Status FAIL/Error ({ods_res["status_code"]} vs {prd_res["status_code"]}).'
+                 iterable = [(k, {}) for k in diff_data]
+
+            for path, diff_values in iterable:
+                if len(details) >= 10: break
+
+                if path in critical_path_set or (data_diff_result == 'WARN_DIFF' and (path in dynamic_path_set or path in excluded_path_set)):
+                    old_val = diff_values.get('old_value')
+                    new_val = diff_values.get('new_value')
+                    old_type = diff_values.get('old_type')
+                    new_type = diff_values.get('new_type')
+                    lbl = " (Excluded)" if path in excluded_path_set else (" (Dynamic)" if path in dynamic_path_set else "")
+
+                    if diff_type == 'type_changes':
+                        old_val_str = f"{old_val} ({old_type.__name__})" if old_type else str(old_val)
+                        new_val_str = f"{new_val} ({new_type.__name__})" if new_type else str(new_val)
+                        details.append(f"{format_deepdiff_path(str(path))}{lbl}: ODS='{old_val_str}' PRD='{new_val_str}'")
+                    elif isinstance(old_val, dict) and isinstance(new_val, dict):
+                        from deepdiff import DeepDiff
+                        inner_diff = DeepDiff(old_val, new_val, ignore_order=True)
+                        inner_changes = []
+                        for cat in inner_diff.keys():
+                            inner_data = inner_diff[cat]
+                            if hasattr(inner_data, 'items'):
+                                 inner_iterable = inner_data.keys()
+                            else:
+                                 inner_iterable = inner_data
 
-            comments = ""
-            test_findings = []
+                            for item in inner_iterable:
+                                k = re.findall(r"\['(.*?)'\]", str(item)) or re.findall(r"\[(.*?)\]", str(item))
+                                if k: inner_changes.append(k[-1])
 
-            if schema_validation_fail:
-                comments += f"SCHEMA VALIDATION FAILED: {schema_fail_details}. "
-                data_diff_result = 'FAIL'
-                test_findings.append({'category': 'Schema', 'type': 'Structural/Type Mismatch', 'details': schema_fail_details.strip()})
-
-            if data_diff_result == 'FAIL':
-                 if ods_rec_count != prd_rec_count:
-                     comments += f"COUNT MISMATCH: ODS has {ods_rec_count} items, PRD has {prd_rec_count}. "
-                     test_findings.append({'category': 'Data Integrity', 'type': 'Record Count Mismatch', 'details': f"ODS: {ods_rec_count}, PRD: {prd_rec_count}"})
-                 
-                 if critical_paths:
-                     formatted_critical_paths = [format_deepdiff_path(str(p)) for p in critical_paths]
-                     comments += f"CRITICAL DATA MISMATCH: Failed Keys: {', '.join(formatted_critical_paths)}. "
-                     test_findings.append({'category': 'Data Integrity', 'type': 'Critical Data Mismatch', 'details': f"Keys: {', '.join(formatted_critical_paths)}"})
-
-            elif data_diff_result == 'WARN_DIFF':
-                warn_details = []
-                if dynamic_value_paths:
-                    warn_details.append(f"Dynamic values ({len(dynamic_value_paths)})")
-                if excluded_paths:
-                    warn_details.append(f"Excluded fields ({len(excluded_paths)})")
-
-                comments = f"Functional PASS (with Warnings): {', '.join(warn_details)}."
-                test_findings.append({'category': 'Data Integrity', 'type': 'Soft Data Mismatch', 'details': f"Dynamic: {len(dynamic_value_paths)}, Excluded: {len(excluded_paths)}"})
-
-            data_diff_summary_list = []
-            
-            if ods_rec_count != prd_rec_count:
-                 data_diff_summary_list.append(f"Count Mismatch (ODS:{ods_rec_count} vs PRD:{prd_rec_count})")
-            
-            if data_diff_result == 'FAIL' and critical_paths: data_diff_summary_list.append("Critical Data Mismatch")
-            if dynamic_value_paths: data_diff_summary_list.append("Dynamic Value Change")
-            if excluded_paths: data_diff_summary_list.append("Excluded Field Mismatch")
-
-            if data_diff_summary_list:
-                data_diff_summary = f"Diffs found: {', '.join(data_diff_summary_list)}"
-
-                details = []
-                for diff_type in diff_obj.keys():
-                    diff_data = diff_obj[diff_type]
-                    if hasattr(diff_data, 'items'):
-                         iterable = diff_data.items()
+                        if inner_changes:
+                            inner_str = ", ".join(list(set(inner_changes)))
+                            details.append(f"{format_deepdiff_path(str(path))}{lbl}: Mismatch in fields: {inner_str}")
+                        else:
+                             details.append(f"{format_deepdiff_path(str(path))}{lbl}: Complex Object Mismatch")
                     else:
-                         iterable = [(k, {}) for k in diff_data]
-
-                    for path, diff_values in iterable:
-                        if len(details) >= 10: break
-
-                        if path in critical_paths or (data_diff_result == 'WARN_DIFF' and (path in dynamic_value_paths or path in excluded_paths)):
-                            old_val = diff_values.get('old_value')
-                            new_val = diff_values.get('new_value')
-                            old_type = diff_values.get('old_type')
-                            new_type = diff_values.get('new_type')
-                            lbl = " (Excluded)" if path in excluded_paths else (" (Dynamic)" if path in dynamic_value_paths else "")
-
-                            if diff_type == 'type_changes':
-                                old_val_str = f"{old_val} ({old_type.__name__})" if old_type else str(old_val)
-                                new_val_str = f"{new_val} ({new_type.__name__})" if new_type else str(new_val)
-                                details.append(f"{format_deepdiff_path(str(path))}{lbl}: ODS='{old_val_str}' PRD='{new_val_str}'")
-                            elif isinstance(old_val, dict) and isinstance(new_val, dict):
-                                inner_diff = DeepDiff(old_val, new_val, ignore_order=True)
-                                inner_changes = []
-                                for cat in inner_diff.keys():
-                                    inner_data = inner_diff[cat]
-                                    if hasattr(inner_data, 'items'):
-                                         inner_iterable = inner_data.keys()
-                                    else:
-                                         inner_iterable = inner_data
-
-                                    for item in inner_iterable:
-                                        k = re.findall(r"\['(.*?)'\]", str(item)) or re.findall(r"\[(.*?)\]", str(item))
-                                        if k: inner_changes.append(k[-1])
-                                
-                                if inner_changes:
-                                    inner_str = ", ".join(list(set(inner_changes)))
-                                    details.append(f"{format_deepdiff_path(str(path))}{lbl}: Mismatch in fields: {inner_str}")
-                                else:
-                                     details.append(f"{format_deepdiff_path(str(path))}{lbl}: Complex Object Mismatch")
-                            else:
-                                s_old = str(old_val)
-                                s_new = str(new_val)
-                                if len(s_old) > 100: s_old = s_old[:100] + "..."
-                                if len(s_new) > 100: s_new = s_new[:100] + "..."
-                                details.append(f"{format_deepdiff_path(str(path))}{lbl}: ODS='{s_old}' PRD='{s_new}'")
-
-                if details:
-                     data_diff_summary += " | Details: " + " | ".join(details)
-
-            if schema_validation_fail:
-                 data_diff_summary += " | Schema Fail: YES"
-
-            if current_test_type == 'SECURITY':
-                is_critical_security_fail = False
-                if "PASS" in ods_status:
-                    test_findings.append({'category': 'Security', 'type': 'Auth/Authz Bypass', 'details': f"ODS: Expected 4xx, got {ods_res['status_code']} (Success)."})
-                    is_critical_security_fail = True
-                if "PASS" in prd_status:
-                    test_findings.append({'category': 'Security', 'type': 'Auth/Authz Bypass', 'details': f"PRD: Expected 4xx, got {prd_res['status_code']} (Success)."})
-                    is_critical_security_fail = True
-                if ods_res['status_code'] == 500:
-                    test_findings.append({'category': 'Security', 'type': 'Payload Processing Error (500)', 'details': f"ODS: Payload caused 500 Internal Error (Potential Leak/Injection)."})
-                    is_critical_security_fail = True
-                if prd_res['status_code'] == 500:
-                    test_findings.append({'category': 'Security', 'type': 'Payload Processing Error (500)', 'details': f"PRD: Payload caused 500 Internal Error (Potential Leak/Injection)."})
-                    is_critical_security_fail = True
-
-                if is_critical_security_fail:
-                    comments = f"CRITICAL SECURITY VULNERABILITY: {', '.join(set(f['type'] for f in test_findings if f['category'] == 'Security'))}. ACTION: Fix security logic immediately."
-                    if not overall_metrics['security_vuln_count']:
-                        overall_metrics['security_vuln_count'] = len(set(f['type'] for f in test_findings if f['category'] == 'Security'))
-                    if "PASS" in ods_status or "PASS" in prd_status or ods_res['status_code'] == 500 or prd_res['status_code'] == 500:
-                        overall_metrics['status_fail_count'] += 1
-
-            elif current_test_type == 'STABILITY':
-                is_stability_fail = False
-                if ods_res['status_code'] == 500:
-                    test_findings.append({'category': 'Stability', 'type': 'Unhandled 500 Error', 'details': 'ODS: Invalid input caused 500. Should return 400/422.'})
-                    is_stability_fail = True
-                if prd_res['status_code'] == 500:
-                    test_findings.append({'category': 'Stability', 'type': 'Unhandled 500 Error', 'details': 'PRD: Invalid input caused 500. Should return 400/422.'})
-                    is_stability_fail = True
-
-                if is_stability_fail:
-                    comments = f"STABILITY BUG: {', '.join(set(f['type'] for f in test_findings if f['category'] == 'Stability'))}. ACTION: Implement input validation to return 400/422."
-                    if not overall_metrics['stability_fail_count']:
-                        overall_metrics['stability_fail_count'] = len(set(f['type'] for f in test_findings if f['category'] == 'Stability'))
-                    overall_metrics['status_fail_count'] += 1
-
-            server_error_found = False
-            if ods_res['status_code'] == 500:
-                comments = f"STABILITY FAILURE (ODS): API returned 500 Internal Server Error. {comments}"
-                test_findings.append({'category': 'Stability', 'type': '500 Internal Server Error', 'details': 'ODS returned 500'})
-                overall_metrics['status_fail_count'] += 1
-                server_error_found = True
-            
-            if prd_res['status_code'] == 500:
-                comments = f"STABILITY FAILURE (PRD): API returned 500 Internal Server Error. {comments}"
-                test_findings.append({'category': 'Stability', 'type': '500 Internal Server Error', 'details': 'PRD returned 500'})
+                        s_old = str(old_val)
+                        s_new = str(new_val)
+                        if len(s_old) > 100: s_old = s_old[:100] + "..."
+                        if len(s_new) > 100: s_new = s_new[:100] + "..."
+                        details.append(f"{format_deepdiff_path(str(path))}{lbl}: ODS='{s_old}' PRD='{s_new}'")
+
+        if details:
+             data_diff_summary += " | Details: " + " | ".join(details)
+
+    if schema_validation_fail:
+         data_diff_summary += " | Schema Fail: YES"
+
+    if current_test_type == 'SECURITY':
+        is_critical_security_fail = False
+        if "PASS" in ods_status:
+            test_findings.append({'category': 'Security', 'type': 'Auth/Authz Bypass', 'details': f"ODS: Expected 4xx, got {ods_res['status_code']} (Success)."})
+            is_critical_security_fail = True
+        if "PASS" in prd_status:
+            test_findings.append({'category': 'Security', 'type': 'Auth/Authz Bypass', 'details': f"PRD: Expected 4xx, got {prd_res['status_code']} (Success)."})
+            is_critical_security_fail = True
+        if ods_res['status_code'] == 500:
+            test_findings.append({'category': 'Security', 'type': 'Payload Processing Error (500)', 'details': f"ODS: Payload caused 500 Internal Error (Potential Leak/Injection)."})
+            is_critical_security_fail = True
+        if prd_res['status_code'] == 500:
+            test_findings.append({'category': 'Security', 'type': 'Payload Processing Error (500)', 'details': f"PRD: Payload caused 500 Internal Error (Potential Leak/Injection)."})
+            is_critical_security_fail = True
+
+        if is_critical_security_fail:
+            comments = f"CRITICAL SECURITY VULNERABILITY: {', '.join(set(f['type'] for f in test_findings if f['category'] == 'Security'))}. ACTION: Fix security logic immediately."
+            if not overall_metrics['security_vuln_count']:
+                overall_metrics['security_vuln_count'] = len(set(f['type'] for f in test_findings if f['category'] == 'Security'))
+            if "PASS" in ods_status or "PASS" in prd_status or ods_res['status_code'] == 500 or prd_res['status_code'] == 500:
                 overall_metrics['status_fail_count'] += 1
-                server_error_found = True
-
-            if not server_error_found and not comments:
-                if data_diff_result == 'PASS' and "PASS" in ods_status and "PASS" in prd_status:
-                    comments = "Functional PASS. Status OK. Data bodies match perfectly."
-                elif data_diff_result == 'PASS (No JSON)':
-                    comments = "Functional PASS. Status OK. Data Comparison Skipped (Non-JSON)."
-                elif 'N/A' in data_diff_summary:
-                    comments = f"Functional PASS. Status OK. Data comparison skipped ({data_diff_summary.split(':')[-1].strip()})."
-                elif expected_status is not None:
-                     comments = f"Test PASS: API correctly returned expected status {expected_status}."
-                elif current_test_type in ['SECURITY', 'STABILITY', 'NEGATIVE'] and ods_res['status_code'] in range(400, 500) and prd_res['status_code'] in range(400, 500):
-                    comments = "Test PASS: API correctly returned expected 4xx client error status."
-
-            for finding in test_findings:
-                if finding['category'] == 'Security' and finding['type'] not in overall_metrics['security_findings_list']:
-                    overall_metrics['security_findings_list'].append(finding['type'])
-                if finding['category'] == 'Stability' and finding['type'] not in overall_metrics['stability_findings_list']:
-                    overall_metrics['stability_findings_list'].append(finding['type'])
-                if finding['category'] == 'Schema' and finding['type'] not in overall_metrics['schema_findings_list']:
-                    overall_metrics['schema_findings_list'].append(finding['type'])
-
-            ods_time = ods_res['response_time']
-            prd_time = prd_res['response_time']
-            overall_metrics['time_data'].append({'name': test_name, 'ods_time': ods_time, 'prd_time': prd_time})
-
-            diff_css_class = ""
-            display_diff_result = data_diff_result
-            if data_diff_result == 'FAIL': 
-                diff_css_class = "danger"
-            elif data_diff_result == 'WARN_DIFF': 
-                diff_css_class = "soft-fail"
-                display_diff_result = "SOFT FAIL"
-            elif 'PASS' in data_diff_result: 
-                diff_css_class = "success"
-
-            comparison_data.append({
-                'test_name': test_name,
-                'ods_status': ods_status,
-                'prd_status': prd_status,
-                'ods_time': f"{ods_time} ms",
-                'prd_time': f"{prd_time} ms",
-                'ods_record_count': ods_rec_count,
-                'prd_record_count': prd_rec_count, 
-                'test_type': current_test_type,
-                'data_diff_result': display_diff_result,
-                'diff_css_class': diff_css_class,
-                'data_diff_summary': data_diff_summary,
-                'comments': comments.strip(),
-                'request_body': escape_html(req_data['body']),
-                'ods_raw_response': ods_raw_response_highlighted,
-                'prd_raw_response': prd_raw_response_highlighted,
-                'findings': test_findings,
-            })
+
+    elif current_test_type == 'STABILITY':
+        is_stability_fail = False
+        if ods_res['status_code'] == 500:
+            test_findings.append({'category': 'Stability', 'type': 'Unhandled 500 Error', 'details': 'ODS: Invalid input caused 500. Should return 400/422.'})
+            is_stability_fail = True
+        if prd_res['status_code'] == 500:
+            test_findings.append({'category': 'Stability', 'type': 'Unhandled 500 Error', 'details': 'PRD: Invalid input caused 500. Should return 400/422.'})
+            is_stability_fail = True
+
+        if is_stability_fail:
+            comments = f"STABILITY BUG: {', '.join(set(f['type'] for f in test_findings if f['category'] == 'Stability'))}. ACTION: Implement input validation to return 400/422."
+            if not overall_metrics['stability_fail_count']:
+                overall_metrics['stability_fail_count'] = len(set(f['type'] for f in test_findings if f['category'] == 'Stability'))
+            overall_metrics['status_fail_count'] += 1
+
+    server_error_found = False
+    if ods_res['status_code'] == 500:
+        comments = f"STABILITY FAILURE (ODS): API returned 500 Internal Server Error. {comments}"
+        test_findings.append({'category': 'Stability', 'type': '500 Internal Server Error', 'details': 'ODS returned 500'})
+        overall_metrics['status_fail_count'] += 1
+        server_error_found = True
+
+    if prd_res['status_code'] == 500:
+        comments = f"STABILITY FAILURE (PRD): API returned 500 Internal Server Error. {comments}"
+        test_findings.append({'category': 'Stability', 'type': '500 Internal Server Error', 'details': 'PRD returned 500'})
+        overall_metrics['status_fail_count'] += 1
+        server_error_found = True
+
+    if not server_error_found and not comments:
+        if data_diff_result == 'PASS' and "PASS" in ods_status and "PASS" in prd_status:
+            comments = "Functional PASS. Status OK. Data bodies match perfectly."
+        elif data_diff_result == 'PASS (No JSON)':
+            comments = "Functional PASS. Status OK. Data Comparison Skipped (Non-JSON)."
+        elif 'N/A' in data_diff_summary:
+            comments = f"Functional PASS. Status OK. Data comparison skipped ({data_diff_summary.split(':')[-1].strip()})."
+        elif expected_status is not None:
+             comments = f"Test PASS: API correctly returned expected status {expected_status}."
+        elif current_test_type in ['SECURITY', 'STABILITY', 'NEGATIVE'] and ods_res['status_code'] in range(400, 500) and prd_res['status_code'] in range(400, 500):
+            comments = "Test PASS: API correctly returned expected 4xx client error status."
+
+    for finding in test_findings:
+        if finding['category'] == 'Security' and finding['type'] not in overall_metrics['security_findings_list']:
+            overall_metrics['security_findings_list'].append(finding['type'])
+        if finding['category'] == 'Stability' and finding['type'] not in overall_metrics['stability_findings_list']:
+            overall_metrics['stability_findings_list'].append(finding['type'])
+        if finding['category'] == 'Schema' and finding['type'] not in overall_metrics['schema_findings_list']:
+            overall_metrics['schema_findings_list'].append(finding['type'])
+
+    ods_time = ods_res['response_time']
+    prd_time = prd_res['response_time']
+
+    latency_envs = get_latency_environments(settings)
+    live_envs = get_live_environments(settings)
+    for env, res in (('ODS', ods_res), ('PRD', prd_res)):
+        if env in latency_envs and isinstance(res['response_time'], int) and res.get('attempts', 1) > 0:
+            record_latency(overall_metrics, req_data, env, res['response_time'])
+            record_phase_timings(overall_metrics, env, res)
+            if env in live_envs and not res.get('restored') and settings.get('CASSETTE_MODE', 'OFF') != 'REPLAY':
+                overall_metrics['latency_samples'].append((env, req_data.get('request_name', test_name), test_name, res['response_time']))
+
+    render_responses = (data_diff_result in ('FAIL', 'WARN_DIFF') or "PASS" not in ods_status or "PASS" not in prd_status
+                        or bool(test_findings) or is_inspected_test(test_name, settings))
+
+    diff_css_class = ""
+    display_diff_result = data_diff_result
+    if data_diff_result == 'FAIL': 
+        diff_css_class = "danger"
+    elif data_diff_result == 'WARN_DIFF': 
+        diff_css_class = "soft-fail"
+        display_diff_result = "SOFT FAIL"
+    elif 'PASS' in data_diff_result: 
+        diff_css_class = "success"
+
+    time_entry = {'name': test_name, 'ods_time': ods_time, 'prd_time': prd_time}
+
+    return time_entry, {
+        'test_name': test_name,
+        'ods_status': ods_status,
+        'prd_status': prd_status,
+        'ods_time': f"{ods_time} ms",
+        'prd_time': f"{prd_time} ms",
+        'ods_timing_detail': format_phase_timings(ods_res.get('phase_timings'), ods_res.get('response_bytes')),
+        'prd_timing_detail': format_phase_timings(prd_res.get('phase_timings'), prd_res.get('response_bytes')),
+        'ods_response_bytes': ods_res.get('response_bytes'),
+        'prd_response_bytes': prd_res.get('response_bytes'),
+        'ods_attempts': ods_res.get('attempts', 1),
+        'prd_attempts': prd_res.get('attempts', 1),
+        'hedge_wins': int(bool(ods_res.get('hedge_won'))) + int(bool(prd_res.get('hedge_won'))),
+        'ods_record_count': ods_rec_count,
+        'prd_record_count': prd_rec_count, 
+        'test_type': current_test_type,
+        'data_diff_result': display_diff_result,
+        'diff_css_class': diff_css_class,
+        'data_diff_summary': data_diff_summary,
+        'comments': comments.strip(),
+        'request_body': escape_html(req_data['body']),
+        'ods_raw_response_ref': ods_raw_response_ref,
+        'prd_raw_response_ref': prd_raw_response_ref,
+        'ods_raw_body_ref': ods_res['raw_body_ref'],
+        'prd_raw_body_ref': prd_res['raw_body_ref'],
+        'render_responses': render_responses,
+        'findings': test_findings,
+        'diff_paths': [str(p) for p in critical_paths + dynamic_value_paths + excluded_paths],
+    }
+
+def stream_compare_results(result_pairs, extracted_requests, dynamic_field_terms, schema_dir, settings, manifest_entries=None):
+    total = len(extracted_requests) if isinstance(extracted_requests, list) else None
+    overall_metrics = new_overall_metrics(total)
+    comparison_rows = {}
+    time_entries = {}
+    load_validator = make_schema_loader(schema_dir, settings)
+
+    logger.info("Starting result comparison...")
+
+    try:
+        for position, (i, ods_res, prd_res) in enumerate(result_pairs, start=1):
+            time_entries[i], comparison_rows[i] = compare_result_pair(extracted_requests[i], ods_res, prd_res, overall_metrics, load_validator, settings, position, total)
+
+            if manifest_entries is not None:
+                manifest_entries[i] = build_manifest_entry(extracted_requests[i], ods_res, prd_res, comparison_rows[i])
+
+            for res in (ods_res, prd_res):
+                res['json_body'] = None
+
+            if isinstance(extracted_requests, RunStream):
+                extracted_requests.release(i)
 
         print(' ' * 100, end='\r')
         logger.info(f"Comparison complete. Found {overall_metrics['data_diff_count']} critical data differences and {overall_metrics['dynamic_diff_count']} dynamic data differences.")
-        return comparison_data, overall_metrics
 
     except Exception as e:
         logger.critical(f"\nCRITICAL ERROR during metric comparison: {e}")
-        return comparison_data, overall_metrics 
 
-def generate_all_executable_runs(all_requests_templates: List[Dict[str, Any]], data_file: str) -> List[Dict[str, Any]]:
+    if total is None:
+        overall_metrics['total_tests'] = extracted_requests.count
+    overall_metrics['time_data'] = [time_entries[i] for i in sorted(time_entries) if time_entries[i] is not None]
+    overall_metrics['latency_summary'] = build_latency_summary(overall_metrics)
+    overall_metrics['phase_summary'] = build_phase_summary(overall_metrics)
+    comparison_data = [comparison_rows[i] for i in sorted(comparison_rows) if comparison_rows[i] is not None]
+    return comparison_data, overall_metrics
+
+def compute_request_hash(req_data: Dict[str, Any]) -> str:
+    fingerprint = json.dumps([
+        req_data['method'],
+        req_data['base_url_placeholder'],
+        req_data.get('body'),
+        req_data.get('headers', {}),
+        req_data.get('header_overrides', {}),
+        req_data.get('url_params', {}),
+        req_data.get('expected_status_code'),
+        req_data.get('expected_schema_file'),
+        req_data.get('list_identity_keys')
+    ], sort_keys=True, default=str)
+    return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+
+def build_manifest_entry(req_data, ods_res, prd_res, row) -> Dict[str, Any]:
+    return {
+        'test_name': req_data['name'],
+        'request_hash': compute_request_hash(req_data),
+        'outcome': get_overall_status(row) if row else 'ERROR',
+        'ods': {k: ods_res.get(k) for k in MANIFEST_RESULT_FIELDS},
+        'prd': {k: prd_res.get(k) for k in MANIFEST_RESULT_FIELDS}
+    }
+
+def write_run_manifest(manifest_entries, settings: Dict[str, Any], output_dir: str):
+    manifest = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'run_mode': settings.get('RUN_MODE', 'DUAL').upper(),
+        'output_dir': os.path.abspath(output_dir),
+        'tests': [entry for entry in manifest_entries if entry is not None]
+    }
+
+    manifest_path = get_unique_filepath(output_dir, 'run_manifest.json')
+    latest_path = os.path.join(settings['OUTPUT_DIR'], settings.get('RUN_MANIFEST_FILE', 'last_run_manifest.json'))
+
+    try:
+        for path in (manifest_path, latest_path):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, separators=(',', ':'))
+        logger.info(f"Run manifest saved to: {manifest_path}")
+        return manifest_path
+    except Exception as e:
+        logger.error(f"Failed to save run manifest: {e}")
+        return None
+
+def prune_response_store(settings: Dict[str, Any]):
+    keep_runs = get_int_setting(settings, 'RESPONSE_STORE_KEEP_RUNS', 10)
+    if keep_runs <= 0:
+        return
+
+    output_dir = Path(settings['OUTPUT_DIR'])
+    manifest_paths = sorted(output_dir.glob('*/run_manifest*.json'), key=lambda p: p.stat().st_mtime, reverse=True)[:keep_runs]
+    manifest_paths.append(output_dir / settings.get('RUN_MANIFEST_FILE', 'last_run_manifest.json'))
+
+    keep_digests = set()
+    for manifest_path in manifest_paths:
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            logger.warning(f"Skipping response store pruning: could not read run manifest '{manifest_path}': {e}")
+            return
+        for entry in manifest.get('tests', []):
+            for env in ('ods', 'prd'):
+                keep_digests.add((entry.get(env) or {}).get('raw_body_ref'))
+
+    response_store = get_response_store(settings)
+    removed_count, removed_bytes = response_store.prune(keep_digests)
+    if removed_count:
+        logger.info(f"Pruned {removed_count} response bodies ({removed_bytes / 1024:.1f} KB) not referenced by the last {keep_runs} run manifest(s) from {response_store.store_dir}.")
+
+def load_run_manifest(manifest_path) -> Dict[str, Any]:
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.critical(f"ERROR: Could not read run manifest '{manifest_path}': {e}")
+        return None
 
+def restore_manifest_result(compact_result: Dict[str, Any], response_store: ResponseStore) -> Dict[str, Any]:
+    res = dict(compact_result)
+    res['json_body'] = None if res['status_code'] == 'TIMEOUT/ERROR' else parse_json_body(response_store.get(res['raw_body_ref']))
+    res['restored'] = True
+    return res
+
+def iter_rerun_result_pairs(all_runs, manifest: Dict[str, Any], settings: Dict[str, Any]):
+    rerun_outcomes = set(settings.get('RERUN_OUTCOMES_LIST', ['CRITICAL_FAIL', 'TIMEOUT']))
+    response_store = get_response_store(settings)
+    run_mode = settings.get('RUN_MODE', 'DUAL').upper()
+
+    previous = {entry['test_name']: entry for entry in manifest.get('tests', [])}
+    if manifest.get('run_mode') != run_mode:
+        logger.warning(f"Previous run used RUN_MODE {manifest.get('run_mode')}, current is {run_mode}. Re-executing every test.")
+        previous = {}
+
+    rerun_indices = []
+    rerun_runs = []
+    reused_count = 0
+    for i, req_data in enumerate(all_runs):
+        entry = previous.get(req_data['name'])
+        if (entry is None or entry['outcome'] in rerun_outcomes
+                or entry['request_hash'] != compute_request_hash(req_data)
+                or not all(response_store.has(entry[env]['raw_body_ref']) for env in ('ods', 'prd'))):
+            rerun_indices.append(i)
+            rerun_runs.append(req_data)
+        else:
+            reused_count += 1
+            yield i, restore_manifest_result(entry['ods'], response_store), restore_manifest_result(entry['prd'], response_store)
+
+    logger.info(f"Rerun-failed mode: re-executing {len(rerun_runs)} of {reused_count + len(rerun_runs)} tests, reusing {reused_count} results from {manifest.get('created', 'the previous run')}.")
+
+    for j, ods_res, prd_res in iter_result_pairs(rerun_runs, settings):
+        yield rerun_indices[j], ods_res, prd_res
+
+def iter_recorded_runs(all_runs, manifest: Dict[str, Any], settings: Dict[str, Any]):
+    response_store = get_response_store(settings)
+    previous = {entry['test_name']: entry for entry in manifest.get('tests', [])}
+
+    recorded_count = 0
+    skipped_count = 0
+    for req_data in all_runs:
+        entry = previous.get(req_data['name'])
+        if (entry is None or entry['request_hash'] != compute_request_hash(req_data)
+                or not all(response_store.has(entry[env]['raw_body_ref']) for env in ('ods', 'prd'))):
+            skipped_count += 1
+            continue
+        recorded_count += 1
+        yield req_data
+
+    logger.info(f"Recompare mode: re-compared {recorded_count} tests from {manifest.get('created', 'the previous run')}, skipped {skipped_count} that are new, changed or missing stored responses.")
+
+def iter_recompare_result_pairs(all_runs, manifest: Dict[str, Any], settings: Dict[str, Any]):
+    response_store = get_response_store(settings)
+    previous = {entry['test_name']: entry for entry in manifest.get('tests', [])}
+
+    logger.info(f"\n------------ Re-comparing Stored Responses (Phase 2-3/5 - RECOMPARE) ------------")
+    for i, req_data in enumerate(all_runs):
+        entry = previous[req_data['name']]
+        yield i, restore_manifest_result(entry['ods'], response_store), restore_manifest_result(entry['prd'], response_store)
+
+class BodySubstitutionPlan:
+    def __init__(self, body: str, pattern: re.Pattern, column_lookup: Dict[str, str]):
+        self.parts = []
+        position = 0
+        for match in pattern.finditer(body):
+            self.parts.append(body[position:match.start()])
+            if match.group('placeholder') is not None:
+                self.parts.append((match.group('placeholder'), match.group(0)))
+            else:
+                self.parts.append(match.group('prefix'))
+                self.parts.append((column_lookup[match.group('key').lower()], match.group('value')))
+                self.parts.append('"')
+            position = match.end()
+        self.parts.append(body[position:])
+        self.parts = [part for part in self.parts if part != '']
+        self.is_static = all(isinstance(part, str) for part in self.parts)
+
+    def render(self, values: Dict[str, str]) -> str:
+        return ''.join(part if isinstance(part, str) else values.get(part[0], part[1]) for part in self.parts)
+
+def compile_substitution_pattern(columns: List[str]):
+    if not columns:
+        return None
+    alternation = '|'.join(re.escape(c) for c in sorted(columns, key=len, reverse=True))
+    return re.compile(r'\{\{(?P<placeholder>' + alternation + r')\}\}|(?P<prefix>"(?P<key>(?i:' + alternation + r'))"\s*:\s*")(?P<value>.*?)"')
+
+def read_data_sheet(data_file: str):
     data_file_path = Path.cwd() / data_file
-    logger.info(f"\n--- Generating Executable Runs (Mixed Static and Data-Driven) ---")
 
     try:
         if not data_file_path.exists():
             logger.error(f"ERROR: Test data file '{data_file}' not found at path: {data_file_path.resolve()}.")
-            return []
+            return [], iter(())
 
-        data_df = pd.read_excel(data_file_path, sheet_name='Data')
+        header_rows = get_workbook_sheet(data_file_path, 'Data')
 
     except Exception as e:
         logger.critical(f"CRITICAL ERROR reading Excel Data sheet: {e}.")
-        return []
+        return [], iter(())
+
+    if not header_rows:
+        return [], iter(())
+
+    columns = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(header_rows[0])]
+    padding = (None,) * len(columns)
+    rows = (dict(zip(columns, values + padding)) for values in iter_workbook_rows(data_file_path, 'Data', min_row=2))
+    return columns, rows
 
-    final_runs = []
+def iter_executable_runs(all_requests_templates: List[Dict[str, Any]], data_file: str):
+    logger.info(f"\n--- Generating Executable Runs (Mixed Static and Data-Driven) ---")
+
+    columns, data_rows = read_data_sheet(data_file)
     request_templates = {req['name']: req for req in all_requests_templates}
 
     HEADER_PREFIX = 'Override_Header_'
     URL_PARAM_PREFIX = 'Override_URL_Param_'
     SCHEMA_FILE_COL = 'Expected_Schema_File'
+    IDENTITY_KEYS_COL = 'List_Identity_Keys'
+    CONTROL_COLS = {'test_name', 'Execution_Type', 'run_id', 'Test_Type', 'Expected_Status_Code', SCHEMA_FILE_COL, IDENTITY_KEYS_COL}
 
-    all_cols = data_df.columns.tolist()
-    header_override_cols = [c for c in all_cols if c.startswith(HEADER_PREFIX)]
-    url_param_override_cols = [c for c in all_cols if c.startswith(URL_PARAM_PREFIX)]
+    header_override_cols = [(c, c.replace(HEADER_PREFIX, '')) for c in columns if c.startswith(HEADER_PREFIX)]
+    url_param_override_cols = [(c, c.replace(URL_PARAM_PREFIX, '')) for c in columns if c.startswith(URL_PARAM_PREFIX)]
+    substitution_cols = [c for c in columns if c not in CONTROL_COLS and not c.startswith((HEADER_PREFIX, URL_PARAM_PREFIX))]
+    substitution_pattern = compile_substitution_pattern(substitution_cols)
+    column_lookup = {c.lower(): c for c in substitution_cols}
+    substitution_plans = {}
 
     static_tests_added = set()
+    generated_count = 0
 
-    for index, row in data_df.iterrows():
-        if 'test_name' not in row or pd.isna(row['test_name']): continue
-        if 'Execution_Type' not in row or pd.isna(row['Execution_Type']): continue
+    for index, row in enumerate(data_rows):
+        if row.get('test_name') is None: continue
+        if row.get('Execution_Type') is None: continue
 
         test_case_name = row['test_name']
-        execution_type = row['Execution_Type'].upper()
+        execution_type = str(row['Execution_Type']).strip().upper()
 
         test_type = str(row.get('Test_Type', 'FUNCTIONAL')).strip().upper()
         expected_status = row.get('Expected_Status_Code')
         expected_schema_file = row.get(SCHEMA_FILE_COL)
+        list_identity_keys = row.get(IDENTITY_KEYS_COL)
 
         if test_case_name not in request_templates:
             logger.warning(f"Test name '{test_case_name}' from row {index+1} not found in Postman collection. Skipping.")
             continue
 
-        template = request_templates[test_case_name]
+        if execution_type == 'STATIC' and test_case_name in static_tests_added:
+            continue
 
-        header_overrides = {}
-        for col in header_override_cols:
-            if pd.notna(row[col]):
-                header_key = col.replace(HEADER_PREFIX, '')
-                header_overrides[header_key] = str(row[col]).strip()
+        template = request_templates[test_case_name]
 
-        url_params = {}
-        for col in url_param_override_cols:
-            if pd.notna(row[col]):
-                param_key = col.replace(URL_PARAM_PREFIX, '')
-                url_params[param_key] = str(row[col]).strip()
+        header_overrides = {key: str(row[col]).strip() for col, key in header_override_cols if row[col] is not None}
+        url_params = {key: str(row[col]).strip() for col, key in url_param_override_cols if row[col] is not None}
 
         if execution_type == 'STATIC':
-            if test_case_name in static_tests_added:
-                continue
-
             new_run = template.copy()
             new_run['name'] = f"{template['name']}"
             new_run['test_type'] = test_type
@@ -911,54 +2824,156 @@ def generate_all_executable_runs(all_requests_templates: List[Dict[str, Any]], d
                 new_run['header_overrides'] = header_overrides
                 new_run['url_params'] = url_params
 
-            if pd.notna(expected_status):
-                 new_run['expected_status_code'] = int(expected_status)
-
-            if pd.notna(expected_schema_file):
-                 new_run['expected_schema_file'] = str(expected_schema_file).strip()
-
-            final_runs.append(new_run)
             static_tests_added.add(test_case_name)
 
         elif execution_type == 'DATA_DRIVEN':
+            if test_case_name not in substitution_plans:
+                substitution_plans[test_case_name] = BodySubstitutionPlan(template['body'], substitution_pattern, column_lookup) if substitution_pattern else None
+            plan = substitution_plans[test_case_name]
+
+            new_run = template.copy()
+            new_run['name'] = f"{template['name']} (Run: {row.get('run_id', index+1)})"
+            if plan is not None and not plan.is_static:
+                new_run['body'] = plan.render({col: str(row[col]) for col in substitution_cols if row[col] is not None})
+            new_run['test_type'] = test_type
+            new_run['header_overrides'] = header_overrides
+            new_run['url_params'] = url_params
 
-            unique_run_name = f"{template['name']} (Run: {row.get('run_id', index+1)})"
-            raw_body = template['body']
+        else:
+            continue
 
-            for col in ['vpin', 'offset', 'limit']:
-                value = row.get(col)
-                if pd.notna(value):
-                    str_value = str(value)
+        if expected_status is not None:
+             new_run['expected_status_code'] = int(expected_status)
 
-                    raw_body = raw_body.replace(f'{{{{{col}}}}}', str_value)
+        if expected_schema_file is not None:
+             new_run['expected_schema_file'] = str(expected_schema_file).strip()
 
-                    pattern = r'(\"' + re.escape(col) + r'\"\s*:\s*\")(.*?)(\")'
+        if list_identity_keys is not None:
+             new_run['list_identity_keys'] = [k.strip() for k in str(list_identity_keys).split(',') if k.strip()]
 
-                    if re.search(pattern, raw_body, re.IGNORECASE):
-                        raw_body = re.sub(
-                            pattern,
-                            r'\1' + str_value + r'\3',
-                            raw_body,
-                            flags=re.IGNORECASE
-                        )
+        generated_count += 1
+        yield new_run
 
-            new_run = template.copy()
-            new_run['name'] = unique_run_name
-            new_run['body'] = raw_body
-            new_run['test_type'] = test_type
-            new_run['header_overrides'] = header_overrides
-            new_run['url_params'] = url_params
+    logger.info(f"Generated {generated_count} executable runs (Mixing Static and Data-Driven tests).")
+
+class RunStream:
+    def __init__(self, runs):
+        self.runs = iter(runs)
+        self.lookahead = []
+        self.active = {}
+        self.count = 0
+
+    def has_runs(self) -> bool:
+        if not self.lookahead:
+            self.lookahead.extend(itertools.islice(self.runs, 1))
+        return bool(self.lookahead)
+
+    def __iter__(self):
+        while self.lookahead:
+            yield self._register(self.lookahead.pop(0))
+        for run in self.runs:
+            yield self._register(run)
+
+    def _register(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        self.active[self.count] = run
+        self.count += 1
+        return run
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self.active[index]
 
-            if pd.notna(expected_status):
-                 new_run['expected_status_code'] = int(expected_status)
+    def release(self, index: int):
+        self.active.pop(index, None)
 
-            if pd.notna(expected_schema_file):
-                 new_run['expected_schema_file'] = str(expected_schema_file).strip()
+def is_inspected_test(test_name: str, settings: Dict[str, Any]) -> bool:
+    inspect_prefixes = settings.get('INSPECT_TESTS_LIST', [])
+    return any(prefix == '*' or test_name.startswith(prefix) for prefix in inspect_prefixes)
 
-            final_runs.append(new_run)
+def render_response_text(raw_text: str) -> str:
+    try:
+        clean_text = raw_text.strip().lstrip('\ufeff')
+        if clean_text:
+            return escape_html(json.dumps(json.loads(clean_text), indent=2))
+    except Exception:
+        pass
+    return escape_html(raw_text)
+
+def load_report_response(item, env_prefix, response_store):
+    highlighted_ref = item.get(f'{env_prefix}_raw_response_ref')
+    if highlighted_ref:
+        return response_store.get(highlighted_ref)
+    if item.get('render_responses', True):
+        return render_response_text(response_store.get(item[f'{env_prefix}_raw_body_ref']))
+    return escape_html("Response not rendered for passing tests. Add the test name to INSPECT_TESTS to include it.")
+
+def iter_report_rows(comparison_data, settings):
+    response_store = get_response_store(settings)
+    for item in comparison_data:
+        row = dict(item)
+        row['ods_raw_response'] = load_report_response(item, 'ods', response_store)
+        row['prd_raw_response'] = load_report_response(item, 'prd', response_store)
+        yield row
+
+def get_overall_status(item: Dict[str, Any]) -> str:
+    if 'TIMEOUT' in item['ods_status'] or 'TIMEOUT' in item['prd_status']:
+        return 'TIMEOUT'
+    if 'FAIL' in item['ods_status'] or 'FAIL' in item['prd_status'] or ('FAIL' in item['data_diff_result'] and 'SOFT' not in item['data_diff_result']):
+        return 'CRITICAL_FAIL'
+    if 'SOFT' in item['data_diff_result']:
+        return 'SOFT_FAIL'
+    return 'PASS'
+
+def resolve_report_mode(settings: Dict[str, Any], total_tests: int) -> str:
+    report_mode = str(settings.get('REPORT_MODE', 'AUTO')).upper()
+    if report_mode == 'AUTO':
+        return 'SHARDED' if total_tests > get_int_setting(settings, 'REPORT_SHARD_THRESHOLD', 500) else 'INLINE'
+    return report_mode
+
+def write_report_shard(shard_dir: str, shard_index: int, payloads: Dict[int, Dict[str, str]]):
+    encoded = base64.b64encode(gzip.compress(json.dumps(payloads).encode('utf-8'), compresslevel=6)).decode('ascii')
+    with open(os.path.join(shard_dir, f"shard_{shard_index:05d}.js"), 'w', encoding='utf-8') as f:
+        f.write(f'window.__loadReportShard({shard_index}, "{encoded}");\n')
+
+def write_report_shards(comparison_data, settings, shard_dir: str) -> List[Dict[str, Any]]:
+    shard_size = max(1, get_int_setting(settings, 'REPORT_SHARD_SIZE', 50))
+    os.makedirs(shard_dir, exist_ok=True)
+
+    report_rows = []
+    payloads = {}
+    for index, row in enumerate(iter_report_rows(comparison_data, settings)):
+        shard_index = index // shard_size
+        report_rows.append({
+            'test_name': row['test_name'],
+            'overall_status': get_overall_status(row),
+            'ods_status': row['ods_status'],
+            'prd_status': row['prd_status'],
+            'ods_time': row['ods_time'],
+            'prd_time': row['prd_time'],
+            'ods_timing_detail': row.get('ods_timing_detail', ''),
+            'prd_timing_detail': row.get('prd_timing_detail', ''),
+            'ods_record_count': row['ods_record_count'],
+            'prd_record_count': row['prd_record_count'],
+            'test_type': row['test_type'],
+            'data_diff_result': row['data_diff_result'],
+            'diff_css_class': row['diff_css_class'],
+            'data_diff_summary': row['data_diff_summary'],
+            'comments': row['comments'],
+            'shard': shard_index,
+        })
+        payloads[index] = {
+            'request_body': escape_html(row['request_body']),
+            'ods_raw_response': row['ods_raw_response'],
+            'prd_raw_response': row['prd_raw_response'],
+        }
+        if len(payloads) == shard_size:
+            write_report_shard(shard_dir, shard_index, payloads)
+            payloads = {}
+
+    if payloads:
+        write_report_shard(shard_dir, (len(report_rows) - 1) // shard_size, payloads)
 
-    logger.info(f"Generated {len(final_runs)} executable runs (Mixing Static and Data-Driven tests).")
-    return final_runs
+    logger.info(f"Wrote {len(report_rows)} test payloads to {(len(report_rows) + shard_size - 1) // shard_size} shards in {shard_dir}.")
+    return report_rows
 
 def generate_report(comparison_data, metrics, settings, output_dir):
 
@@ -969,7 +2984,8 @@ def generate_report(comparison_data, metrics, settings, output_dir):
     logger.info("--- Generating HTML Report and Charts (Phase 5/5) ---")
 
     RUN_MODE = settings.get('RUN_MODE', 'DUAL')
-    TARGET_ENV_NAME = RUN_MODE.split('_')[0] if RUN_MODE != 'DUAL' else 'DUAL'
+    COMPARISON_MODE = RUN_MODE in ('DUAL', 'BASELINE')
+    TARGET_ENV_NAME = 'DUAL' if COMPARISON_MODE else get_live_environments(settings)[0]
 
     critical_pass_count = metrics['total_tests'] - metrics['status_fail_count'] - metrics['data_diff_count'] - metrics['schema_fail_count'] - metrics['connection_fail_count']
 
@@ -987,8 +3003,9 @@ def generate_report(comparison_data, metrics, settings, output_dir):
 
     avg_ods_time = int(sum(ods_times) / len(ods_times)) if ods_times else 0
     avg_prd_time = int(sum(prd_times) / len(prd_times)) if prd_times else 0
-    metrics['p90_ods_time'] = "N/A (P90 removed)"
-    metrics['p90_prd_time'] = "N/A (P90 removed)"
+    env_latency = next((row for row in metrics.get('latency_summary', []) if row['scope'] == 'Environment'), {})
+    metrics['p90_ods_time'] = env_latency['ods']['p90'] if env_latency.get('ods') else "N/A"
+    metrics['p90_prd_time'] = env_latency['prd']['p90'] if env_latency.get('prd') else "N/A"
 
     metrics['avg_ods_time'] = avg_ods_time
     metrics['avg_prd_time'] = avg_prd_time
@@ -1011,7 +3028,7 @@ def generate_report(comparison_data, metrics, settings, output_dir):
     metrics['perf_factor'] = perf_factor
 
     perf_summary = ""
-    if RUN_MODE != 'DUAL':
+    if not COMPARISON_MODE:
         perf_summary = f"Performance metrics for **{TARGET_ENV_NAME}** environment only. Comparison data is duplicated."
     elif performance_delta > 500:
         perf_summary = f"Production (PRD) is **{perf_factor}x slower** than ODS on average ({performance_delta} ms delta). This is a **CRITICAL** performance regression."
@@ -1020,6 +3037,11 @@ def generate_report(comparison_data, metrics, settings, output_dir):
     else:
         perf_summary = f"Performance is healthy. PRD is {perf_factor}x slower on average ({performance_delta} ms delta)."
 
+    latency_regressions = metrics.get('latency_regressions', [])
+    if latency_regressions:
+        regressed = ', '.join(sorted({f"{r['request_name']} ({r['environment']})" for r in latency_regressions}))
+        perf_summary += f" **{len(latency_regressions)} statistically significant latency regression(s)** against run history: {regressed}."
+
     security_findings_unique = set(metrics['security_findings_list'])
     stability_findings_unique = set(metrics['stability_findings_list'])
     schema_findings_unique = set(metrics['schema_findings_list'])
@@ -1040,7 +3062,7 @@ def generate_report(comparison_data, metrics, settings, output_dir):
     else:
         metrics['schema_summary'] = "Schema validation passed for all applicable tests."
 
-    if RUN_MODE != 'DUAL':
+    if not COMPARISON_MODE:
         data_integrity_summary = f"**Data integrity comparison skipped (Single Run Mode: {TARGET_ENV_NAME}).**"
     else:
         data_integrity_summary = f"**Core Data Integrity is PASS ({metrics['data_diff_count']} Critical Differences).** All {metrics['dynamic_diff_count']} data differences were confined to dynamic fields (e.g., LAST_UPDATE, ID type changes)."
@@ -1061,13 +3083,15 @@ def generate_report(comparison_data, metrics, settings, output_dir):
 
     report_metadata = {
         'collection_name': settings['COLLECTION_FILE'],
-        'ods_url': settings['ODS_URL'] if RUN_MODE != 'PRD_ONLY' else f"N/A ({TARGET_ENV_NAME} Mode)",
-        'prd_url': settings['PRD_URL'] if RUN_MODE != 'ODS_ONLY' else f"N/A ({TARGET_ENV_NAME} Mode)",
+        'ods_url': describe_environment_source('ODS', settings),
+        'prd_url': describe_environment_source('PRD', settings),
         'run_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S %Z"),
         'total_tests': metrics['total_tests'],
         'ENABLE_PERF_GRAPH': settings['ENABLE_PERF_GRAPH'],
         'RUN_MODE': RUN_MODE,
-        'TARGET_ENV_NAME': TARGET_ENV_NAME
+        'TARGET_ENV_NAME': TARGET_ENV_NAME,
+        'REPORT_MODE': resolve_report_mode(settings, len(comparison_data)),
+        'REPORT_PAGE_SIZE': max(1, get_int_setting(settings, 'REPORT_PAGE_SIZE', 100))
     }
 
     test_type_counts = {}
@@ -1083,7 +3107,7 @@ def generate_report(comparison_data, metrics, settings, output_dir):
     metrics['perf_score'] = "N/A (Score removed)"
 
     template_vars = {
-        'comparison_data': comparison_data,
+        'comparison_data': iter_report_rows(comparison_data, settings),
         'metrics': metrics,
         'summary': summary,
         'critical_summary': critical_summary,
@@ -1092,11 +3116,16 @@ def generate_report(comparison_data, metrics, settings, output_dir):
         'chart_data_status_json': json.dumps(chart_data_status),
         'chart_data_perf_avg_json': json.dumps(chart_data_perf_avg),
         'chart_data_time_per_test_json': json.dumps(chart_data_time_per_test),
+        'chart_data_latency_histogram_json': json.dumps(build_latency_histogram(metrics)),
+        'chart_data_phase_json': json.dumps({row['key']: {env: (row[env] or {}).get('avg', 0) for env in ('ods', 'prd')} for row in metrics.get('phase_summary', [])}),
+        'latency_percentiles': LATENCY_PERCENTILES,
         'chart_data_test_type_json': json.dumps(chart_data_test_type),
         'perf_delta': performance_delta,
         'perf_factor': perf_factor
     }
 
+    from jinja2 import Environment, FileSystemLoader
+
     file_loader = FileSystemLoader('.')
     env = Environment(loader=file_loader)
     template = env.get_template(settings['TEMPLATE_FILE'])
@@ -1104,123 +3133,258 @@ def generate_report(comparison_data, metrics, settings, output_dir):
     report_path = get_unique_filepath(output_dir, 'Dashboard_report.html')
     abs_report_path = os.path.abspath(report_path)
 
+    if report_metadata['REPORT_MODE'] == 'SHARDED':
+        shard_dir_name = f"{Path(report_path).stem}_payloads"
+        report_rows = write_report_shards(comparison_data, settings, os.path.join(output_dir, shard_dir_name))
+        report_metadata['SHARD_DIR'] = shard_dir_name
+        template_vars['comparison_data'] = []
+        template_vars['report_rows_json'] = json.dumps(report_rows).replace('</', '<\\/')
+
     with open(report_path, 'w', encoding="utf-8") as f:
-        f.write(template.render(template_vars))
+        template.stream(template_vars).dump(f)
 
     logger.info(f"\n--- HTML Report successfully generated at: {abs_report_path} ---")
 
     return abs_report_path
 
-if __name__ == '__main__':
+def prepare_run_output_dir(settings: Dict[str, Any]) -> str:
+    today_str = datetime.now().strftime("%m-%d-%Y")
+    run_output_dir = os.path.join(settings['OUTPUT_DIR'], today_str)
 
-    try:
-        if not JSONSCHEMA_AVAILABLE:
-            logger.warning("WARNING: jsonschema not installed. Response Schema Validation will be skipped. Install with 'pip install jsonschema'.")
+    if not os.path.exists(run_output_dir):
+        os.makedirs(run_output_dir)
+        logger.info(f"Created date-specific output directory: {run_output_dir}")
+    return run_output_dir
 
-        import pandas as pd
-        import openpyxl
-    except ImportError as e:
-        logger.critical(f"ERROR: Missing required libraries for execution. Please install: pip install pandas openpyxl requests deepdiff jinja2 colorama jsonschema. Missing: {e}")
+def load_executable_runs(settings: Dict[str, Any]) -> RunStream:
+    if not os.path.exists(settings['POSTMAN_COLLECTION_FILE']):
+        logger.critical(f"ERROR: Collection file '{settings['COLLECTION_FILE']}' not found at {settings['POSTMAN_COLLECTION_FILE'].resolve()}. Please update COLLECTION_FILE in the Settings sheet.")
         sys.exit(1)
 
-    settings = load_settings_from_excel(TEST_DATA_FILE)
+    logger.info("\n--- Parsing Postman Collection ---")
+    try:
+        all_requests_templates = extract_requests(settings['POSTMAN_COLLECTION_FILE'], settings['TARGET_TEST_PREFIXES'], settings)
+        if not all_requests_templates:
+            logger.error("ERROR: No requests found in collection. Exiting.")
+            sys.exit(1)
+    except Exception as e:
+        logger.critical(f"ERROR: Failed to parse Postman collection: {e}. Exiting.")
+        sys.exit(1)
+
+    return RunStream(iter_executable_runs(all_requests_templates, TEST_DATA_FILE))
+
+def run_health_checks(settings: Dict[str, Any]) -> bool:
+    healthy = True
+    for env in get_live_environments(settings):
+        healthy = check_api_health(env, settings[f"{env}_URL"], settings) and healthy
+    return healthy
+
+def find_latest_report(report_dir: str):
+    reports = list(Path(report_dir).rglob('Dashboard_report*.html')) if report_dir and os.path.isdir(report_dir) else []
+    return max(reports, key=lambda p: p.stat().st_mtime) if reports else None
+
+def finish_comparison(comparison_data, metrics, manifest_entries, settings: Dict[str, Any], run_output_dir: str, save_snapshot: bool = True):
+    manifest_entries = [manifest_entries[i] for i in sorted(manifest_entries)]
+    write_run_manifest(manifest_entries, settings, run_output_dir)
+
+    if save_snapshot and settings['RUN_MODE'] == 'SNAPSHOT':
+        write_snapshot(manifest_entries, settings)
+
+    close_http_sessions()
+    close_cassette()
+    close_schema_validation_pool()
+
+    metrics['latency_regressions'] = check_latency_regressions(metrics, settings)
+
+    report_path_html = generate_report(comparison_data, metrics, settings, run_output_dir)
+    report_path_excel = export_to_excel(comparison_data, run_output_dir, metrics.get('latency_summary'), metrics['latency_regressions'], get_path_classifier(settings))
+    prune_response_store(settings)
+
+    logger.info("\n--- Opening HTML Report in Browser ---")
+    if report_path_html and settings['AUTO_OPEN_HTML'] == 'YES':
+        import webbrowser
+        webbrowser.open(report_path_html)
+        print(f"{Fore.GREEN}Report opened successfully in browser.{Style.RESET_ALL}")
+    elif report_path_html:
+         print(f"{Fore.GREEN}Report generated successfully.{Style.RESET_ALL} Auto-open is disabled. Open the file manually: {report_path_html}")
 
-    POSTMAN_COLLECTION_FILE = settings['POSTMAN_COLLECTION_FILE']
-    COLLECTION_FILE = settings['COLLECTION_FILE']
+    logger.info("Script execution finished.")
+
+    if metrics['latency_regressions'] and settings.get('REGRESSION_GATE', 'MARK') == 'FAIL':
+        logger.error(f"Regression gate FAILED: {len(metrics['latency_regressions'])} significant latency regression(s) detected.")
+        sys.exit(1)
+
+def command_run(args, settings: Dict[str, Any]):
+    RUN_MODE = settings['RUN_MODE']
     ODS_URL = settings['ODS_URL']
     PRD_URL = settings['PRD_URL']
-    OUTPUT_DIR = settings['OUTPUT_DIR']
-    TARGET_TEST_PREFIXES = settings['TARGET_TEST_PREFIXES']
-    DYNAMIC_FIELD_TERMS = settings['DYNAMIC_FIELD_TERMS']
-    AUTO_OPEN_HTML = settings['AUTO_OPEN_HTML']
-    RUN_MODE = settings.get('RUN_MODE', 'DUAL').upper()
-    SCHEMA_DIR = settings['SCHEMA_DIR']
-
-    if not os.path.exists(POSTMAN_COLLECTION_FILE):
-        logger.critical(f"ERROR: Collection file '{COLLECTION_FILE}' not found at {POSTMAN_COLLECTION_FILE.resolve()}. Please update COLLECTION_FILE in the Settings sheet.")
-        sys.exit(1)
 
-    today_str = datetime.now().strftime("%m-%d-%Y")
-    run_output_dir = os.path.join(OUTPUT_DIR, today_str)
-    
-    if not os.path.exists(run_output_dir):
-        os.makedirs(run_output_dir)
-        logger.info(f"Created date-specific output directory: {run_output_dir}")
+    run_output_dir = prepare_run_output_dir(settings)
 
     ods_url_color = Fore.CYAN
     prd_url_color = Fore.BLUE
     print(f"Starting API Comparison Script using (Mode: {RUN_MODE}):")
-    print(f"  Collection: {COLLECTION_FILE}")
+    print(f"  Collection: {settings['COLLECTION_FILE']}")
     print(f"  ODS URL: {ods_url_color}{ODS_URL}{Style.RESET_ALL}")
     print(f"  PRD URL: {prd_url_color}{PRD_URL}{Style.RESET_ALL}")
 
     ods_healthy = True
     prd_healthy = True
 
-    if RUN_MODE in ['DUAL', 'ODS_ONLY']:
-        ods_healthy = check_api_health('ODS', ODS_URL)
-    if RUN_MODE in ['DUAL', 'PRD_ONLY']:
-        prd_healthy = check_api_health('PRD', PRD_URL)
+    if RUN_MODE in ('SNAPSHOT', 'BASELINE') and settings.get('SNAPSHOT_ENV', 'PRD') not in ('ODS', 'PRD'):
+        logger.critical(f"ERROR: SNAPSHOT_ENV must be ODS or PRD, got '{settings.get('SNAPSHOT_ENV', '')}'. Please update SNAPSHOT_ENV in the Settings sheet.")
+        sys.exit(1)
+
+    if RUN_MODE == 'BASELINE' and get_baseline_snapshot(settings) is None:
+        sys.exit(1)
+
+    if RUN_MODE == 'SNAPSHOT':
+        settings['SNAPSHOT_VERSION'] = settings.get('SNAPSHOT_VERSION') or datetime.now().strftime('%Y%m%d-%H%M%S')
+        snapshot_path = get_snapshot_dir(settings) / f"{settings['SNAPSHOT_VERSION']}.json"
+        if snapshot_path.exists():
+            logger.critical(f"ERROR: Snapshot version '{settings['SNAPSHOT_VERSION']}' already exists at {snapshot_path}. Choose a new SNAPSHOT_VERSION.")
+            sys.exit(1)
+
+    if RUN_MODE == 'LOAD':
+        invalid_envs = [env for env in settings.get('LOAD_ENVS_LIST', []) if env not in ('ODS', 'PRD')]
+        if invalid_envs or not get_live_environments(settings):
+            logger.critical(f"ERROR: LOAD_ENVS must name ODS and/or PRD, got '{settings.get('LOAD_ENVS', '')}'. Please update LOAD_ENVS in the Settings sheet.")
+            sys.exit(1)
 
-    if RUN_MODE == 'DUAL' and not (ods_healthy and prd_healthy):
+    live_envs = get_live_environments(settings)
+    if settings.get('CASSETTE_MODE', 'OFF') == 'REPLAY':
+        logger.info(f"Cassette REPLAY mode: answering requests from {settings['CASSETTE_FILE']}. Skipping health checks.")
+    else:
+        if 'ODS' in live_envs:
+            ods_healthy = check_api_health('ODS', ODS_URL, settings)
+            warm_up_http_session('ODS', ODS_URL, settings)
+        if 'PRD' in live_envs:
+            prd_healthy = check_api_health('PRD', PRD_URL, settings)
+            warm_up_http_session('PRD', PRD_URL, settings)
+
+    if len(live_envs) > 1 and not (ods_healthy and prd_healthy):
         logger.warning("One or both environments failed the health check. Proceeding with caution, but expect failures.")
 
-    logger.info("\n--- Parsing Postman Collection ---")
-    try:
-        all_requests_templates = extract_requests(POSTMAN_COLLECTION_FILE, TARGET_TEST_PREFIXES, settings)
-        if not all_requests_templates:
-            logger.error("ERROR: No requests found in collection. Exiting.")
+    all_runs = load_executable_runs(settings)
+
+    if not all_runs.has_runs():
+        logger.error("ERROR: No executable runs generated. Check if 'test_data.xlsx' Data sheet has valid runs.")
+        sys.exit(1)
+
+    logger.info("Streaming executable runs into execution and comparison.")
+
+    if RUN_MODE == 'LOAD':
+        load_results = run_load_test(all_runs, settings)
+        close_http_sessions()
+        close_cassette()
+        export_load_test_report(load_results, run_output_dir)
+        logger.info("Script execution finished.")
+        sys.exit(0)
+
+    if args.rerun_failed is not None:
+        manifest_path = args.rerun_failed or os.path.join(settings['OUTPUT_DIR'], settings['RUN_MANIFEST_FILE'])
+        previous_manifest = load_run_manifest(manifest_path)
+        if previous_manifest is None:
             sys.exit(1)
-    except Exception as e:
-        logger.critical(f"ERROR: Failed to parse Postman collection: {e}. Exiting.")
+        result_pairs = iter_rerun_result_pairs(all_runs, previous_manifest, settings)
+    else:
+        result_pairs = iter_result_pairs(all_runs, settings)
+
+    manifest_entries = {}
+    comparison_data, metrics = stream_compare_results(result_pairs, all_runs, settings['DYNAMIC_FIELD_TERMS'], settings['SCHEMA_DIR'], settings, manifest_entries=manifest_entries)
+    finish_comparison(comparison_data, metrics, manifest_entries, settings, run_output_dir)
+
+def command_recompare(args, settings: Dict[str, Any]):
+    manifest_path = args.manifest or os.path.join(settings['OUTPUT_DIR'], settings['RUN_MANIFEST_FILE'])
+    previous_manifest = load_run_manifest(manifest_path)
+    if previous_manifest is None:
         sys.exit(1)
 
-    all_runs = generate_all_executable_runs(all_requests_templates, TEST_DATA_FILE)
+    if previous_manifest.get('run_mode') not in (None, settings['RUN_MODE']):
+        logger.info(f"Recompare mode: using RUN_MODE {previous_manifest['run_mode']} of the recorded run instead of {settings['RUN_MODE']}.")
+        settings['RUN_MODE'] = previous_manifest['run_mode']
 
-    if not all_runs:
-        logger.error("ERROR: No executable runs generated. Check if 'test_data.xlsx' Data sheet has valid runs.")
+    run_output_dir = prepare_run_output_dir(settings)
+    print(f"Re-comparing stored responses from {manifest_path} (Mode: {settings['RUN_MODE']}, recorded {previous_manifest.get('created', 'unknown')}).")
+
+    all_runs = RunStream(iter_recorded_runs(load_executable_runs(settings), previous_manifest, settings))
+
+    if not all_runs.has_runs():
+        logger.error(f"ERROR: None of the current tests have stored responses in {manifest_path}. Use the 'run' command first.")
         sys.exit(1)
 
-    logger.info(f"Total scenarios to execute and compare: {len(all_runs)}")
+    result_pairs = iter_recompare_result_pairs(all_runs, previous_manifest, settings)
+    manifest_entries = {}
+    comparison_data, metrics = stream_compare_results(result_pairs, all_runs, settings['DYNAMIC_FIELD_TERMS'], settings['SCHEMA_DIR'], settings, manifest_entries=manifest_entries)
+    finish_comparison(comparison_data, metrics, manifest_entries, settings, run_output_dir, save_snapshot=False)
 
-    ods_results = []
-    prd_results = []
+def command_report(args, settings: Dict[str, Any]):
+    manifest_path = args.manifest or os.path.join(settings['OUTPUT_DIR'], settings['RUN_MANIFEST_FILE'])
+    manifest = load_run_manifest(manifest_path)
+    if manifest is None:
+        sys.exit(1)
 
-    if RUN_MODE in ['DUAL', 'ODS_ONLY']:
-        logger.info("\n------------ Executing ODS Requests (Phase 2/5 - ODS) ------------")
-        for req_data in all_runs:
-            ods_results.append(run_api_test(req_data, ODS_URL, 'ODS', settings))
+    outcome_counts = {}
+    for entry in manifest.get('tests', []):
+        outcome_counts[entry['outcome']] = outcome_counts.get(entry['outcome'], 0) + 1
+
+    print(f"Last run: {manifest.get('created', 'unknown')} (Mode: {manifest.get('run_mode', 'unknown')}), {sum(outcome_counts.values())} tests")
+    for outcome, count in sorted(outcome_counts.items(), key=lambda item: -item[1]):
+        outcome_color = Fore.GREEN if outcome == 'PASS' else (Fore.RED if outcome in ('CRITICAL_FAIL', 'TIMEOUT', 'ERROR') else Fore.YELLOW)
+        print(f"  {outcome_color}{outcome}{Style.RESET_ALL}: {count}")
+
+    report_path_html = find_latest_report(manifest.get('output_dir') or settings['OUTPUT_DIR'])
+    if report_path_html is None:
+        print(f"{Fore.YELLOW}No HTML report found for this run.{Style.RESET_ALL}")
+        return
+
+    print(f"  Report: {report_path_html.resolve()}")
+    if args.open:
+        import webbrowser
+        webbrowser.open(report_path_html.resolve().as_uri())
+
+def command_health(args, settings: Dict[str, Any]):
+    healthy = run_health_checks(settings)
+    close_http_sessions()
+    sys.exit(0 if healthy else 1)
+
+CLI_COMMANDS = {
+    'run': command_run,
+    'recompare': command_recompare,
+    'report': command_report,
+    'health': command_health
+}
 
-    if RUN_MODE in ['DUAL', 'PRD_ONLY']:
-        if RUN_MODE == 'PRD_ONLY':
-            logger.info("\n------------ Executing PRD Requests (Phase 2/5 - PRD) ------------")
-            for req_data in all_runs:
-                prd_results.append(run_api_test(req_data, PRD_URL, 'PRD', settings))
+def parse_cli_args(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Compare API responses between the ODS and PRD environments.")
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
 
-        elif RUN_MODE == 'DUAL':
-            logger.info("\n------------ Executing PRD Requests (Phase 2/5 - PRD) ------------")
-            for req_data in all_runs:
-                prd_results.append(run_api_test(req_data, PRD_URL, 'PRD', settings))
+    run_parser = subparsers.add_parser('run', help="Execute the tests against the configured environments and compare the responses (default).")
+    run_parser.add_argument('--rerun-failed', nargs='?', const='', default=None, metavar='MANIFEST',
+                            help="Re-execute only the tests that failed in the previous run (or in MANIFEST) and merge them into a refreshed report.")
 
-    if RUN_MODE == 'ODS_ONLY':
-        prd_results = ods_results.copy()
-        logger.info("Single-run mode (ODS_ONLY) enabled. Duplicating ODS results as PRD results.")
-    elif RUN_MODE == 'PRD_ONLY':
-        ods_results = prd_results.copy()
-        logger.info("Single-run mode (PRD_ONLY) enabled. Duplicating PRD results as ODS results.")
+    recompare_parser = subparsers.add_parser('recompare', help="Compare the responses stored by the previous run again, without sending any requests.")
+    recompare_parser.add_argument('manifest', nargs='?', default='', metavar='MANIFEST', help="Run manifest to re-compare (defaults to the latest run).")
 
-    logger.info("\n--- Starting Data and Metric Comparison (Phase 3/5) ---")
+    report_parser = subparsers.add_parser('report', help="Summarise the latest run and locate its HTML report.")
+    report_parser.add_argument('manifest', nargs='?', default='', metavar='MANIFEST', help="Run manifest to summarise (defaults to the latest run).")
+    report_parser.add_argument('--open', action='store_true', help="Open the HTML report in the browser.")
 
-    comparison_data, metrics = compare_requests_results(ods_results, prd_results, all_runs, DYNAMIC_FIELD_TERMS, SCHEMA_DIR, settings)
+    subparsers.add_parser('health', help="Check the configured environments and exit with 1 if any of them is unhealthy.")
 
-    report_path_html = generate_report(comparison_data, metrics, settings, run_output_dir)
-    report_path_excel = export_to_excel(comparison_data, run_output_dir)
+    if not argv or (argv[0] not in CLI_COMMANDS and argv[0] not in ('-h', '--help')):
+        argv = ['run'] + argv
+    return parser.parse_args(argv)
 
-    logger.info("\n--- Opening HTML Report in Browser ---")
-    if report_path_html and AUTO_OPEN_HTML == 'YES':
-        webbrowser.open(report_path_html)
-        print(f"{Fore.GREEN}Report opened successfully in browser.{Style.RESET_ALL}")
-    elif report_path_html:
-         print(f"{Fore.GREEN}Report generated successfully.{Style.RESET_ALL} Auto-open is disabled. Open the file manually: {report_path_html}")
+def main(argv: List[str] = None):
+    args = parse_cli_args(sys.argv[1:] if argv is None else list(argv))
+    configure_logging(LOG_FILE if args.command in ('run', 'recompare') else None)
 
-    logger.info("Script execution finished.")
+    if args.command in ('run', 'recompare') and not check_required_libraries():
+        sys.exit(1)
+
+    settings = load_settings_from_excel(TEST_DATA_FILE)
+    CLI_COMMANDS[args.command](args, settings)
+
+if __name__ == '__main__':
+    main()
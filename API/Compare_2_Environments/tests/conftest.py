@@ -0,0 +1,118 @@
+import importlib.util
+import json
+import shutil
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
+SCRIPT_PATH = SCRIPT_DIR / 'Scripts.py'
+
+MEMBER_COLLECTION = {
+    'item': [{
+        'name': 'Member',
+        'item': [{
+            'name': 'Member - Search',
+            'request': {
+                'method': 'POST',
+                'header': [{'key': 'content-type', 'value': 'application/json'}],
+                'body': {'raw': '{"vpin": "{{vpin}}", "limit": {{limit}}}'},
+                'url': {'raw': '{{baseurl}}/member'}
+            }
+        }]
+    }]
+}
+
+class MemberApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._send(200, {'ok': True})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        members = [{'MEMBER_ID': i, 'NAME': f"m{i}"} for i in range(int(request.get('limit') or 1))]
+        self._send(200, {'vpin': request.get('vpin'), 'members': members})
+
+    def _send(self, status_code, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope='session')
+def scripts():
+    spec = importlib.util.spec_from_file_location('Scripts', SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def settings(scripts, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scripts, 'RESPONSE_STORE', None)
+    settings = scripts.DEFAULT_CONFIG.copy()
+    settings.update({
+        'DYNAMIC_FIELD_TERMS': ['LAST_UPDATE'],
+        'EXCLUDE_FIELD_NAMES_LIST': [],
+        'LIST_IDENTITY_KEYS_LIST': ['MEMBER_ID'],
+        'INSPECT_TESTS_LIST': []
+    })
+    return settings
+
+@pytest.fixture
+def api_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MemberApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+class Workspace:
+    def __init__(self, path: Path, api_url: str):
+        self.path = path
+        self.api_url = api_url
+        (path / 'collection.json').write_text(json.dumps(MEMBER_COLLECTION), encoding='utf-8')
+        shutil.copy(SCRIPT_DIR / 'report_template.html', path / 'report_template.html')
+        self.write_settings()
+
+    def write_settings(self, **overrides):
+        from openpyxl import Workbook
+
+        settings = {
+            'COLLECTION_FILE': 'collection.json',
+            'ODS_URL': f"{self.api_url}/ods",
+            'PRD_URL': f"{self.api_url}/prd",
+            'OUTPUT_DIR': 'out',
+            'AUTO_OPEN_HTML': 'No'
+        }
+        settings.update(overrides)
+
+        workbook = Workbook()
+        settings_sheet = workbook.active
+        settings_sheet.title = 'Settings'
+        for key, value in settings.items():
+            settings_sheet.append([key, value])
+        data_sheet = workbook.create_sheet('Data')
+        data_sheet.append(['test_name', 'Execution_Type', 'run_id', 'Test_Type', 'vpin', 'limit'])
+        for i in range(3):
+            data_sheet.append(['Member - Search', 'Data_Driven', f"R{i}", 'Functional', f"V{i}", i + 1])
+        workbook.save(self.path / 'test_data.xlsx')
+
+    def run(self, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run([sys.executable, str(SCRIPT_PATH), *args], cwd=self.path, capture_output=True, text=True, timeout=120)
+
+@pytest.fixture
+def workspace(tmp_path, api_url):
+    pytest.importorskip('openpyxl')
+    return Workspace(tmp_path, api_url)
@@ -0,0 +1,30 @@
+import pytest
+
+@pytest.fixture
+def replay_settings(scripts, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scripts, 'RESPONSE_STORE', None)
+    monkeypatch.setattr(scripts, 'CASSETTE', None)
+    settings = scripts.DEFAULT_CONFIG.copy()
+    settings.update({'CASSETTE_MODE': 'REPLAY', 'MAX_RETRIES': '3', 'RETRY_BACKOFF_MS': '1000'})
+    yield settings
+    scripts.close_cassette()
+
+def test_replay_miss_fails_once_without_backoff(scripts, replay_settings, monkeypatch):
+    pytest.importorskip('requests')
+    sleeps = []
+    monkeypatch.setattr(scripts.time, 'sleep', sleeps.append)
+    request_data = {
+        'name': 'Member - Search',
+        'method': 'POST',
+        'base_url_placeholder': '{{baseurl}}/member',
+        'headers': {},
+        'body': '{"vpin": "V0"}'
+    }
+
+    result = scripts.run_api_test(request_data, 'http://127.0.0.1:9/ods', 'ODS', replay_settings)
+
+    assert result['status_code'] == 'TIMEOUT/ERROR'
+    assert result['attempts'] == 1
+    assert sleeps == []
+    assert 'No cassette entry for POST http://127.0.0.1:9/ods/member' in scripts.get_response_store(replay_settings).get(result['raw_body_ref'])
@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).resolve().parent.parent / 'Scripts.py'
+HEAVY_MODULES = ['pandas', 'openpyxl', 'requests', 'jsonschema']
+HEALTH_STARTUP_BUDGET_SECONDS = float(os.environ.get('HEALTH_STARTUP_BUDGET_SECONDS', '15'))
+
+HEALTH_PROBE = """
+import json, runpy, sys
+sys.argv = [{script!r}, 'health']
+exit_code = 0
+try:
+    runpy.run_path({script!r}, run_name='__main__')
+except SystemExit as e:
+    exit_code = e.code or 0
+print(json.dumps({{'exit_code': exit_code, 'loaded': [m for m in {modules!r} if m in sys.modules]}}))
+"""
+
+class HealthyHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def health_workdir(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), HealthyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Settings'
+    sheet.append(['ODS_URL', base_url])
+    sheet.append(['PRD_URL', base_url])
+    workbook.save(tmp_path / 'test_data.xlsx')
+
+    try:
+        yield tmp_path
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def run_health(workdir: Path):
+    probe = HEALTH_PROBE.format(script=str(SCRIPT_PATH), modules=HEAVY_MODULES)
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', probe], cwd=workdir, capture_output=True, text=True, timeout=60)
+    elapsed = time.perf_counter() - start
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1]), elapsed
+
+def test_health_skips_heavy_imports(health_workdir):
+    run_health(health_workdir)
+    result, elapsed = run_health(health_workdir)
+
+    assert result['exit_code'] == 0
+    assert result['loaded'] == []
+    assert elapsed < HEALTH_STARTUP_BUDGET_SECONDS, f"health took {elapsed:.2f}s"
@@ -0,0 +1,37 @@
+import json
+import os
+
+COLLECTION = {'item': [{'name': 'Member - Search', 'request': {'method': 'POST', 'body': {'raw': '{"src": "{{src}}"}'}, 'url': {'raw': '{{baseurl}}/member'}}}]}
+
+def extract_with_vars(scripts, settings, collection_file, src):
+    settings['POSTMAN_VARS_DICT'] = {'src': src}
+    return scripts.extract_requests(collection_file, [], settings)
+
+def test_collection_cache_keeps_most_recently_used_entries(scripts, settings, tmp_path):
+    collection_file = tmp_path / 'collection.json'
+    collection_file.write_text(json.dumps(COLLECTION), encoding='utf-8')
+    settings['COLLECTION_CACHE_KEEP_ENTRIES'] = '2'
+    cache_dir = tmp_path / settings['COLLECTION_CACHE_DIR']
+
+    for age, src in enumerate(['A', 'B']):
+        extract_with_vars(scripts, settings, collection_file, src)
+        for entry in cache_dir.glob('*.json'):
+            stat = entry.stat()
+            os.utime(entry, (stat.st_atime - 100, stat.st_mtime - 100))
+
+    assert extract_with_vars(scripts, settings, collection_file, 'A')[0]['body'] == '{"src": "A"}'
+    extract_with_vars(scripts, settings, collection_file, 'C')
+
+    assert len(list(cache_dir.glob('*.json'))) == 2
+    assert scripts.load_cached_requests(scripts.get_collection_cache_path(collection_file.read_bytes(), [], {**settings, 'POSTMAN_VARS_DICT': {'src': 'A'}})) is not None
+    assert scripts.load_cached_requests(scripts.get_collection_cache_path(collection_file.read_bytes(), [], {**settings, 'POSTMAN_VARS_DICT': {'src': 'B'}})) is None
+
+def test_zero_keeps_every_collection_cache_entry(scripts, settings, tmp_path):
+    collection_file = tmp_path / 'collection.json'
+    collection_file.write_text(json.dumps(COLLECTION), encoding='utf-8')
+    settings['COLLECTION_CACHE_KEEP_ENTRIES'] = '0'
+
+    for src in 'ABCD':
+        extract_with_vars(scripts, settings, collection_file, src)
+
+    assert len(list((tmp_path / settings['COLLECTION_CACHE_DIR']).glob('*.json'))) == 4
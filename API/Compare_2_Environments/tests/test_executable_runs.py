@@ -0,0 +1,56 @@
+import pytest
+
+def compile_plan(scripts, body, columns):
+    return scripts.BodySubstitutionPlan(body, scripts.compile_substitution_pattern(columns), {c.lower(): c for c in columns})
+
+def test_placeholders_accept_any_data_sheet_column(scripts):
+    plan = compile_plan(scripts, '{"region": "{{Region_Code}}", "vpin": "{{vpin}}", "other": "{{unknown}}"}', ['vpin', 'Region_Code'])
+
+    assert not plan.is_static
+    assert plan.render({'vpin': 'V1', 'Region_Code': 'EU-2'}) == '{"region": "EU-2", "vpin": "V1", "other": "{{unknown}}"}'
+
+def test_json_values_are_replaced_by_case_insensitive_key(scripts):
+    plan = compile_plan(scripts, '{"VPIN": "000", "memberType": "A", "limit": 5}', ['vpin', 'memberType'])
+
+    assert plan.render({'vpin': '123', 'memberType': 'B'}) == '{"VPIN": "123", "memberType": "B", "limit": 5}'
+
+def test_missing_row_values_keep_the_template_text(scripts):
+    plan = compile_plan(scripts, '{"vpin": "000", "offset": {{offset}}}', ['vpin', 'offset'])
+
+    assert plan.render({}) == '{"vpin": "000", "offset": {{offset}}}'
+
+def test_body_without_placeholders_is_static(scripts):
+    body = '{"limit": 10, "src": "{{src}}"}'
+    plan = compile_plan(scripts, body, ['vpin', 'offset'])
+
+    assert plan.is_static
+    assert plan.render({'vpin': 'V1'}) == body
+
+def test_data_driven_runs_stream_with_arbitrary_columns(scripts, tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip('openpyxl')
+    monkeypatch.chdir(tmp_path)
+    workbook = openpyxl.Workbook()
+    workbook.active.title = 'Settings'
+    data_sheet = workbook.create_sheet('Data')
+    data_sheet.append(['test_name', 'Execution_Type', 'run_id', 'Test_Type', 'vpin', 'Region_Code', 'Override_Header_X-Trace'])
+    data_sheet.append(['Member - Search', 'Data_Driven', 'R1', 'Functional', 'V1', 'EU', 't-1'])
+    data_sheet.append(['Member - Search', 'Data_Driven', 'R2', 'Functional', 'V2', None, None])
+    data_sheet.append(['Member - Static', 'Data_Driven', 'R3', 'Functional', 'V3', 'US', None])
+    data_sheet.append(['Member - Static', 'Static', 'S1', 'Functional', None, None, None])
+    workbook.save(tmp_path / 'test_data.xlsx')
+
+    templates = [
+        {'name': 'Member - Search', 'method': 'POST', 'body': '{"vpin": "{{vpin}}", "region": "{{Region_Code}}"}', 'headers': {}},
+        {'name': 'Member - Static', 'method': 'POST', 'body': '{"id": 1}', 'headers': {}}
+    ]
+
+    runs = scripts.iter_executable_runs(templates, 'test_data.xlsx')
+    assert not isinstance(runs, list)
+    runs = list(runs)
+
+    assert [run['name'] for run in runs] == ['Member - Search (Run: R1)', 'Member - Search (Run: R2)', 'Member - Static (Run: R3)', 'Member - Static']
+    assert runs[0]['body'] == '{"vpin": "V1", "region": "EU"}'
+    assert runs[0]['header_overrides'] == {'X-Trace': 't-1'}
+    assert runs[1]['body'] == '{"vpin": "V2", "region": "{{Region_Code}}"}'
+    assert runs[2]['body'] == '{"id": 1}'
+    assert runs[3]['body'] == '{"id": 1}'
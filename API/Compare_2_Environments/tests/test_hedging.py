@@ -0,0 +1,23 @@
+import threading
+
+def test_hedge_pool_is_sized_from_worker_settings(scripts, monkeypatch):
+    monkeypatch.setattr(scripts, 'HEDGE_EXECUTOR', None)
+    executor = scripts.get_hedge_executor({'ODS_MAX_WORKERS': '8', 'PRD_MAX_WORKERS': '4'})
+    try:
+        assert executor._max_workers == 12 * scripts.HEDGE_SLOTS_PER_WORKER
+    finally:
+        scripts.close_hedge_executor()
+
+def test_closing_sessions_waits_for_running_legs_and_cancels_pending_ones(scripts, monkeypatch):
+    monkeypatch.setattr(scripts, 'HEDGE_EXECUTOR', None)
+    executor = scripts.get_hedge_executor({'ODS_MAX_WORKERS': '1', 'PRD_MAX_WORKERS': '1'})
+    release = threading.Event()
+    running = [executor.submit(release.wait, 10) for _ in range(executor._max_workers)]
+    pending = executor.submit(release.wait, 10)
+    threading.Timer(0.2, release.set).start()
+
+    scripts.close_http_sessions()
+
+    assert all(future.done() and future.result() for future in running)
+    assert pending.cancelled()
+    assert scripts.HEDGE_EXECUTOR is None
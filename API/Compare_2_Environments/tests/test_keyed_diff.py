@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+def members(count, **changes):
+    rows = [{'MEMBER_ID': i, 'CITY': f"c{i}"} for i in range(count)]
+    for index, city in changes.items():
+        rows[int(index[1:])]['CITY'] = city
+    return {'members': rows}
+
+class LookupTrackingDict(dict):
+    lookups = []
+
+    def __getitem__(self, key):
+        LookupTrackingDict.lookups.append(key)
+        return super().__getitem__(key)
+
+def test_reordered_list_is_matched_by_identity_key(scripts):
+    old = members(5)
+    new = {'members': list(reversed(members(5, i3='X')['members']))}
+
+    diff = scripts.keyed_json_diff(old, new, ['MEMBER_ID'])
+
+    assert diff == {'values_changed': {"root['members'][3]['CITY']": {'old_value': 'c3', 'new_value': 'X', 'new_path': "root['members'][1]['CITY']"}}}
+    assert scripts.keyed_json_diff(old, {'members': list(reversed(old['members']))}, ['MEMBER_ID']) == {}
+
+def test_equal_subtrees_are_not_descended(scripts):
+    LookupTrackingDict.lookups = []
+    old = {'same': LookupTrackingDict(MEMBER_ID=1), 'changed': {'CITY': 'A'}}
+    new = {'same': LookupTrackingDict(MEMBER_ID=1), 'changed': {'CITY': 'B'}}
+
+    diff = scripts.keyed_json_diff(old, new, [])
+
+    assert list(diff['values_changed']) == ["root['changed']['CITY']"]
+    assert LookupTrackingDict.lookups == []
+
+def test_missing_identity_key_falls_back_to_ordered_comparison(scripts):
+    old = {'members': [{'MEMBER_ID': 1, 'CITY': 'A'}, {'CITY': 'B'}, {'CITY': 'C'}]}
+    new = {'members': [{'MEMBER_ID': 1, 'CITY': 'A'}, {'CITY': 'B'}, {'CITY': 'D'}]}
+
+    diff = scripts.keyed_json_diff(old, new, ['MEMBER_ID'])
+
+    assert diff == {'values_changed': {"root['members'][2]['CITY']": {'old_value': 'C', 'new_value': 'D', 'new_path': "root['members'][2]['CITY']"}}}
+
+def test_duplicate_identity_keys_pair_in_order(scripts):
+    old = {'members': [{'MEMBER_ID': 1, 'CITY': 'A'}, {'MEMBER_ID': 1, 'CITY': 'B'}]}
+    new = {'members': [{'MEMBER_ID': 1, 'CITY': 'A'}, {'MEMBER_ID': 1, 'CITY': 'C'}]}
+
+    diff = scripts.keyed_json_diff(old, new, ['MEMBER_ID'])
+
+    assert diff == {'values_changed': {"root['members'][1]['CITY']": {'old_value': 'B', 'new_value': 'C', 'new_path': "root['members'][1]['CITY']"}}}
+
+def test_added_and_removed_items_use_deepdiff_paths(scripts):
+    old = {'members': [{'MEMBER_ID': 1}, {'MEMBER_ID': 2}], 'flag': True}
+    new = {'members': [{'MEMBER_ID': 2}, {'MEMBER_ID': 3}], 'count': 2}
+
+    diff = scripts.keyed_json_diff(old, new, ['MEMBER_ID'])
+
+    assert diff['iterable_item_removed'] == {"root['members'][0]": {'old_value': {'MEMBER_ID': 1}}}
+    assert diff['iterable_item_added'] == {"root['members'][1]": {'new_value': {'MEMBER_ID': 3}}}
+    assert diff['dictionary_item_removed'] == {"root['flag']": {'old_value': True}}
+    assert diff['dictionary_item_added'] == {"root['count']": {'new_value': 2}}
+
+def test_paths_are_formatted_like_deepdiff_paths(scripts):
+    path = next(iter(scripts.keyed_json_diff(members(5), members(5, i3='X'), ['MEMBER_ID'])['values_changed']))
+
+    assert path == "root['members'][3]['CITY']"
+    assert scripts.format_deepdiff_path(path) == 'members.3.CITY'
+    assert scripts.parse_diff_path(path) == ('members', 3, 'CITY')
+
+@pytest.mark.parametrize('old, new', [
+    (members(5), members(5, i3='X')),
+    ({'members': members(4)['members'], 'LAST_UPDATE': '1'}, {'members': members(4, i0='Y')['members'], 'LAST_UPDATE': '2'})
+])
+def test_comparison_row_matches_deepdiff_engine(scripts, settings, old, new):
+    pytest.importorskip('deepdiff')
+    request_data = {'name': 'Member - Search', 'method': 'POST', 'body': '{}'}
+    store = scripts.get_response_store(settings)
+
+    def result(body):
+        return {'status_code': 200, 'response_time': 5, 'json_body': body, 'raw_body_ref': store.put(json.dumps(body))}
+
+    rows = {}
+    for engine in ('KEYED', 'DEEPDIFF'):
+        settings['DIFF_ENGINE'] = engine
+        _, row = scripts.compare_result_pair(request_data, result(old), result(new), scripts.new_overall_metrics(1), scripts.make_schema_loader('schemas', settings), settings, 1, 1)
+        rows[engine] = {key: row[key] for key in ('data_diff_result', 'data_diff_summary', 'comments', 'findings')}
+
+    assert rows['KEYED'] == rows['DEEPDIFF']
+    assert 'members.' in rows['KEYED']['comments']
@@ -0,0 +1,55 @@
+import pytest
+
+def latency_metrics(samples, request_name='Member - Search'):
+    return {'latency_samples': [('PRD', request_name, f"{request_name} R{i}", value) for i, value in enumerate(samples)]}
+
+def test_separated_samples_give_small_p_value(scripts):
+    p_value = scripts.mann_whitney_greater_p_value([11, 12, 13, 14, 15], [1, 2, 3, 4, 5])
+
+    assert p_value == pytest.approx(0.00609, abs=1e-4)
+
+def test_identical_samples_are_not_significant(scripts):
+    assert scripts.mann_whitney_greater_p_value([1, 2, 3, 4, 5], [1, 2, 3, 4, 5]) > 0.5
+
+def test_tied_ranks_are_averaged(scripts):
+    assert scripts.mann_whitney_greater_p_value([2, 2, 3, 3], [1, 1, 2, 2]) == pytest.approx(0.0432, abs=1e-3)
+    assert scripts.mann_whitney_greater_p_value([5, 5, 5], [5, 5, 5]) == 1.0
+
+def test_faster_samples_are_not_significant(scripts):
+    assert scripts.mann_whitney_greater_p_value([1, 2, 3, 4, 5], [11, 12, 13, 14, 15]) > 0.99
+
+def test_shifted_run_is_flagged_against_previous_runs_only(scripts, settings):
+    baseline = [100 + i % 7 for i in range(20)]
+    assert scripts.check_latency_regressions(latency_metrics(baseline), settings) == []
+
+    regressions = scripts.check_latency_regressions(latency_metrics([value * 2 for value in baseline]), settings)
+
+    assert len(regressions) == 1
+    assert regressions[0]['baseline_samples'] == 20
+    assert regressions[0]['current_samples'] == 20
+    assert regressions[0]['slowdown_pct'] == 100.0
+
+def test_unchanged_run_is_not_flagged(scripts, settings):
+    baseline = [100 + i % 7 for i in range(20)]
+    scripts.check_latency_regressions(latency_metrics(baseline), settings)
+
+    assert scripts.check_latency_regressions(latency_metrics(baseline), settings) == []
+
+def test_small_samples_are_skipped(scripts, settings):
+    settings['REGRESSION_MIN_SAMPLES'] = '5'
+    scripts.check_latency_regressions(latency_metrics([100, 101, 102]), settings)
+
+    assert scripts.check_latency_regressions(latency_metrics([900, 901, 902]), settings) == []
+
+def test_baseline_query_uses_most_recent_runs_of_the_endpoint(scripts, tmp_path):
+    history = scripts.LatencyHistory(tmp_path / 'history.sqlite')
+    try:
+        history.record_run('run-1', 'DUAL', [('PRD', 'http://prd', 'Member - Search', 't', 10)])
+        history.record_run('run-2', 'DUAL', [('PRD', 'http://prd', 'Member - Search', 't', 20)])
+        history.record_run('run-3', 'DUAL', [('PRD', 'http://prd', 'Member - Detail', 't', 30)])
+
+        assert sorted(history.baseline_samples('PRD', 'http://prd', 'Member - Search', 1)) == [20]
+        assert sorted(history.baseline_samples('PRD', 'http://prd', 'Member - Search', 10)) == [10, 20]
+        assert history.baseline_samples('ODS', 'http://prd', 'Member - Search', 10) == []
+    finally:
+        history.close()
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+QUANTILES = [0, 1, 10, 25, 50, 75, 90, 95, 99, 99.9, 100]
+
+def latency_samples(count, seed):
+    rng = random.Random(seed)
+    return [max(1, int(rng.lognormvariate(5, 0.8))) for _ in range(count)]
+
+def exact_percentile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q / 100 * (len(ordered) - 1))]
+
+def new_sketch(scripts, values):
+    sketch = scripts.LatencySketch()
+    for value in values:
+        sketch.record(value)
+    return sketch
+
+def assert_within_sketch_accuracy(scripts, sketch, values):
+    for q in QUANTILES:
+        expected = exact_percentile(values, q)
+        assert sketch.percentile(q) == pytest.approx(expected, rel=scripts.LATENCY_SKETCH_ACCURACY, abs=1), f"p{q}"
+
+def test_percentiles_stay_within_relative_accuracy(scripts):
+    values = latency_samples(20000, seed=7)
+    sketch = new_sketch(scripts, values)
+
+    assert_within_sketch_accuracy(scripts, sketch, values)
+
+def test_percentiles_match_numpy_lower_percentile(scripts):
+    numpy = pytest.importorskip('numpy')
+    values = latency_samples(5000, seed=11)
+    sketch = new_sketch(scripts, values)
+
+    for q in QUANTILES:
+        expected = float(numpy.percentile(values, q, method='lower'))
+        assert sketch.percentile(q) == pytest.approx(expected, rel=scripts.LATENCY_SKETCH_ACCURACY, abs=1), f"p{q}"
+
+def test_zero_latencies_and_empty_sketch(scripts):
+    assert scripts.LatencySketch().percentile(50) is None
+
+    sketch = new_sketch(scripts, [0, 0, 0, 100])
+    assert sketch.percentile(50) == 0
+    assert sketch.percentile(100) == 100
+
+def test_merged_sketch_equals_sketch_of_all_samples(scripts):
+    parts = [latency_samples(3000, seed) for seed in (1, 2, 3)]
+    parts[1].extend([0, 0])
+    combined = new_sketch(scripts, [value for part in parts for value in part])
+
+    merged = scripts.LatencySketch()
+    for part in parts:
+        merged.merge(new_sketch(scripts, part))
+
+    assert merged.buckets == combined.buckets
+    assert (merged.count, merged.zero_count, merged.total) == (combined.count, combined.zero_count, combined.total)
+    assert (merged.min_value, merged.max_value) == (combined.min_value, combined.max_value)
+    assert merged.summary() == combined.summary()
+    assert_within_sketch_accuracy(scripts, merged, [value for part in parts for value in part])
+
+def test_merging_sketches_of_different_accuracy_is_rejected(scripts):
+    with pytest.raises(ValueError):
+        scripts.LatencySketch(0.01).merge(scripts.LatencySketch(0.05))
+
+def test_load_interval_stats_merge_into_totals(scripts):
+    intervals = [scripts.new_load_stats() for _ in range(2)]
+    intervals[0]['sketch'].record(100)
+    intervals[0]['errors'] = 1
+    intervals[0]['error_types'] = {'HTTP 500': 1}
+    intervals[1]['sketch'].record(300)
+    intervals[1]['errors'] = 2
+    intervals[1]['error_types'] = {'HTTP 500': 1, 'ReadTimeout': 1}
+
+    total = scripts.new_load_stats()
+    for bucket_stats in intervals:
+        scripts.merge_load_stats(total, bucket_stats)
+
+    assert total['sketch'].count == 2
+    assert total['sketch'].max_value == 300
+    assert total['errors'] == 3
+    assert total['error_types'] == {'HTTP 500': 2, 'ReadTimeout': 1}
@@ -0,0 +1,42 @@
+import pytest
+
+def test_paths_are_classified_once_per_shape(scripts):
+    classifier = scripts.PathClassifier(['PAYEE_ID'], ['last_update'])
+
+    assert classifier.classify("root['members'][0]['PAYEE_ID']") == scripts.PathClassifier.EXCLUDED
+    assert classifier.classify("root['members'][7]['LAST_UPDATE']") == scripts.PathClassifier.DYNAMIC
+    assert classifier.classify("root['members'][7]['NAME']") == scripts.PathClassifier.CRITICAL
+    assert classifier.classify("root['members'][8]['NAME']") == scripts.PathClassifier.CRITICAL
+    assert set(classifier.cache) == {"root['members'][]['PAYEE_ID']", "root['members'][]['LAST_UPDATE']", "root['members'][]['NAME']"}
+
+def test_classifier_is_shared_for_the_same_terms(scripts, settings):
+    assert scripts.get_path_classifier(settings) is scripts.get_path_classifier(dict(settings))
+
+def test_highlighter_marks_soft_paths_with_the_shared_classifier(scripts):
+    classifier = scripts.PathClassifier([], ['LAST_UPDATE'])
+    diff = {'values_changed': {
+        "root['LAST_UPDATE']": {'old_value': '1', 'new_value': '2', 'new_path': "root['LAST_UPDATE']"},
+        "root['NAME']": {'old_value': 'a', 'new_value': 'b', 'new_path': "root['NAME']"}
+    }}
+
+    ods_html, _ = scripts.highlight_diffs_in_json({'LAST_UPDATE': '1', 'NAME': 'a'}, {'LAST_UPDATE': '2', 'NAME': 'b'}, diff, classifier)
+
+    assert '<span class="diff-highlight soft">"1"</span>' in ods_html
+    assert '<span class="diff-highlight">"a"</span>' in ods_html
+
+def test_excel_export_splits_diff_keys_by_category(scripts, tmp_path):
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('openpyxl')
+    classifier = scripts.PathClassifier(['PAYEE_ID'], ['LAST_UPDATE'])
+    row = {
+        'test_name': 'Member - Search', 'ods_status': 'PASS', 'prd_status': 'PASS', 'ods_time': '5 ms', 'prd_time': '6 ms',
+        'test_type': 'FUNCTIONAL', 'data_diff_result': 'FAIL', 'data_diff_summary': '', 'comments': '',
+        'diff_paths': ["root['members'][1]['NAME']", "root['members'][0]['LAST_UPDATE']", "root['members'][0]['PAYEE_ID']"]
+    }
+
+    excel_path = scripts.export_to_excel([row], str(tmp_path), path_classifier=classifier)
+    exported = pd.read_excel(excel_path).iloc[0]
+
+    assert exported['Critical Diff Keys'] == 'members.1.NAME'
+    assert exported['Dynamic Diff Keys'] == 'members.0.LAST_UPDATE'
+    assert exported['Excluded Diff Keys'] == 'members.0.PAYEE_ID'
@@ -0,0 +1,86 @@
+import pytest
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def test_token_bucket_limits_rate(scripts, clock):
+    limiter = scripts.AdaptiveRateLimiter('PRD', max_rps=2, max_in_flight=10, latency_spike_factor=3, clock=clock)
+
+    assert limiter._try_acquire(False) == (True, 0)
+    assert limiter._try_acquire(False) == (True, 0)
+    assert limiter._try_acquire(False) == (False, pytest.approx(0.5))
+
+    clock.advance(0.5)
+    assert limiter._try_acquire(False) == (True, 0)
+
+def test_in_flight_cap_blocks_until_release(scripts, clock):
+    limiter = scripts.AdaptiveRateLimiter('PRD', max_rps=0, max_in_flight=2, latency_spike_factor=3, clock=clock)
+    limiter.acquire()
+    limiter.acquire()
+
+    acquired, wait = limiter._try_acquire(False)
+    assert not acquired and wait <= 0
+    assert limiter._try_acquire(True) == (True, 0)
+    assert limiter.in_flight == 2
+
+    limiter.release(200, 50)
+    assert limiter._try_acquire(False) == (True, 0)
+
+def test_throttle_status_backs_off_and_honours_retry_after(scripts, clock):
+    limiter = scripts.AdaptiveRateLimiter('PRD', max_rps=10, max_in_flight=8, latency_spike_factor=3, clock=clock)
+    limiter.acquire()
+
+    limiter.release(429, 50, retry_after='2')
+
+    assert limiter.in_flight_limit == 4
+    assert limiter.rate == pytest.approx(5.0)
+    assert limiter._try_acquire(False) == (False, pytest.approx(2.0))
+    clock.advance(2)
+    assert limiter._try_acquire(False) == (True, 0)
+
+def test_limits_recover_after_successful_responses(scripts, clock):
+    limiter = scripts.AdaptiveRateLimiter('PRD', max_rps=10, max_in_flight=8, latency_spike_factor=3, clock=clock)
+    limiter.acquire()
+    limiter.release(503, 50)
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(200, 50)
+    assert limiter.in_flight_limit == 8
+    assert limiter.rate == pytest.approx(7.0)
+
+    for _ in range(10):
+        limiter.acquire()
+        clock.advance(1)
+        limiter.release(200, 50)
+    assert limiter.in_flight_limit == 8
+    assert limiter.rate == pytest.approx(10.0)
+
+def test_latency_spike_backs_off_only_when_it_persists(scripts, clock):
+    limiter = scripts.AdaptiveRateLimiter('PRD', max_rps=0, max_in_flight=8, latency_spike_factor=3, clock=clock)
+
+    def respond(endpoint, response_time):
+        limiter.acquire()
+        limiter.release(200, response_time, endpoint=endpoint)
+
+    for _ in range(10):
+        respond('GET /fast', 100)
+        respond('GET /slow', 2000)
+
+    respond('GET /fast', 1000)
+    respond('GET /fast', 1000)
+    assert limiter.in_flight_limit == 8
+
+    respond('GET /fast', 1000)
+    assert limiter.in_flight_limit == 4
@@ -0,0 +1,29 @@
+def snapshot_store_state(snapshot_dir):
+    return {str(path.relative_to(snapshot_dir)): (path.stat().st_mtime_ns, path.read_bytes()) for path in snapshot_dir.rglob('*') if path.is_file()}
+
+def test_recompare_of_snapshot_run_leaves_snapshot_store_untouched(workspace):
+    workspace.write_settings(RUN_MODE='SNAPSHOT', SNAPSHOT_VERSION='v1')
+    run = workspace.run('run')
+    assert run.returncode == 0, run.stdout + run.stderr
+
+    snapshot_dir = workspace.path / 'snapshots'
+    before = snapshot_store_state(snapshot_dir)
+    assert 'v1.json' in before and (snapshot_dir / 'LATEST').read_text() == 'v1'
+
+    recompare = workspace.run('recompare')
+    assert recompare.returncode == 0, recompare.stdout + recompare.stderr
+    assert snapshot_store_state(snapshot_dir) == before
+
+    workspace.write_settings(RUN_MODE='SNAPSHOT')
+    recompare = workspace.run('recompare')
+    assert recompare.returncode == 0, recompare.stdout + recompare.stderr
+    assert snapshot_store_state(snapshot_dir) == before
+
+def test_unknown_snapshot_env_is_rejected_before_any_request(workspace):
+    workspace.write_settings(RUN_MODE='SNAPSHOT', SNAPSHOT_ENV='PDR')
+    run = workspace.run('run')
+
+    assert run.returncode == 1
+    assert "SNAPSHOT_ENV must be ODS or PRD" in run.stdout + run.stderr
+    assert not (workspace.path / 'snapshots').exists()
+    assert not list((workspace.path / 'out').rglob('run_manifest*.json'))
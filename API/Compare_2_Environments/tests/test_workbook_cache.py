@@ -0,0 +1,41 @@
+import pickle
+
+import pytest
+
+@pytest.fixture
+def data_workbook(scripts, tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip('openpyxl')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scripts, 'WORKBOOK_SNAPSHOTS', {})
+
+    def write(row_count):
+        workbook = openpyxl.Workbook()
+        workbook.active.title = 'Settings'
+        workbook.active.append(['ODS_URL', 'http://ods'])
+        data_sheet = workbook.create_sheet('Data')
+        data_sheet.append(['test_name', 'Execution_Type', 'run_id', 'vpin'])
+        for i in range(row_count):
+            data_sheet.append(['Member - Search', 'Data_Driven', f"R{i}", f"V{i}"])
+        workbook.save(tmp_path / 'test_data.xlsx')
+
+    write(25)
+    return write
+
+def test_cache_keeps_settings_and_data_header_only(scripts, data_workbook, tmp_path):
+    columns, rows = scripts.read_data_sheet('test_data.xlsx')
+
+    assert columns == ['test_name', 'Execution_Type', 'run_id', 'vpin']
+    assert not isinstance(rows, (list, tuple))
+    assert [row['run_id'] for row in rows] == [f"R{i}" for i in range(25)]
+
+    with open(tmp_path / f"test_data.xlsx{scripts.WORKBOOK_CACHE_SUFFIX}", 'rb') as f:
+        sheets = pickle.load(f)['sheets']
+    assert sheets == {'Settings': [('ODS_URL', 'http://ods')], 'Data': [('test_name', 'Execution_Type', 'run_id', 'vpin')]}
+
+def test_data_rows_are_read_from_the_current_workbook(scripts, data_workbook):
+    columns, rows = scripts.read_data_sheet('test_data.xlsx')
+    assert len(list(rows)) == 25
+
+    data_workbook(3)
+    columns, rows = scripts.read_data_sheet('test_data.xlsx')
+    assert [row['vpin'] for row in rows] == ['V0', 'V1', 'V2']